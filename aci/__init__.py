@@ -1,7 +1,62 @@
+from aci._cache import CacheBackend, CacheConfig, InMemoryLRUCache, RedisCache, SQLiteCache
+from aci._cassette import CassetteConfig
+from aci._circuit_breaker import CircuitBreakerConfig, CircuitState
 from aci._client import ACI
+from aci._compression import CompressionConfig
+from aci._concurrency import ConcurrencyLimitConfig
+from aci._hedging import HedgingPolicy
+from aci._instrumentation import InstrumentationHook, RequestEvent, RetryEvent
+from aci._metrics import MetricsCollector
+from aci._profiling import ProfileConfig
+from aci._prometheus import PrometheusExporter, render_prometheus
+from aci._retry import RetryBudget, RetryPolicy, deadline
+from aci._scheduler import Priority, SchedulerConfig, priority, scheduling_owner
+from aci._tracing import TracingConfig
+from aci._warmup import WarmupConfig
+from aci.libs._compact_schema import CompactionLevel, compact_tools, estimate_tokens
+from aci.libs._function_definition import convert_function_definition
+from aci.libs._manifest import ToolManifest, build_tool_manifest
 from aci.libs._tool import to_json_schema
+from aci.utils._logging import configure_logging
 from aci.utils._logging import setup_logging as _setup_logging
 
 _setup_logging()
 
-__all__ = ["ACI", "to_json_schema"]
+__all__ = [
+    "ACI",
+    "CacheBackend",
+    "CacheConfig",
+    "CassetteConfig",
+    "CircuitBreakerConfig",
+    "CircuitState",
+    "CompactionLevel",
+    "CompressionConfig",
+    "ConcurrencyLimitConfig",
+    "HedgingPolicy",
+    "InMemoryLRUCache",
+    "InstrumentationHook",
+    "MetricsCollector",
+    "Priority",
+    "ProfileConfig",
+    "PrometheusExporter",
+    "RedisCache",
+    "RequestEvent",
+    "RetryBudget",
+    "RetryEvent",
+    "RetryPolicy",
+    "SQLiteCache",
+    "SchedulerConfig",
+    "ToolManifest",
+    "TracingConfig",
+    "WarmupConfig",
+    "build_tool_manifest",
+    "compact_tools",
+    "configure_logging",
+    "convert_function_definition",
+    "deadline",
+    "estimate_tokens",
+    "priority",
+    "render_prometheus",
+    "scheduling_owner",
+    "to_json_schema",
+]
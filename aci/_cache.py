@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# time (in seconds) responses of the cacheable endpoints are cached for by default
+DEFAULT_CACHE_TTLS: dict[str, float] = {
+    "GET functions/search": 60,
+    "GET functions/{function_name}/definition": 300,
+    "GET apps/search": 60,
+    "GET apps/{app_name}": 300,
+    "GET app-configurations": 60,
+    "GET app-configurations/{app_name}": 60,
+}
+# time (in seconds) linked accounts are cached for, only if enabled with `cache_linked_accounts`,
+# as their responses contain the credentials of the accounts
+LINKED_ACCOUNT_CACHE_TTLS: dict[str, float] = {
+    "GET linked-accounts": 30,
+    "GET linked-accounts/{linked_account_id}": 30,
+}
+# cached endpoints invalidated by a mutation of an endpoint, by the first segment of its path;
+# app configurations decide which apps and functions are allowed for the project
+_INVALIDATED_GROUPS = {
+    "linked-accounts": ("linked-accounts",),
+    "app-configurations": ("app-configurations", "functions", "apps"),
+}
+_RAW = b"r"
+_COMPRESSED = b"z"
+
+
+class CacheBackend:
+    """Base class of cache backends, which store bytes by string keys with a TTL.
+
+    `get_many` and `compare_and_set` can be overridden by backends supporting them natively, the
+    default `get_many` gets keys one by one, and compare-and-set is only available on backends
+    setting `supports_compare_and_set`. Backends must be thread-safe.
+    """
+
+    supports_compare_and_set: bool = False
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        """Store a value, expiring after `ttl` seconds, or never if None."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def compare_and_set(
+        self, key: str, expected: bytes | None, value: bytes, ttl: float | None = None
+    ) -> bool:
+        """Store a value only if the current value is `expected` (None for absent).
+
+        Returns:
+            bool: Whether the value was stored.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support compare-and-set")
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryLRUCache(CacheBackend):
+    """A cache backend in the memory of the process, evicting the least recently used entries."""
+
+    supports_compare_and_set = True
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # values with their expiry time (time.monotonic), None if they never expire
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._get(key)
+
+    def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def compare_and_set(
+        self, key: str, expected: bytes | None, value: bytes, ttl: float | None = None
+    ) -> bool:
+        with self._lock:
+            if self._get(key) != expected:
+                return False
+            self._set(key, value, ttl)
+            return True
+
+    def _get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _set(self, key: str, value: bytes, ttl: float | None) -> None:
+        self._entries[key] = (value, None if ttl is None else time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SQLiteCache(CacheBackend):
+    """A cache backend in a SQLite file in WAL mode, shared by the processes of a host.
+
+    Expired entries are ignored when read and purged every `purge_interval` writes.
+    """
+
+    supports_compare_and_set = True
+
+    def __init__(self, path: str | Path, purge_interval: int = 1000) -> None:
+        self.path = str(path)
+        self.purge_interval = purge_interval
+        self._local = threading.local()
+        self._writes = 0
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+        )
+
+    def get(self, key: str) -> bytes | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return None if row is None else bytes(row[0])
+
+    def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        rows = (
+            self._connection()
+            .execute(
+                f"SELECT key, value FROM cache WHERE key IN ({','.join('?' * len(keys))}) "
+                "AND (expires IS NULL OR expires > ?)",
+                (*keys, time.time()),
+            )
+            .fetchall()
+        )
+        values = {key: bytes(value) for key, value in rows}
+        return [values.get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        connection = self._connection()
+        with connection:
+            self._upsert(connection, key, value, ttl)
+        self._maybe_purge(connection)
+
+    def delete(self, key: str) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def compare_and_set(
+        self, key: str, expected: bytes | None, value: bytes, ttl: float | None = None
+    ) -> bool:
+        connection = self._connection()
+        # the write lock is taken before reading, so that no other process can write in between
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if self.get(key) != expected:
+                connection.execute("ROLLBACK")
+                return False
+            self._upsert(connection, key, value, ttl)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return True
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _connection(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            # autocommit mode, transactions are explicit
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _upsert(
+        self, connection: sqlite3.Connection, key: str, value: bytes, ttl: float | None
+    ) -> None:
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, value, None if ttl is None else time.time() + ttl),
+        )
+
+    def _maybe_purge(self, connection: sqlite3.Connection) -> None:
+        self._writes += 1
+        if self._writes % self.purge_interval == 0:
+            with connection:
+                connection.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+
+
+class RedisCache(CacheBackend):
+    """A cache backend in Redis, or any network cache with a compatible client.
+
+    Examples:
+        >>> RedisCache(redis.Redis(host="cache.internal"), prefix="aci:")
+    """
+
+    def __init__(self, client: Any, prefix: str = "") -> None:
+        """
+        Args:
+            client: A client with the get, mget, set (with px) and delete methods of redis-py.
+            prefix: Prefix of all keys, e.g., to share a database with other applications.
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        value: bytes | None = self.client.get(self.prefix + key)
+        return value
+
+    def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        return list(self.client.mget([self.prefix + key for key in keys]))
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        px = None if ttl is None else max(int(ttl * 1000), 1)
+        self.client.set(self.prefix + key, value, px=px)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    """Configuration of the caching of responses, e.g., function definitions and app details.
+
+    Cached responses are invalidated by the mutations made through the cache, e.g., linking an
+    account invalidates the cached linked accounts, even from other processes sharing the backend.
+    """
+
+    backend: CacheBackend = field(default_factory=InMemoryLRUCache)
+    ttls: Mapping[str, float] = field(default_factory=lambda: dict(DEFAULT_CACHE_TTLS))
+    """Time (in seconds) responses are cached for, keyed by HTTP method and endpoint template as
+    in DEFAULT_CACHE_TTLS and LINKED_ACCOUNT_CACHE_TTLS. Responses of other endpoints are not
+    cached."""
+    compress_min_bytes: int | None = 1024
+    """Minimum size of the cached values compressed with zlib, None to never compress them."""
+    cache_linked_accounts: bool = False
+    """Whether linked accounts are cached too, for the TTLs of LINKED_ACCOUNT_CACHE_TTLS unless
+    set in `ttls`. Warning: their responses contain the credentials of the accounts (e.g., OAuth2
+    access tokens), which are then stored as is in the backend, e.g., in a SQLite file or in
+    Redis. Only enable it with a backend as trusted as the API key."""
+
+    def __post_init__(self) -> None:
+        unknown_endpoints = (
+            set(self.ttls) - set(DEFAULT_CACHE_TTLS) - set(LINKED_ACCOUNT_CACHE_TTLS)
+        )
+        if unknown_endpoints:
+            raise ValueError(f"Unknown endpoints in ttls: {sorted(unknown_endpoints)}")
+        if not self.cache_linked_accounts and set(self.ttls) & set(LINKED_ACCOUNT_CACHE_TTLS):
+            raise ValueError("Linked accounts are only cached with cache_linked_accounts=True")
+
+    def get_ttls(self) -> dict[str, float]:
+        """Return the TTLs of the cached endpoints, including the linked accounts if enabled."""
+        if self.cache_linked_accounts:
+            return {**LINKED_ACCOUNT_CACHE_TTLS, **self.ttls}
+        return dict(self.ttls)
+
+
+class ResponseCache:
+    """Caches the successful responses of reads in a backend and invalidates them on mutations.
+
+    Keys are made of a namespace (e.g., a hash of the API key, as responses depend on the
+    project), a generation of the group of the endpoint and a digest of the URL. Invalidating a
+    group replaces its generation, so that its entries are no longer read and expire on their own.
+    """
+
+    def __init__(self, config: CacheConfig) -> None:
+        self.config = config
+        self.backend = config.backend
+        self.ttls = config.get_ttls()
+
+    def key(self, namespace: str, endpoint: str, url: str) -> str | None:
+        """Return the key of the cached response of a read, None if it is not cached.
+
+        The key includes the current generation of the group of the endpoint, so it is taken
+        before sending the request and passed to `set`: a response read before an invalidation
+        is then stored under the previous generation, where it is never read.
+
+        Args:
+            namespace: The namespace of the entry, e.g., a hash of the API key.
+            endpoint: The HTTP method and endpoint template, e.g., "GET apps/{app_name}".
+            url: The URL of the request, with its query parameters.
+        """
+        if endpoint not in self.ttls:
+            return None
+        group = endpoint.partition(" ")[2].split("/", 1)[0]
+        try:
+            generation = self._get_generation(namespace, group)
+        except Exception:
+            # the cache is an optimization, requests are sent if it is unavailable
+            logger.warning("Error reading from the cache", exc_info=True)
+            return None
+        digest = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+        return f"aci:{namespace}:{group}:{generation.decode()}:{digest}"
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached response content of a read, None if not cached."""
+        try:
+            value = self.backend.get(key)
+            return None if value is None else _decode(value)
+        except Exception:
+            logger.warning("Error reading from the cache", exc_info=True)
+            return None
+
+    def set(self, endpoint: str, key: str, content: bytes) -> None:
+        """Cache the response content of a read, under the key taken before sending it."""
+        ttl = self.ttls.get(endpoint)
+        if ttl is None or ttl <= 0:
+            return
+        value = _encode(content, self.config.compress_min_bytes)
+        try:
+            self.backend.set(key, value, ttl)
+        except Exception:
+            logger.warning("Error writing to the cache", exc_info=True)
+
+    def is_cached(self, endpoint: str) -> bool:
+        return self.ttls.get(endpoint, 0) > 0
+
+    def invalidate(self, namespace: str, endpoint: str) -> None:
+        """Invalidate the cached responses a mutation of an endpoint may have changed."""
+        method, _, template = endpoint.partition(" ")
+        if method == "GET":
+            return
+        for group in _INVALIDATED_GROUPS.get(template.split("/", 1)[0], ()):
+            try:
+                self.backend.set(self._generation_key(namespace, group), uuid.uuid4().hex.encode())
+            except Exception:
+                logger.exception("Error invalidating the cached %s responses", group)
+
+    def _get_generation(self, namespace: str, group: str) -> bytes:
+        generation_key = self._generation_key(namespace, group)
+        generation = self.backend.get(generation_key)
+        if generation is not None:
+            return generation
+        # a missing generation (never set, or evicted) starts a new one rather than falling back
+        # to a fixed one, whose entries may predate invalidations
+        generation = uuid.uuid4().hex.encode()
+        if not self.backend.supports_compare_and_set:
+            self.backend.set(generation_key, generation)
+            return generation
+        if self.backend.compare_and_set(generation_key, None, generation):
+            return generation
+        return self.backend.get(generation_key) or generation
+
+    def _generation_key(self, namespace: str, group: str) -> str:
+        return f"aci:{namespace}:{group}:generation"
+
+
+def _encode(content: bytes, compress_min_bytes: int | None) -> bytes:
+    if compress_min_bytes is not None and len(content) >= compress_min_bytes:
+        return _COMPRESSED + zlib.compress(content, 6)
+    return _RAW + content
+
+
+def _decode(value: bytes) -> bytes:
+    if value[:1] == _COMPRESSED:
+        return zlib.decompress(value[1:])
+    return value[1:]
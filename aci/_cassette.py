@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Literal, NamedTuple
+
+import httpx
+
+from aci._exceptions import CassetteMissError
+from aci.utils._logging import REDACTED, SENSITIVE_HEADERS
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+# response headers that describe the encoding of the body on the wire, which is stored decoded
+_DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+_Key = tuple[str, str, str]
+
+
+class _Recording(NamedTuple):
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    latency: float
+
+
+@dataclass(frozen=True)
+class CassetteConfig:
+    """Configuration of recording requests to, or replaying them from, a cassette file.
+
+    A cassette is a JSON Lines file (gzip-compressed if its name ends with .gz) with one entry per
+    request: its method, URL, body digest and headers (with the API key redacted), and the status,
+    headers, body and latency of its response.
+
+    Examples:
+        >>> ACI(cassette=CassetteConfig("traffic.jsonl.gz", mode="record"))
+        >>> ACI(api_key="any", cassette=CassetteConfig("traffic.jsonl.gz", speed=None))
+    """
+
+    path: str | Path
+    mode: Literal["record", "replay"] = "replay"
+    speed: float | None = 1.0
+    """Speed of the replay relative to the recorded latencies, e.g., 1 to wait as long as the
+    recorded responses took, 10 to wait a tenth of it, None to answer immediately."""
+
+    def __post_init__(self) -> None:
+        if self.speed is not None and self.speed <= 0:
+            raise ValueError("speed must be positive or None")
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """An httpx transport recording the requests sent through another transport to a cassette,
+    or answering them from a cassette.
+
+    Requests are matched on their method, URL and body, and identical requests are answered with
+    their recorded responses in order (the last one is repeated once all have been replayed).
+    Unmatched requests raise CassetteMissError.
+    """
+
+    def __init__(
+        self, config: CassetteConfig, transport: httpx.BaseTransport | None = None
+    ) -> None:
+        """
+        Args:
+            config: The cassette to record or replay.
+            transport: The transport requests are sent through while recording. Defaults to an
+                `httpx.HTTPTransport` while recording, and is unused while replaying.
+        """
+        self.config = config
+        # replaying needs no connection pool
+        if transport is None and config.mode == "record":
+            transport = httpx.HTTPTransport()
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._entries: list[dict[str, Any]] = []
+        self._index: dict[_Key, list[_Recording]] = defaultdict(list)
+        self._positions: dict[_Key, int] = defaultdict(int)
+        if config.mode == "replay":
+            with _open(config.path, "rt", self.compressed) as f:
+                self._load(f)
+
+    @property
+    def compressed(self) -> bool:
+        return str(self.config.path).endswith(".gz")
+
+    @property
+    def recording(self) -> bool:
+        return self.config.mode == "record"
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = request.read()
+        key = (request.method, str(request.url), _digest(body))
+        if self.recording:
+            return self._record(request, key)
+        return self._replay(key)
+
+    def save(self) -> None:
+        """Write the recorded entries to the cassette file, replacing it."""
+        if not self.recording:
+            return
+        path = Path(self.config.path)
+        temp_path = path.with_name(f".{path.name}.tmp")
+        with self._lock:
+            entries = list(self._entries)
+        with _open(temp_path, "wt", self.compressed) as f:
+            f.write(json.dumps({"version": CASSETTE_VERSION}) + "\n")
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        os.replace(temp_path, path)
+        logger.info("Saved %d requests to the cassette %s", len(entries), path)
+
+    def close(self) -> None:
+        self.save()
+        if self._transport is not None:
+            self._transport.close()
+
+    def _record(self, request: httpx.Request, key: _Key) -> httpx.Response:
+        assert self._transport is not None
+        start = time.perf_counter()
+        response = self._transport.handle_request(request)
+        content = response.read()
+        latency = time.perf_counter() - start
+
+        entry: dict[str, Any] = {
+            "method": key[0],
+            "url": key[1],
+            "body_digest": key[2],
+            "request_headers": {
+                name: REDACTED if name.lower() in SENSITIVE_HEADERS else value
+                for name, value in request.headers.items()
+            },
+            "status_code": response.status_code,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in _DROPPED_RESPONSE_HEADERS
+            },
+            "latency": round(latency, 6),
+        }
+        try:
+            entry["body"] = content.decode()
+        except UnicodeDecodeError:
+            entry["body_base64"] = base64.b64encode(content).decode()
+        with self._lock:
+            self._entries.append(entry)
+        return httpx.Response(
+            response.status_code,
+            headers=entry["headers"],
+            content=content,
+            extensions=response.extensions,
+        )
+
+    def _replay(self, key: _Key) -> httpx.Response:
+        recordings = self._index.get(key)
+        if not recordings:
+            raise CassetteMissError(f"No recorded response for {key[0]} {key[1]}")
+        with self._lock:
+            position = self._positions[key]
+            self._positions[key] = position + 1
+        recording = recordings[min(position, len(recordings) - 1)]
+
+        if self.config.speed is not None:
+            time.sleep(recording.latency / self.config.speed)
+        return httpx.Response(
+            recording.status_code, headers=recording.headers, content=recording.content
+        )
+
+    def _load(self, f: IO[str]) -> None:
+        header = json.loads(f.readline() or "{}")
+        if header.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {header.get('version')}")
+        # responses are decoded once here, so that replaying them is only a lookup
+        for line in f:
+            entry = json.loads(line)
+            self._index[(entry["method"], entry["url"], entry["body_digest"])].append(
+                _Recording(
+                    status_code=entry["status_code"],
+                    headers=list(entry["headers"].items()),
+                    content=entry["body"].encode()
+                    if "body" in entry
+                    else base64.b64decode(entry["body_base64"]),
+                    latency=entry["latency"],
+                )
+            )
+
+
+def _digest(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=8).hexdigest() if body else ""
+
+
+def _open(path: str | Path, mode: Literal["rt", "wt"], compressed: bool) -> IO[str]:
+    if compressed:
+        return gzip.open(path, mode, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
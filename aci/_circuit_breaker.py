@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+
+import httpx
+
+from aci._exceptions import (
+    CassetteMissError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    ServerError,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"  # calls go through, failures are counted
+    OPEN = "open"  # calls fail fast with CircuitOpenError
+    HALF_OPEN = "half_open"  # a limited number of trial calls go through
+
+
+@dataclass(frozen=True)
+class CircuitBreakerConfig:
+    """Configuration of the circuit breakers for function executions.
+
+    Every function has its own breaker, and so does every app (the prefix of the function name,
+    e.g., "GMAIL" for "GMAIL__SEND_EMAIL"). A call only goes through if both are not open.
+    """
+
+    failure_threshold: int = 5
+    """Number of consecutive failures of a function that opens its circuit."""
+    app_failure_threshold: int = 10
+    """Number of consecutive failures across all functions of an app that opens the app's circuit."""
+    recovery_timeout: float = 30.0
+    """Seconds a circuit stays open before it lets trial calls through (half-open)."""
+    half_open_max_calls: int = 1
+    """Number of concurrent trial calls allowed while half-open."""
+    failure_exceptions: tuple[type[BaseException], ...] = (
+        ServerError,
+        httpx.TimeoutException,
+        httpx.NetworkError,
+    )
+    """Exceptions that count as failures. Other exceptions (e.g., 4xx errors) count as successes
+    because they mean the app is reachable."""
+    neutral_exceptions: tuple[type[BaseException], ...] = (
+        DeadlineExceededError,
+        CassetteMissError,
+    )
+    """Exceptions raised before the backend answered (e.g., a deadline that passed before the
+    request was sent), which count as neither successes nor failures."""
+
+
+@dataclass
+class CircuitStats:
+    """Point-in-time statistics of a single circuit."""
+
+    name: str
+    state: CircuitState
+    consecutive_failures: int = 0
+    total_successes: int = 0
+    total_failures: int = 0
+    total_rejected: int = 0
+    opened_at: float | None = None  # time.monotonic() when the circuit was last opened
+
+
+@dataclass
+class CircuitBreakerStats:
+    """Statistics of all circuits, keyed by app name and function name."""
+
+    apps: dict[str, CircuitStats] = field(default_factory=dict)
+    functions: dict[str, CircuitStats] = field(default_factory=dict)
+
+
+class _Circuit:
+    def __init__(self, name: str, failure_threshold: int) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.total_successes = 0
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.opened_at: float | None = None
+        self.half_open_calls = 0
+
+    def stats(self) -> CircuitStats:
+        return CircuitStats(
+            name=self.name,
+            state=self.state,
+            consecutive_failures=self.consecutive_failures,
+            total_successes=self.total_successes,
+            total_failures=self.total_failures,
+            total_rejected=self.total_rejected,
+            opened_at=self.opened_at,
+        )
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breakers keyed by app and by function."""
+
+    def __init__(self, config: CircuitBreakerConfig | None = None) -> None:
+        self.config = config or CircuitBreakerConfig()
+        self._lock = threading.Lock()
+        self._apps: dict[str, _Circuit] = {}
+        self._functions: dict[str, _Circuit] = {}
+
+    def before_call(self, function_name: str) -> None:
+        """Check whether a call to the function may go through.
+
+        Raises:
+            CircuitOpenError: If the circuit of the function or of its app is open.
+        """
+        now = time.monotonic()
+        with self._lock:
+            circuits = self._get_circuits(function_name)
+            for circuit in circuits:
+                self._maybe_half_open(circuit, now)
+
+            for circuit in circuits:
+                if circuit.state == CircuitState.OPEN or (
+                    circuit.state == CircuitState.HALF_OPEN
+                    and circuit.half_open_calls >= self.config.half_open_max_calls
+                ):
+                    for rejecting_circuit in circuits:
+                        rejecting_circuit.total_rejected += 1
+                    retry_after = (
+                        max((circuit.opened_at or now) + self.config.recovery_timeout - now, 0.0)
+                        if circuit.state == CircuitState.OPEN
+                        else 0.0
+                    )
+                    raise CircuitOpenError(
+                        f"Circuit for {circuit.name} is {circuit.state.value}, "
+                        f"not calling {function_name}",
+                        circuit_name=circuit.name,
+                        retry_after=retry_after,
+                    )
+
+            for circuit in circuits:
+                if circuit.state == CircuitState.HALF_OPEN:
+                    circuit.half_open_calls += 1
+
+    def record_success(self, function_name: str) -> None:
+        """Record a successful call to the function, closes half-open circuits."""
+        with self._lock:
+            for circuit in self._get_circuits(function_name):
+                circuit.total_successes += 1
+                circuit.consecutive_failures = 0
+                if circuit.state == CircuitState.HALF_OPEN:
+                    logger.info(f"Closing circuit for {circuit.name}")
+                    circuit.state = CircuitState.CLOSED
+                    circuit.half_open_calls = 0
+                    circuit.opened_at = None
+
+    def record_failure(self, function_name: str) -> None:
+        """Record a failed call to the function, may open circuits."""
+        now = time.monotonic()
+        with self._lock:
+            for circuit in self._get_circuits(function_name):
+                circuit.total_failures += 1
+                circuit.consecutive_failures += 1
+                if circuit.state == CircuitState.HALF_OPEN or (
+                    circuit.state == CircuitState.CLOSED
+                    and circuit.consecutive_failures >= circuit.failure_threshold
+                ):
+                    logger.warning(
+                        f"Opening circuit for {circuit.name} after "
+                        f"{circuit.consecutive_failures} consecutive failures"
+                    )
+                    circuit.state = CircuitState.OPEN
+                    circuit.opened_at = now
+                    circuit.half_open_calls = 0
+
+    def record_exception(self, function_name: str, exception: BaseException) -> None:
+        """Record a call that raised, counted as failure only if it is one of failure_exceptions.
+
+        Calls that raised one of neutral_exceptions, or a BaseException that is not an Exception
+        (e.g., KeyboardInterrupt), are neither successes nor failures and only release their
+        half-open trial slot.
+        """
+        if isinstance(exception, self.config.failure_exceptions):
+            self.record_failure(function_name)
+        elif isinstance(exception, self.config.neutral_exceptions) or not isinstance(
+            exception, Exception
+        ):
+            self.release(function_name)
+        else:
+            self.record_success(function_name)
+
+    def release(self, function_name: str) -> None:
+        """Release the half-open trial slots taken by a call that had no outcome."""
+        with self._lock:
+            for circuit in self._get_circuits(function_name):
+                if circuit.state == CircuitState.HALF_OPEN and circuit.half_open_calls > 0:
+                    circuit.half_open_calls -= 1
+
+    def state(self, function_name: str) -> CircuitState:
+        """Return the state of the function's own circuit."""
+        with self._lock:
+            circuit = self._functions.get(function_name)
+            if circuit is None:
+                return CircuitState.CLOSED
+            self._maybe_half_open(circuit, time.monotonic())
+            return circuit.state
+
+    def stats(self) -> CircuitBreakerStats:
+        """Return a snapshot of the statistics of all circuits."""
+        now = time.monotonic()
+        with self._lock:
+            for circuit in (*self._apps.values(), *self._functions.values()):
+                self._maybe_half_open(circuit, now)
+            return CircuitBreakerStats(
+                apps={name: circuit.stats() for name, circuit in self._apps.items()},
+                functions={name: circuit.stats() for name, circuit in self._functions.items()},
+            )
+
+    def reset(self) -> None:
+        """Forget all circuits, closing them."""
+        with self._lock:
+            self._apps.clear()
+            self._functions.clear()
+
+    def _get_circuits(self, function_name: str) -> tuple[_Circuit, _Circuit]:
+        app_name = get_app_name(function_name)
+        app_circuit = self._apps.get(app_name)
+        if app_circuit is None:
+            app_circuit = self._apps[app_name] = _Circuit(
+                app_name, self.config.app_failure_threshold
+            )
+        function_circuit = self._functions.get(function_name)
+        if function_circuit is None:
+            function_circuit = self._functions[function_name] = _Circuit(
+                function_name, self.config.failure_threshold
+            )
+        return app_circuit, function_circuit
+
+    def _maybe_half_open(self, circuit: _Circuit, now: float) -> None:
+        if (
+            circuit.state == CircuitState.OPEN
+            and circuit.opened_at is not None
+            and now - circuit.opened_at >= self.config.recovery_timeout
+        ):
+            logger.info(f"Half-opening circuit for {circuit.name}")
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.half_open_calls = 0
+
+
+def get_app_name(function_name: str) -> str:
+    """Return the app name of an ACI function, e.g., "GMAIL" for "GMAIL__SEND_EMAIL"."""
+    return function_name.split("__", 1)[0]
@@ -1,25 +1,42 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
 from types import TracebackType
-from typing import Any
+from typing import Any, Mapping, Sequence
 
 import httpx
 
+from aci._cache import CacheConfig, ResponseCache
+from aci._cassette import CassetteConfig, CassetteTransport
+from aci._circuit_breaker import CircuitBreaker, CircuitBreakerConfig, get_app_name
+from aci._compression import ACCEPT_ENCODING, CompressionConfig
+from aci._concurrency import AdaptiveConcurrencyLimiter, ConcurrencyLimitConfig
+from aci._config import ClientConfig
 from aci._constants import DEFAULT_SERVER_URL
 from aci._exceptions import APIKeyNotFound
+from aci._hedging import Hedger, HedgingPolicy
+from aci._instrumentation import Instrumentation, InstrumentationHook
+from aci._profiling import ProfileConfig, Profiler, get_env_profiler
+from aci._retry import DEFAULT_RETRY_BUDGET, RetryBudget, RetryPolicy
+from aci._scheduler import FairScheduler, SchedulerConfig, scheduling_owner
+from aci._tracing import Tracing, TracingConfig
+from aci._warmup import ConnectionWarmer, WarmupConfig
 from aci.meta_functions import (
     ACIExecuteFunction,
     ACISearchFunctions,
 )
+from aci.resource._base import NON_IDEMPOTENT_METHODS, RETRYABLE_METHODS
 from aci.resource.app_configurations import AppConfigurationsResource
 from aci.resource.apps import AppsResource
 from aci.resource.functions import FunctionsResource
 from aci.resource.linked_accounts import LinkedAccountsResource
 from aci.types.enums import FunctionDefinitionFormat
+from aci.utils._logging import get_logger
 
-logger: logging.Logger = logging.getLogger(__name__)
+logger: logging.Logger = get_logger(__name__)
 
 
 class ACI:
@@ -34,6 +51,21 @@ class ACI:
         base_url (str | httpx.URL): The base URL for API requests.
         headers (dict): HTTP headers used in requests.
         client (httpx.Client): The HTTP client for making requests.
+        circuit_breaker (CircuitBreaker | None): The circuit breakers of function executions, if
+            enabled. Use `circuit_breaker.stats()` to inspect their state.
+        hedger (Hedger | None): Sends hedged requests, if hedging is enabled. Use
+            `hedger.stats()` to inspect how many requests were hedged.
+        concurrency_limiter (AdaptiveConcurrencyLimiter | None): Limits concurrent requests, if
+            enabled. Use `concurrency_limiter.stats()` to inspect the current limit.
+        scheduler (FairScheduler | None): Schedules requests across linked account owners, if
+            enabled. Use `scheduler.stats()` to inspect the in-flight and waiting requests.
+        profiler (Profiler | None): Profiles a sampled fraction of the calls, if enabled. Use
+            `profiler.report()` or `profiler.dump()` to inspect where the client-side time goes.
+        cassette (CassetteTransport | None): Records or replays the requests, if enabled. Use
+            `cassette.save()` to save a recording without closing the client.
+        cache (ResponseCache | None): Caches the responses of reads, if enabled.
+        warmer (ConnectionWarmer | None): Opens connections ahead of requests and keeps them open,
+            if enabled. Use `warmer.wait_ready()` to wait for the connections to be opened.
     """
 
     def __init__(
@@ -41,6 +73,24 @@ class ACI:
         *,
         api_key: str | None = None,
         base_url: str | httpx.URL | None = None,
+        circuit_breaker: CircuitBreakerConfig | None = None,
+        retry_policy: RetryPolicy | None = None,
+        retry_policies: Mapping[str, RetryPolicy] | None = None,
+        retry_budget: RetryBudget | None = DEFAULT_RETRY_BUDGET,
+        idempotency_key_support: bool = False,
+        hedging: HedgingPolicy | None = None,
+        concurrency_limit: ConcurrencyLimitConfig | None = None,
+        scheduler: SchedulerConfig | None = None,
+        instrumentation_hooks: Sequence[InstrumentationHook] = (),
+        tracing: TracingConfig | None = None,
+        profile: ProfileConfig | None = None,
+        transport: httpx.BaseTransport | None = None,
+        uds: str | None = None,
+        http_client: httpx.Client | None = None,
+        cassette: CassetteConfig | None = None,
+        cache: CacheConfig | None = None,
+        compression: CompressionConfig | None = None,
+        warmup: WarmupConfig | None = None,
     ) -> None:
         """Create and initialize a new ACI client.
 
@@ -50,6 +100,60 @@ class ACI:
             If values are not provided it will try to read from the corresponding environment variables.
             If no value found for api_key, it will raise APIKeyNotFound.
             If no value found for base_url, it will use the default value.
+            circuit_breaker: Optional circuit breaker configuration for function executions. If set,
+            executions of functions (or apps) that keep failing fail fast with CircuitOpenError
+            instead of being sent (and retried) until the circuit recovers.
+            retry_policy: The default retry policy of all methods of this client.
+            retry_policies: Retry policies for specific methods, overriding the default, keyed by
+            "<resource>.<method>", e.g., {"functions.execute": RetryPolicy(max_attempts=1)}.
+            retry_budget: The budget that limits retries to a fraction of recent requests. By default
+            it is shared by all clients in the process, pass None to not limit retries.
+            idempotency_key_support: Whether the backend deduplicates mutations (e.g., function
+            executions) by the idempotency key that is sent with them. If true, mutations are retried
+            like reads, otherwise only on errors that guarantee the request was not processed
+            (e.g., connection errors, 429) so that they are never applied twice.
+            hedging: Optional hedging policy for latency-critical reads (by default functions.search
+            and functions.get_definition). If set, a duplicate request is sent when a request is
+            slower than a percentile of recent latencies, and the first response is used.
+            concurrency_limit: Optional adaptive limit of concurrent requests, shared by all threads
+            using this client. The limit grows while the backend is healthy and is cut on 429s, 5xx
+            errors, timeouts and latency spikes, so that throughput tracks the backend's capacity.
+            scheduler: Optional scheduling of requests by priority (see `priority`) and across
+            linked account owners, with per-owner concurrency caps and weighted fair queuing, so
+            that neither background work nor a single owner running bulk calls can add latency to
+            interactive calls of other owners.
+            instrumentation_hooks: Hooks called with the endpoint, status, latency, attempt and
+            sizes of every request and with every retry, e.g., a MetricsCollector.
+            tracing: Optional OpenTelemetry tracing (requires `pip install 'aci-sdk[tracing]'`).
+            If set, method calls, their attempts, requests and handle_function_call get spans, and
+            requests carry the W3C `traceparent` header. Without it, tracing costs nothing.
+            profile: Optional profiling mode, sampling a fraction of the calls and breaking their
+            client-side time down into validation, JSON encoding, network wait, decoding,
+            response validation and model_dump. If not set, it is read from the ACI_PROFILE
+            environment variable (the sample rate), in which case the report is written to stderr
+            at exit.
+            transport: Optional transport of the HTTPX client, e.g., an in-process transport for
+            tests and benchmarks, or a transport with tuned connection pool limits.
+            uds: Optional path of a Unix domain socket to send all requests through, e.g., the one
+            of a local egress proxy or sidecar terminating TLS and pooling upstream connections.
+            http_client: Optional HTTPX client to send requests with instead of creating one, e.g.,
+            a pre-tuned client shared with other code or other ACI clients. Its base URL and
+            headers are left untouched, and it is not closed with this client.
+            cassette: Optional cassette to record the requests and responses of this client to, or
+            to replay them from instead of sending requests, e.g., to profile or benchmark the SDK
+            with production traffic offline. Recordings are saved when the client is closed.
+            cache: Optional caching of the responses of reads (function searches and definitions,
+            app searches and details, linked accounts and app configurations) in a backend that
+            can be shared with other clients and processes, e.g., a SQLiteCache. Cached responses
+            are invalidated by the mutations of clients sharing the backend.
+            compression: Optional gzip compression of large request bodies, e.g., executions of
+            functions with big inputs, for backends accepting compressed bodies. Responses are
+            always requested compressed, with every encoding HTTPX can decode (gzip and deflate,
+            br and zstd with `pip install 'aci-sdk[compression]'`).
+            warmup: Optional warm-up of connections, opening them in the background when the
+            client is created and pinging them periodically so that they stay open through idle
+            periods, so that the first calls (e.g., of an agent session) do not wait for DNS, TCP
+            and TLS.
         """
         if api_key is None:
             api_key = os.environ.get("ACI_API_KEY")
@@ -63,17 +167,92 @@ class ACI:
         self.headers = {
             "Content-Type": "application/json",
             "x-api-key": api_key,
+            "Accept-Encoding": ACCEPT_ENCODING,
         }
-        self.httpx_client = httpx.Client(base_url=self.base_url, headers=self.headers)
+        if http_client is not None and (transport or uds or cassette):
+            raise ValueError("transport, uds and cassette can not be set with http_client")
+        if transport is not None and uds is not None:
+            raise ValueError("Only one of transport and uds can be set")
+        limits = (
+            warmup.get_pool_limits()
+            if warmup is not None
+            else httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+        if uds is not None:
+            transport = httpx.HTTPTransport(uds=uds, limits=limits)
+        self.cassette = CassetteTransport(cassette, transport) if cassette else None
+        if self.cassette is not None:
+            transport = self.cassette
+        self._owns_httpx_client = http_client is None
+        self.httpx_client = http_client or httpx.Client(
+            base_url=self.base_url, headers=self.headers, transport=transport, limits=limits
+        )
+
+        unknown_methods = set(retry_policies or {}) - RETRYABLE_METHODS
+        if unknown_methods:
+            raise ValueError(f"Unknown methods in retry_policies: {sorted(unknown_methods)}")
+
+        if hedging is not None:
+            unknown_methods = set(hedging.methods) - RETRYABLE_METHODS
+            if unknown_methods:
+                raise ValueError(f"Unknown methods in hedging policy: {sorted(unknown_methods)}")
+            non_idempotent_methods = set(hedging.methods) & NON_IDEMPOTENT_METHODS
+            if non_idempotent_methods:
+                raise ValueError(
+                    f"Non-idempotent methods can not be hedged: {sorted(non_idempotent_methods)}"
+                )
+
+        self.circuit_breaker = CircuitBreaker(circuit_breaker) if circuit_breaker else None
+        self.hedger = Hedger(hedging) if hedging else None
+        self.concurrency_limiter = (
+            AdaptiveConcurrencyLimiter(concurrency_limit) if concurrency_limit else None
+        )
+        self.scheduler = FairScheduler(scheduler) if scheduler else None
+        # the profiler configured with ACI_PROFILE is shared by the clients, and outlives them
+        self._owns_profiler = profile is not None
+        self.profiler = Profiler(profile) if profile is not None else get_env_profiler()
+        self.cache = ResponseCache(cache) if cache else None
+        self._config = ClientConfig(
+            retry_policy=retry_policy or RetryPolicy(),
+            retry_policies=dict(retry_policies or {}),
+            retry_budget=retry_budget,
+            idempotency_key_support=idempotency_key_support,
+            circuit_breaker=self.circuit_breaker,
+            hedger=self.hedger,
+            concurrency_limiter=self.concurrency_limiter,
+            scheduler=self.scheduler,
+            instrumentation=Instrumentation(instrumentation_hooks)
+            if instrumentation_hooks
+            else None,
+            tracing=Tracing(tracing) if tracing else None,
+            profiler=self.profiler,
+            cache=self.cache,
+            compression=compression,
+            # responses depend on the backend and on the project of the API key
+            cache_namespace=hashlib.sha256(f"{self.base_url}|{api_key}".encode()).hexdigest()[:32],
+            shared_client_base_url=None if self._owns_httpx_client else self.base_url,
+            shared_client_headers={} if self._owns_httpx_client else self.headers,
+        )
 
         # Initialize resource clients
-        self.apps = AppsResource(self.httpx_client)
-        self.functions = FunctionsResource(self.httpx_client)
-        self.app_configurations = AppConfigurationsResource(self.httpx_client)
-        self.linked_accounts = LinkedAccountsResource(self.httpx_client)
+        self.apps = AppsResource(self.httpx_client, self._config)
+        self.functions = FunctionsResource(self.httpx_client, self._config)
+        self.app_configurations = AppConfigurationsResource(self.httpx_client, self._config)
+        self.linked_accounts = LinkedAccountsResource(self.httpx_client, self._config)
+
+        self.warmer = (
+            ConnectionWarmer(self.httpx_client, str(self.base_url.join(warmup.ping_path)), warmup)
+            if warmup
+            else None
+        )
+        self._httpx_client_entered = False
+        if self.warmer is not None:
+            # HTTPX clients can only be entered before sending requests, such as the pings
+            self._enter_httpx_client()
+            self.warmer.start()
 
     def __enter__(self) -> ACI:
-        self.httpx_client.__enter__()
+        self._enter_httpx_client()
         return self
 
     def __exit__(
@@ -82,7 +261,28 @@ class ACI:
         exc_val: BaseException | None = None,
         exc_tb: TracebackType | None = None,
     ) -> None:
-        self.httpx_client.__exit__(exc_type, exc_val, exc_tb)
+        self.close()
+
+    def close(self) -> None:
+        """Close the client: stop the connection warm-up, shut down the threads sending hedged
+        requests, and close the HTTPX client unless it was passed as `http_client`.
+
+        Call it when the client is not used as a context manager, e.g., when it is created with a
+        warm-up, whose pings run in a background thread until the client is closed.
+        """
+        if self.warmer is not None:
+            self.warmer.close()
+        if self.hedger is not None:
+            self.hedger.close()
+        if self.profiler is not None and self._owns_profiler:
+            self.profiler.close()
+        if self._owns_httpx_client:
+            self.httpx_client.close()
+
+    def _enter_httpx_client(self) -> None:
+        if self._owns_httpx_client and not self._httpx_client_entered:
+            self.httpx_client.__enter__()
+            self._httpx_client_entered = True
 
     def handle_function_call(
         self,
@@ -110,22 +310,67 @@ class ACI:
         Returns:
             Any: The result (serializable) of the function execution. It varies based on the function.
         """
+        # formatted (and redacted) only if the record is logged
         logger.info(
-            f"Handling function call with "
-            f"name={function_name}, "
-            f"params={function_arguments}, "
-            f"linked_account_owner_id={linked_account_owner_id}, "
-            f"allowed_apps_only={allowed_apps_only}, "
-            f"allowed_only={allowed_only}, "
-            f"format={format}"
+            "Handling function call with name=%(function_name)s, "
+            "params=%(function_arguments)s, "
+            "linked_account_owner_id=%(linked_account_owner_id)s, "
+            "allowed_apps_only=%(allowed_apps_only)s, "
+            "allowed_only=%(allowed_only)s, "
+            "format=%(format)s",
+            {
+                "function_name": function_name,
+                "function_arguments": function_arguments,
+                "linked_account_owner_id": linked_account_owner_id,
+                "allowed_apps_only": allowed_apps_only,
+                "allowed_only": allowed_only,
+                "format": format,
+            },
         )
-        if function_name == ACISearchFunctions.get_name():
-            functions = self.functions.search(
-                **function_arguments,
-                allowed_only=allowed_only or allowed_apps_only,
-                format=format,
+        tracing = self._config.tracing
+        if tracing is None:
+            return self._handle_function_call(
+                function_name,
+                function_arguments,
+                linked_account_owner_id,
+                allowed_only or allowed_apps_only,
+                format,
+            )
+
+        with tracing.span(
+            "aci.handle_function_call",
+            {
+                "aci.function.name": function_name,
+                "aci.app.name": get_app_name(function_name) if "__" in function_name else None,
+                "aci.owner_id.hash": tracing.hash_owner_id(linked_account_owner_id),
+                "aci.function.arguments.size": len(json.dumps(function_arguments, default=str)),
+            },
+        ):
+            return self._handle_function_call(
+                function_name,
+                function_arguments,
+                linked_account_owner_id,
+                allowed_only or allowed_apps_only,
+                format,
             )
 
+    def _handle_function_call(
+        self,
+        function_name: str,
+        function_arguments: dict,
+        linked_account_owner_id: str,
+        allowed_only: bool,
+        format: FunctionDefinitionFormat,
+    ) -> Any:
+        if function_name == ACISearchFunctions.get_name():
+            # scheduled as a request of the owner, like the executions it leads to
+            with scheduling_owner(linked_account_owner_id):
+                functions = self.functions.search(
+                    **function_arguments,
+                    allowed_only=allowed_only,
+                    format=format,
+                )
+
             return functions
 
         elif function_name == ACIExecuteFunction.get_name():
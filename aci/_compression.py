@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Any
+
+# the response encodings HTTPX can decode, br and zstd only if their decoders are installed
+ACCEPT_ENCODING = ", ".join(
+    [
+        "gzip",
+        "deflate",
+        *(["br"] if find_spec("brotli") or find_spec("brotlicffi") else []),
+        *(["zstd"] if find_spec("zstandard") else []),
+    ]
+)
+
+
+@dataclass(frozen=True)
+class CompressionConfig:
+    """Configuration of the gzip compression of large request bodies, e.g., the input of a
+    function execution with a document in it.
+
+    Only enable it if the backend (or a proxy in front of it) accepts gzip-encoded request bodies.
+    Small bodies are sent as is, as compressing them costs more CPU time than it saves on the wire,
+    see benchmarks/bench_compression.py.
+    """
+
+    min_bytes: int = 16 * 1024
+    """Minimum size of the JSON-encoded bodies that are compressed."""
+    level: int = 1
+    """The gzip compression level, from 1 (fastest) to 9 (smallest). Higher levels save few bytes
+    on JSON bodies for several times the CPU time."""
+
+    def __post_init__(self) -> None:
+        if self.min_bytes < 0:
+            raise ValueError("min_bytes must be non-negative")
+        if not 1 <= self.level <= 9:
+            raise ValueError("level must be between 1 and 9")
+
+
+def encode_json_body(json_body: Any, config: CompressionConfig) -> tuple[bytes, dict[str, str]]:
+    """Encode a JSON request body, compressed if it is at least `config.min_bytes` long.
+
+    Returns:
+        tuple[bytes, dict[str, str]]: The body, and the headers describing it.
+    """
+    # encoded like httpx encodes the json argument of requests
+    content = json.dumps(
+        json_body, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+    ).encode()
+    headers = {"Content-Type": "application/json"}
+    if len(content) >= config.min_bytes:
+        # mtime=0, so that identical bodies are compressed identically, e.g., for cassettes
+        content = gzip.compress(content, config.level, mtime=0)
+        headers["Content-Encoding"] = "gzip"
+    return content, headers
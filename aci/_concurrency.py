@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+
+from aci._exceptions import DeadlineExceededError
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+class RequestOutcome(str, Enum):
+    """Outcome of a request, as far as the concurrency limit is concerned."""
+
+    SUCCESS = "success"  # the backend kept up, the limit may grow
+    OVERLOAD = "overload"  # 429, 5xx or timeout, the limit is cut
+    IGNORE = "ignore"  # says nothing about the capacity of the backend, e.g., a 4xx error
+
+
+def get_request_outcome(status_code: int) -> RequestOutcome:
+    """Return the outcome of a request that received a response with the given status code."""
+    if status_code == 429 or status_code >= 500:
+        return RequestOutcome.OVERLOAD
+    if status_code >= 400:
+        return RequestOutcome.IGNORE
+    return RequestOutcome.SUCCESS
+
+
+@dataclass(frozen=True)
+class ConcurrencyLimitConfig:
+    """Configuration of the adaptive (AIMD) limit of concurrent requests of a client.
+
+    The limit grows additively (by `increase` per limit-worth of healthy requests, i.e., about once
+    per round trip) and is cut multiplicatively (by `decrease_factor`) on overload: 429 and 5xx
+    responses, timeouts, and `latency_spike_count` consecutive latencies of an endpoint above
+    `latency_spike_ratio` times its smoothed latency. Every endpoint (and function, for the
+    endpoints of a function) has its own smoothed latency, as e.g. the executions of some
+    functions are slower than others by nature, not because the backend is overloaded.
+    """
+
+    initial_limit: int = 10
+    min_limit: int = 1
+    max_limit: int = 200
+    increase: float = 1.0
+    decrease_factor: float = 0.5
+    latency_spike_ratio: float = 3.0
+    """A latency above this multiple of the smoothed latency of the endpoint is a spike."""
+    latency_spike_count: int = 3
+    """Number of consecutive spikes of an endpoint that count as overload, so that the tail
+    latency of single requests does not cut the limit."""
+    latency_smoothing: float = 0.1
+    """Weight of a new latency sample in the exponentially smoothed latency."""
+
+
+@dataclass
+class ConcurrencyLimiterStats:
+    """Point-in-time statistics of a concurrency limiter."""
+
+    limit: int
+    in_flight: int
+    waiting: int
+    smoothed_latencies: dict[str, float]
+    """Smoothed latency (in seconds) per endpoint, e.g., "GET functions/search"."""
+    increases: int
+    decreases: int
+
+
+class AdaptiveConcurrencyLimiter:
+    """Thread-safe AIMD limiter of concurrent requests, shared by all resources of a client.
+
+    Every request acquires a slot before it is sent and releases it with its outcome once it
+    completed, which adjusts the limit. A single overload event cuts the limit only once: outcomes
+    of requests that were started before the last cut do not cut it again.
+    """
+
+    def __init__(self, config: ConcurrencyLimitConfig | None = None) -> None:
+        self.config = config or ConcurrencyLimitConfig()
+        if not 1 <= self.config.min_limit <= self.config.initial_limit <= self.config.max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        self._condition = threading.Condition()
+        self._limit = float(self.config.initial_limit)
+        self._in_flight = 0
+        self._waiting = 0
+        self._smoothed_latencies: dict[str, float] = {}
+        # number of consecutive latency spikes per endpoint
+        self._spikes: dict[str, int] = {}
+        self._last_decrease = float("-inf")
+        self._increases = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """The current limit of concurrent requests."""
+        return int(self._limit)
+
+    def acquire(self, timeout: float | None = None) -> float:
+        """Wait for a free slot and take it.
+
+        Args:
+            timeout: Maximum seconds to wait, None to wait until a slot is free.
+
+        Returns:
+            float: The time.monotonic() the slot was acquired at, to be passed to `release`.
+
+        Raises:
+            DeadlineExceededError: If no slot became free within the timeout.
+        """
+        with self._condition:
+            self._waiting += 1
+            try:
+                if not self._condition.wait_for(
+                    lambda: self._in_flight < int(self._limit), timeout=timeout
+                ):
+                    raise DeadlineExceededError(
+                        f"Deadline exceeded waiting for one of {int(self._limit)} request slots"
+                    )
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+        return time.monotonic()
+
+    def release(self, start: float, outcome: RequestOutcome, endpoint: str = "") -> None:
+        """Release a slot and adjust the limit to the outcome of its request.
+
+        Args:
+            start: The value returned by `acquire`.
+            outcome: The outcome of the request.
+            endpoint: The endpoint of the request, whose latency is only compared with the
+                smoothed latency of the same endpoint, e.g., "GET functions/search", or
+                "POST functions/{function_name}/execute GITHUB__STAR_REPOSITORY" to compare the
+                executions of every function separately.
+        """
+        now = time.monotonic()
+        latency = now - start
+        with self._condition:
+            self._in_flight -= 1
+
+            if outcome == RequestOutcome.SUCCESS:
+                outcome = self._observe_latency(endpoint, latency)
+
+            if outcome == RequestOutcome.OVERLOAD:
+                if start >= self._last_decrease:
+                    self._decrease(now)
+            elif outcome == RequestOutcome.SUCCESS and self._limit < self.config.max_limit:
+                self._limit = min(
+                    self._limit + self.config.increase / self._limit, float(self.config.max_limit)
+                )
+                self._increases += 1
+
+            self._condition.notify_all()
+
+    def stats(self) -> ConcurrencyLimiterStats:
+        """Return a snapshot of the limiter's state."""
+        with self._condition:
+            return ConcurrencyLimiterStats(
+                limit=int(self._limit),
+                in_flight=self._in_flight,
+                waiting=self._waiting,
+                smoothed_latencies=dict(self._smoothed_latencies),
+                increases=self._increases,
+                decreases=self._decreases,
+            )
+
+    def _observe_latency(self, endpoint: str, latency: float) -> RequestOutcome:
+        smoothed_latency = self._smoothed_latencies.get(endpoint)
+        if (
+            smoothed_latency is None
+            or latency <= self.config.latency_spike_ratio * smoothed_latency
+        ):
+            self._spikes[endpoint] = 0
+            self._smooth_latency(endpoint, latency)
+            return RequestOutcome.SUCCESS
+
+        # spikes are kept out of the smoothed latency until they are sustained, so that the
+        # smoothed latency does not catch up with them before they count as overload
+        spikes = self._spikes.get(endpoint, 0) + 1
+        if spikes < self.config.latency_spike_count:
+            self._spikes[endpoint] = spikes
+            return RequestOutcome.SUCCESS
+        self._spikes[endpoint] = 0
+        self._smooth_latency(endpoint, latency)
+        return RequestOutcome.OVERLOAD
+
+    def _smooth_latency(self, endpoint: str, latency: float) -> None:
+        smoothed_latency = self._smoothed_latencies.get(endpoint)
+        if smoothed_latency is None:
+            self._smoothed_latencies[endpoint] = latency
+        else:
+            alpha = self.config.latency_smoothing
+            self._smoothed_latencies[endpoint] = alpha * latency + (1 - alpha) * smoothed_latency
+
+    def _decrease(self, now: float) -> None:
+        new_limit = max(self._limit * self.config.decrease_factor, float(self.config.min_limit))
+        logger.warning(
+            f"Backend overloaded, decreasing the concurrency limit from "
+            f"{int(self._limit)} to {int(new_limit)}"
+        )
+        self._limit = new_limit
+        self._last_decrease = now
+        self._decreases += 1
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import httpx
+
+from aci._cache import ResponseCache
+from aci._circuit_breaker import CircuitBreaker
+from aci._compression import CompressionConfig
+from aci._concurrency import AdaptiveConcurrencyLimiter
+from aci._hedging import Hedger
+from aci._instrumentation import Instrumentation
+from aci._profiling import Profiler
+from aci._retry import DEFAULT_RETRY_BUDGET, RetryBudget, RetryPolicy
+from aci._scheduler import FairScheduler
+from aci._tracing import Tracing
+
+
+@dataclass
+class ClientConfig:
+    """Settings and shared components used by all resources of an ACI client for their requests."""
+
+    retry_policy: RetryPolicy = field(default_factory=RetryPolicy)
+    """The default retry policy of all methods."""
+    retry_policies: dict[str, RetryPolicy] = field(default_factory=dict)
+    """Retry policies overriding the default for specific methods, e.g., "functions.execute"."""
+    retry_budget: RetryBudget | None = DEFAULT_RETRY_BUDGET
+    """The retry budget every retry is withdrawn from, None to not limit retries."""
+    idempotency_key_support: bool = False
+    """Whether the backend deduplicates mutations by their idempotency key, so that they can be
+    retried like reads."""
+    circuit_breaker: CircuitBreaker | None = None
+    """The circuit breakers of function executions, None if disabled."""
+    hedger: Hedger | None = None
+    """Sends hedged requests for latency-critical reads, None if hedging is disabled."""
+    concurrency_limiter: AdaptiveConcurrencyLimiter | None = None
+    """Limits the concurrent requests of all resources of the client, None for no limit."""
+    scheduler: FairScheduler | None = None
+    """Schedules requests fairly across linked account owners, None to send them right away."""
+    instrumentation: Instrumentation | None = None
+    """Reports requests and retries to the instrumentation hooks, None if there are none."""
+    tracing: Tracing | None = None
+    """Creates the spans of calls, attempts and requests, None if tracing is disabled."""
+    profiler: Profiler | None = None
+    """Profiles a sampled fraction of the calls, None if profiling is disabled."""
+    cache: ResponseCache | None = None
+    """Caches the responses of reads, None if caching is disabled."""
+    cache_namespace: str = ""
+    """The namespace of the cached responses of the client, e.g., a hash of its API key."""
+    compression: CompressionConfig | None = None
+    """Compresses large request bodies, None to send them as is."""
+    shared_client_base_url: httpx.URL | None = None
+    """The base URL of the requests, set if the HTTPX client is shared with other code and can not
+    be configured with it, None to send requests relative to the base URL of the HTTPX client."""
+    shared_client_headers: dict[str, str] = field(default_factory=dict)
+    """The headers sent with every request if the HTTPX client is shared, e.g., the API key."""
+
+    def get_retry_policy(self, method: str, idempotent: bool = True) -> RetryPolicy:
+        """Return the retry policy of a method.
+
+        Args:
+            method: The name of the method, e.g., "functions.execute".
+            idempotent: Whether the method can safely be sent more than once. Unless configured
+                explicitly for the method, non-idempotent methods are only retried on errors that
+                guarantee the request was not processed, if the backend can not deduplicate them.
+        """
+        policy = self.retry_policies.get(method)
+        if policy is not None:
+            return policy
+        if idempotent or self.idempotency_key_support:
+            return self.retry_policy
+        return self.retry_policy.for_mutations()
@@ -2,5 +2,12 @@ DEFAULT_MAX_RETRIES = 3
 DEFAULT_RETRY_MULTIPLIER = 1
 DEFAULT_RETRY_MIN_WAIT = 2
 DEFAULT_RETRY_MAX_WAIT = 8
+# retries are allowed for up to this fraction of the requests in the budget window
+DEFAULT_RETRY_BUDGET_RATIO = 0.2
+# retries allowed per second regardless of the ratio, so that low-traffic clients can still retry
+DEFAULT_RETRY_BUDGET_MIN_RETRIES_PER_SECOND = 10
+DEFAULT_RETRY_BUDGET_WINDOW_SECONDS = 10
+# header carrying the key the backend can deduplicate retried mutations by
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
 DEFAULT_SERVER_URL = "https://api.aci.dev/v1/"
 DEFAULT_AFTER_OAUTH2_FLOW_REDIRECT_URL = "https://platform.aci.dev"
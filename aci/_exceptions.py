@@ -1,8 +1,10 @@
 class ACIError(Exception):
     """Base exception for all ACI SDK errors"""
 
-    def __init__(self, message: str):
+    def __init__(self, message: str, status_code: int | None = None):
         super().__init__(message)
+        # HTTP status code of the response that caused the error, if any
+        self.status_code = status_code
 
 
 class APIKeyNotFound(ACIError):
@@ -51,3 +53,24 @@ class UnknownError(ACIError):
     """Raised when an unknown error occurs"""
 
     pass
+
+
+class CircuitOpenError(ACIError):
+    """Raised without calling the backend when the circuit breaker of an app or function is open"""
+
+    def __init__(self, message: str, circuit_name: str, retry_after: float):
+        super().__init__(message)
+        self.circuit_name = circuit_name
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(ACIError):
+    """Raised when the deadline of a call has passed before a request could be sent"""
+
+    pass
+
+
+class CassetteMissError(ACIError):
+    """Raised when replaying a cassette that has no recorded response for a request"""
+
+    pass
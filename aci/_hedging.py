@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import httpx
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# recompute the hedge delay of a method after this many new latency samples
+_DELAY_REFRESH_INTERVAL = 16
+# steps of httpcore a losing request is aborted at, whose failure closes the connection (unlike
+# e.g. response_closed, which must run for the connection to be released)
+_ABORTABLE_STEPS = {
+    "connect_tcp",
+    "connect_unix_socket",
+    "start_tls",
+    "send_request_headers",
+    "send_request_body",
+    "receive_response_headers",
+    "receive_response_body",
+}
+
+
+@dataclass(frozen=True)
+class HedgingPolicy:
+    """Configuration of request hedging for latency-critical idempotent reads.
+
+    If a request has not been answered after a delay (a percentile of the recent latencies of the
+    method), a duplicate request is sent and whichever response arrives first is used.
+    """
+
+    methods: frozenset[str] = frozenset({"functions.search", "functions.get_definition"})
+    """Methods whose requests are hedged. Only idempotent reads should be hedged."""
+    percentile: float = 95.0
+    """Percentile of the recent latencies of a method to wait before sending the hedge request."""
+    initial_delay: float = 0.5
+    """Delay (in seconds) used until `min_samples` latencies of a method have been observed."""
+    min_delay: float = 0.01
+    """Lower bound of the delay (in seconds)."""
+    max_delay: float = 5.0
+    """Upper bound of the delay (in seconds)."""
+    min_samples: int = 20
+    """Number of latency samples of a method required to derive the delay from them."""
+    window: int = 1000
+    """Number of most recent latency samples kept per method."""
+    max_hedge_ratio: float = 0.1
+    """Maximum fraction of requests that may be hedged, to avoid amplifying load."""
+    max_burst: float = 10.0
+    """Maximum number of hedges that can be sent in a burst after a quiet period."""
+    max_workers: int = 32
+    """Maximum number of threads sending (primary and hedge) requests concurrently. Requests
+    made while all of them are busy are sent in the calling thread, without hedging."""
+
+
+@dataclass
+class HedgingStats:
+    """Counters of request hedging."""
+
+    requests: int = 0
+    """Number of requests eligible for hedging."""
+    hedges: int = 0
+    """Number of hedge requests sent."""
+    hedge_wins: int = 0
+    """Number of hedge requests that answered before their primary request."""
+    suppressed: int = 0
+    """Number of hedges not sent because `max_hedge_ratio` was reached or all the workers were
+    busy."""
+    saturated: int = 0
+    """Number of requests sent in the calling thread, without hedging, as all the workers were
+    busy."""
+    cancelled: int = 0
+    """Number of losing requests that were cancelled before being sent."""
+    aborted: int = 0
+    """Number of losing requests that were aborted in flight, closing their connection."""
+    delays: dict[str, float] = field(default_factory=dict)
+    """Current hedge delay (in seconds) per method."""
+
+
+class Hedger:
+    """Sends hedged requests and tracks the latencies the hedge delays are derived from."""
+
+    def __init__(self, policy: HedgingPolicy | None = None) -> None:
+        self.policy = policy or HedgingPolicy()
+        self._lock = threading.Lock()
+        self._latencies: dict[str, deque[float]] = {}
+        self._samples_since_refresh: dict[str, int] = {}
+        self._delays: dict[str, float] = {}
+        self._tokens = self.policy.max_burst
+        self._stats = HedgingStats()
+        self._executor: ThreadPoolExecutor | None = None
+        # workers not sending a request, so that requests never wait for one
+        self._workers = threading.BoundedSemaphore(self.policy.max_workers)
+
+    def should_hedge(self, method: str) -> bool:
+        """Return whether requests of the method are hedged."""
+        return method in self.policy.methods
+
+    def send(
+        self, method: str, send_request: Callable[[dict[str, Any]], httpx.Response]
+    ) -> httpx.Response:
+        """Send a request, hedging it if it does not complete within the delay of the method.
+
+        The requests are sent by a pool of `policy.max_workers` threads, so that the first
+        response can be returned while the other request is in flight. When all of them are busy,
+        the request is sent in the calling thread without hedging, rather than waiting for one.
+
+        Args:
+            method: The name of the method sending the request, e.g., "functions.search".
+            send_request: Sends the request with the given HTTPX request extensions, called once
+                or twice (possibly concurrently).
+
+        Returns:
+            httpx.Response: The response that arrived first.
+        """
+        with self._lock:
+            self._stats.requests += 1
+            self._tokens = min(self._tokens + self.policy.max_hedge_ratio, self.policy.max_burst)
+
+        if not self._workers.acquire(blocking=False):
+            with self._lock:
+                self._stats.saturated += 1
+            return self._timed_send(method, send_request, {})
+        primary = self._submit(method, send_request)
+
+        # the delay starts when the request is sent
+        primary.started.wait()
+        done, _ = wait([primary.future], timeout=self.get_delay(method))
+        if done:
+            return primary.future.result()
+        if not self._workers.acquire(blocking=False):
+            with self._lock:
+                self._stats.suppressed += 1
+            return primary.future.result()
+        if not self._try_acquire_hedge():
+            self._workers.release()
+            return primary.future.result()
+
+        logger.debug(f"Hedging request of {method}")
+        hedge = self._submit(method, send_request)
+        return self._first_response(primary, hedge)
+
+    def get_delay(self, method: str) -> float:
+        """Return the current hedge delay (in seconds) of a method."""
+        with self._lock:
+            return self._delays.get(method, self.policy.initial_delay)
+
+    def record_latency(self, method: str, latency: float) -> None:
+        """Record the latency (in seconds) of a completed request of the method."""
+        with self._lock:
+            latencies = self._latencies.get(method)
+            if latencies is None:
+                latencies = self._latencies[method] = deque(maxlen=self.policy.window)
+            latencies.append(latency)
+
+            samples = self._samples_since_refresh.get(method, 0) + 1
+            if samples >= _DELAY_REFRESH_INTERVAL and len(latencies) >= self.policy.min_samples:
+                self._delays[method] = self._compute_delay(latencies)
+                samples = 0
+            self._samples_since_refresh[method] = samples
+
+    def stats(self) -> HedgingStats:
+        """Return a snapshot of the hedging counters."""
+        with self._lock:
+            return HedgingStats(
+                requests=self._stats.requests,
+                hedges=self._stats.hedges,
+                hedge_wins=self._stats.hedge_wins,
+                suppressed=self._stats.suppressed,
+                saturated=self._stats.saturated,
+                cancelled=self._stats.cancelled,
+                aborted=self._stats.aborted,
+                delays=dict(self._delays),
+            )
+
+    def close(self) -> None:
+        """Shut down the threads sending the requests."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _try_acquire_hedge(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self._stats.suppressed += 1
+                return False
+            self._tokens -= 1
+            self._stats.hedges += 1
+            return True
+
+    def _compute_delay(self, latencies: deque[float]) -> float:
+        ordered = sorted(latencies)
+        index = max(math.ceil(self.policy.percentile / 100 * len(ordered)) - 1, 0)
+        return min(max(ordered[index], self.policy.min_delay), self.policy.max_delay)
+
+    def _submit(
+        self, method: str, send_request: Callable[[dict[str, Any]], httpx.Response]
+    ) -> _HedgedRequest:
+        """Send a request in the pool, on a worker acquired from `_workers`."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.policy.max_workers, thread_name_prefix="aci-hedging"
+                )
+            executor = self._executor
+
+        request = _HedgedRequest()
+
+        def run() -> httpx.Response:
+            request.started.set()
+            try:
+                return self._timed_send(method, send_request, {"trace": request.trace})
+            finally:
+                self._workers.release()
+
+        # run in a copy of the caller's context, so that e.g. its deadline applies to the request
+        try:
+            request.future = executor.submit(contextvars.copy_context().run, run)
+        except BaseException:
+            self._workers.release()
+            raise
+        return request
+
+    def _timed_send(
+        self,
+        method: str,
+        send_request: Callable[[dict[str, Any]], httpx.Response],
+        extensions: dict[str, Any],
+    ) -> httpx.Response:
+        start = time.monotonic()
+        response = send_request(extensions)
+        self.record_latency(method, time.monotonic() - start)
+        return response
+
+    def _first_response(self, primary: _HedgedRequest, hedge: _HedgedRequest) -> httpx.Response:
+        pending = {primary.future, hedge.future}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+            if winner is not None or not pending:
+                break
+
+        if winner is None:
+            # both requests failed, raise the error of the primary request
+            return primary.future.result()
+
+        for loser in (primary, hedge):
+            if loser.future is winner:
+                continue
+            if loser.future.cancel():
+                with self._lock:
+                    self._stats.cancelled += 1
+                continue
+            # a request in flight is aborted at its next step, e.g., before reading its body
+            loser.cancel(self._on_abort)
+            loser.future.add_done_callback(_close_response)
+
+        if winner is hedge.future:
+            with self._lock:
+                self._stats.hedge_wins += 1
+        return winner.result()
+
+    def _on_abort(self) -> None:
+        with self._lock:
+            self._stats.aborted += 1
+
+
+class _HedgeCancelledError(Exception):
+    """Raised in the thread of a losing request to abort it."""
+
+
+class _HedgedRequest:
+    """A request sent by the pool of a Hedger, which can be aborted in flight through the trace
+    extension of httpcore: it is called at every step of the request (sending the headers,
+    receiving the headers, receiving the body, ...), and raising in it closes the connection."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.future: Future[httpx.Response] = Future()
+        self._on_abort: Callable[[], None] | None = None
+
+    def cancel(self, on_abort: Callable[[], None]) -> None:
+        self._on_abort = on_abort
+
+    def trace(self, event_name: str, info: dict[str, Any]) -> None:
+        on_abort = self._on_abort
+        # e.g., "http11.receive_response_body.started"
+        step, _, stage = event_name.rpartition(".")
+        if (
+            on_abort is not None
+            and stage == "started"
+            and step.rpartition(".")[2] in _ABORTABLE_STEPS
+        ):
+            self._on_abort = None
+            on_abort()
+            raise _HedgeCancelledError("The request lost the race against its hedge")
+
+
+def _close_response(future: Future[httpx.Response]) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Sequence
+
+from aci._circuit_breaker import get_app_name
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class RequestEvent:
+    """A single HTTP request sent to the ACI backend, passed to the instrumentation hooks."""
+
+    method: str
+    """The name of the SDK method sending the request, e.g., "functions.execute"."""
+    http_method: str
+    endpoint: str
+    """The endpoint template, e.g., "functions/{function_name}/execute"."""
+    url: str
+    """The URL relative to the base URL of the client."""
+    attempt: int
+    """The attempt of the SDK method call that sends the request, starting at 1."""
+    function_name: str | None = None
+    """The function the request is about, if any."""
+    status_code: int | None = None
+    """The status code of the response, None until a response was received."""
+    latency: float | None = None
+    """Seconds from sending the request until its response (or error) was received."""
+    request_bytes: int = 0
+    response_bytes: int = 0
+    error: BaseException | None = None
+    """The error raised while sending the request, if any."""
+
+    @property
+    def app_name(self) -> str | None:
+        """The app of the function the request is about, if any."""
+        return get_app_name(self.function_name) if self.function_name else None
+
+
+@dataclass(slots=True)
+class RetryEvent:
+    """A retry of an SDK method call, passed to the instrumentation hooks."""
+
+    method: str
+    """The name of the SDK method being retried, e.g., "functions.execute"."""
+    attempt: int
+    """The attempt about to be made, starting at 2."""
+    error: BaseException
+    """The error of the previous attempt."""
+
+
+class InstrumentationHook:
+    """Base class of instrumentation hooks, override the methods of the events to observe.
+
+    Hooks are called synchronously on the thread sending the request, so they should be cheap.
+    Errors raised by hooks are logged and otherwise ignored.
+    """
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        """Called right before a request is sent."""
+
+    def on_response(self, event: RequestEvent) -> None:
+        """Called when the response of a request was received, whatever its status code."""
+
+    def on_error(self, event: RequestEvent) -> None:
+        """Called when sending a request raised (e.g., a timeout), with `event.error` set."""
+
+    def on_retry(self, event: RetryEvent) -> None:
+        """Called before an SDK method call is retried."""
+
+
+class Instrumentation:
+    """Dispatches the instrumentation events of a client to its hooks."""
+
+    def __init__(self, hooks: Sequence[InstrumentationHook]) -> None:
+        self.hooks = tuple(hooks)
+
+    def request_start(self, event: RequestEvent) -> None:
+        for hook in self.hooks:
+            try:
+                hook.on_request_start(event)
+            except Exception:
+                logger.exception(f"Error in instrumentation hook {hook!r}")
+
+    def response(self, event: RequestEvent) -> None:
+        for hook in self.hooks:
+            try:
+                hook.on_response(event)
+            except Exception:
+                logger.exception(f"Error in instrumentation hook {hook!r}")
+
+    def error(self, event: RequestEvent) -> None:
+        for hook in self.hooks:
+            try:
+                hook.on_error(event)
+            except Exception:
+                logger.exception(f"Error in instrumentation hook {hook!r}")
+
+    def retry(self, event: RetryEvent) -> None:
+        for hook in self.hooks:
+            try:
+                hook.on_retry(event)
+            except Exception:
+                logger.exception(f"Error in instrumentation hook {hook!r}")
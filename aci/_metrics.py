@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from aci._instrumentation import InstrumentationHook, RequestEvent, RetryEvent
+
+# upper bounds (in seconds) of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """Point-in-time copy of a latency histogram."""
+
+    buckets: tuple[float, ...]
+    """Upper bounds (in seconds) of the buckets."""
+    counts: tuple[int, ...]
+    """Number of observations per bucket (not cumulative), the last one is for +Inf."""
+    count: int
+    sum: float
+
+    @property
+    def mean(self) -> float | None:
+        return self.sum / self.count if self.count else None
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return the upper bound of the bucket the given percentile (0-100) falls into."""
+        if not self.count:
+            return None
+        rank = max(math.ceil(percentile / 100 * self.count), 1)
+        cumulative = 0
+        for upper_bound, count in zip((*self.buckets, math.inf), self.counts, strict=True):
+            cumulative += count
+            if cumulative >= rank:
+                return upper_bound
+        return math.inf
+
+
+@dataclass(frozen=True)
+class EndpointMetrics:
+    """Point-in-time metrics of the requests to an endpoint."""
+
+    requests: int
+    errors: int
+    """Number of requests that raised or received a 4xx or 5xx response."""
+    status_codes: dict[int, int]
+    latency: HistogramSnapshot
+    request_bytes: int
+    response_bytes: int
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Point-in-time copy of the metrics of a MetricsCollector."""
+
+    endpoints: dict[str, EndpointMetrics] = field(default_factory=dict)
+    """Metrics keyed by HTTP method and endpoint template, e.g., "GET functions/search"."""
+    functions: dict[str, HistogramSnapshot] = field(default_factory=dict)
+    """Latency of the requests about a function (e.g., executions), keyed by function name."""
+    function_errors: dict[str, int] = field(default_factory=dict)
+    retries: dict[str, int] = field(default_factory=dict)
+    """Number of retries keyed by SDK method, e.g., "functions.execute"."""
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: _Histogram) -> None:
+        for index, count in enumerate(list(other.counts)):
+            self.counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            buckets=self.buckets, counts=tuple(self.counts), count=self.count, sum=self.sum
+        )
+
+
+class _Endpoint:
+    __slots__ = ("errors", "latency", "request_bytes", "requests", "response_bytes", "status_codes")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.status_codes: dict[int, int] = {}
+        self.latency = _Histogram(buckets)
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def merge(self, other: _Endpoint) -> None:
+        self.requests += other.requests
+        self.errors += other.errors
+        for status_code, count in other.status_codes.copy().items():
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + count
+        self.latency.merge(other.latency)
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+
+    def snapshot(self) -> EndpointMetrics:
+        return EndpointMetrics(
+            requests=self.requests,
+            errors=self.errors,
+            status_codes=dict(self.status_codes),
+            latency=self.latency.snapshot(),
+            request_bytes=self.request_bytes,
+            response_bytes=self.response_bytes,
+        )
+
+
+class _Shard:
+    """Metrics recorded by a single thread, only ever written to by that thread."""
+
+    __slots__ = ("endpoints", "function_errors", "functions", "retries")
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, _Endpoint] = {}
+        self.functions: dict[str, _Histogram] = {}
+        self.function_errors: dict[str, int] = {}
+        self.retries: dict[str, int] = {}
+
+    def merge(self, other: _Shard, buckets: tuple[float, ...]) -> None:
+        # copies are atomic, the owning thread of the other shard may keep recording meanwhile
+        for key, endpoint in other.endpoints.copy().items():
+            merged_endpoint = self.endpoints.get(key)
+            if merged_endpoint is None:
+                merged_endpoint = self.endpoints[key] = _Endpoint(buckets)
+            merged_endpoint.merge(endpoint)
+        for name, latency in other.functions.copy().items():
+            merged_latency = self.functions.get(name)
+            if merged_latency is None:
+                merged_latency = self.functions[name] = _Histogram(buckets)
+            merged_latency.merge(latency)
+        for name, count in other.function_errors.copy().items():
+            self.function_errors[name] = self.function_errors.get(name, 0) + count
+        for method, count in other.retries.copy().items():
+            self.retries[method] = self.retries.get(method, 0) + count
+
+    def clear(self) -> None:
+        self.endpoints.clear()
+        self.functions.clear()
+        self.function_errors.clear()
+        self.retries.clear()
+
+
+class _ShardOwner:
+    """Stored in the thread-local of the collector, so that it is garbage collected, and the shard
+    of the thread retired, when the thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire_shard(collector_ref: weakref.ref[MetricsCollector], shard: _Shard) -> None:
+    collector = collector_ref()
+    if collector is not None:
+        collector._retire_shard(shard)
+
+
+class MetricsCollector(InstrumentationHook):
+    """In-memory collector of per-endpoint and per-function latency histograms and error and retry
+    counters. Pass it as an instrumentation hook to the client and call `snapshot()` at any time.
+
+    Recording takes no lock: every thread records into its own shard, and `snapshot()` merges the
+    shards of all threads. The shard of a thread is merged into a shared one when the thread exits,
+    so that thread-per-request servers do not accumulate shards.
+
+    Examples:
+        >>> metrics = MetricsCollector()
+        >>> client = ACI(instrumentation_hooks=[metrics])
+        >>> metrics.snapshot().endpoints["GET functions/search"].latency.percentile(95)
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards_lock = threading.Lock()
+        self._shards: list[_Shard] = []
+        # metrics of the threads that exited
+        self._retired = _Shard()
+
+    def on_response(self, event: RequestEvent) -> None:
+        self._record(event, is_error=event.status_code is not None and event.status_code >= 400)
+
+    def on_error(self, event: RequestEvent) -> None:
+        self._record(event, is_error=True)
+
+    def on_retry(self, event: RetryEvent) -> None:
+        retries = self._get_shard().retries
+        retries[event.method] = retries.get(event.method, 0) + 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Return a copy of the current metrics, merged across all threads."""
+        merged = _Shard()
+        # the lock keeps the shard of an exiting thread from being merged twice, or not at all
+        with self._shards_lock:
+            merged.merge(self._retired, self.buckets)
+            for shard in self._shards:
+                merged.merge(shard, self.buckets)
+
+        return MetricsSnapshot(
+            endpoints={key: endpoint.snapshot() for key, endpoint in merged.endpoints.items()},
+            functions={name: latency.snapshot() for name, latency in merged.functions.items()},
+            function_errors=merged.function_errors,
+            retries=merged.retries,
+        )
+
+    def reset(self) -> None:
+        """Forget all metrics."""
+        with self._shards_lock:
+            self._retired.clear()
+            for shard in self._shards:
+                shard.clear()
+
+    def _get_shard(self) -> _Shard:
+        shard: _Shard | None = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            owner = self._local.owner = _ShardOwner()
+            weakref.finalize(owner, _retire_shard, weakref.ref(self), shard)
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _retire_shard(self, shard: _Shard) -> None:
+        with self._shards_lock:
+            self._retired.merge(shard, self.buckets)
+            self._shards.remove(shard)
+
+    def _record(self, event: RequestEvent, is_error: bool) -> None:
+        shard = self._get_shard()
+        key = f"{event.http_method} {event.endpoint}"
+        endpoint = shard.endpoints.get(key)
+        if endpoint is None:
+            endpoint = shard.endpoints[key] = _Endpoint(self.buckets)
+        endpoint.requests += 1
+        endpoint.request_bytes += event.request_bytes
+        endpoint.response_bytes += event.response_bytes
+        if is_error:
+            endpoint.errors += 1
+        if event.status_code is not None:
+            endpoint.status_codes[event.status_code] = (
+                endpoint.status_codes.get(event.status_code, 0) + 1
+            )
+        if event.latency is not None:
+            endpoint.latency.observe(event.latency)
+
+        if event.function_name is not None:
+            if event.latency is not None:
+                latency = shard.functions.get(event.function_name)
+                if latency is None:
+                    latency = shard.functions[event.function_name] = _Histogram(self.buckets)
+                latency.observe(event.latency)
+            if is_error:
+                shard.function_errors[event.function_name] = (
+                    shard.function_errors.get(event.function_name, 0) + 1
+                )
@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import atexit
+import contextlib
+import contextvars
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Generator, TextIO
+
+import httpx
+
+from aci.utils._logging import get_env
+
+
+class Phase(str, Enum):
+    """Client-side phases of a call the profiler breaks its time down into."""
+
+    VALIDATION = "validation"
+    """Validation of the parameters by their pydantic model."""
+    JSON_ENCODE = "json_encode"
+    """Building the request, including encoding its JSON body."""
+    NETWORK = "network"
+    """Waiting for the response and reading its body."""
+    DECODE = "decode"
+    """Decoding the JSON response body."""
+    RESPONSE_VALIDATION = "response_validation"
+    """Validation of the response by its pydantic model."""
+    MODEL_DUMP = "model_dump"
+    """Dumping the validated parameters to JSON-compatible data."""
+
+
+@dataclass(frozen=True)
+class ProfileConfig:
+    """Configuration of the profiling mode of a client.
+
+    A sampled fraction of the calls of resource methods is profiled, and their client-side time
+    is broken down into phases, see Phase. The time not spent in any phase (retry waits,
+    scheduling, hooks, ...) is reported as "other".
+    """
+
+    sample_rate: float = 0.01
+    """Fraction (0-1) of the calls that are profiled."""
+    trace_memory: bool = False
+    """Whether to record the peak memory allocated by profiled calls with tracemalloc. It is
+    started by the profiler if it is not tracing yet, which slows down all allocations of the
+    process, and only one call is traced at a time."""
+    large_response_bytes: int = 1024 * 1024
+    """Profiled calls receiving at least this many bytes are listed in the report."""
+    max_large_responses: int = 20
+    """How many of the most recent large responses are listed in the report."""
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+
+    @classmethod
+    def from_env(cls) -> ProfileConfig | None:
+        """Return the configuration set with the ACI_PROFILE environment variable, if any.
+
+        ACI_PROFILE is the sample rate, e.g., "0.05", and ACI_PROFILE_MEMORY=1 enables tracemalloc.
+        """
+        if not os.environ.get("ACI_PROFILE"):
+            return None
+        # an invalid value disables profiling, rather than making the client fail
+        sample_rate: float | None = get_env("ACI_PROFILE", _parse_sample_rate, None)
+        if sample_rate is None:
+            return None
+        return cls(
+            sample_rate=sample_rate,
+            trace_memory=os.environ.get("ACI_PROFILE_MEMORY", "0").lower() in ("1", "true"),
+        )
+
+
+@dataclass(frozen=True)
+class MethodProfile:
+    """Aggregated profile of the sampled calls of a method."""
+
+    calls: int
+    duration: float
+    """Total duration (in seconds) of the calls."""
+    phases: dict[str, float]
+    """Total time (in seconds) spent in each phase, including "other"."""
+    max_memory_peak: int | None
+    """Largest memory peak (in bytes) of a call, None if memory was not traced."""
+    response_bytes: int
+
+
+@dataclass(frozen=True)
+class LargeResponse:
+    """A profiled call that received a large response."""
+
+    method: str
+    response_bytes: int
+    duration: float
+    memory_peak: int | None
+
+
+@dataclass(frozen=True)
+class ProfileReport:
+    """Point-in-time copy of the profiles aggregated by a Profiler."""
+
+    methods: dict[str, MethodProfile] = field(default_factory=dict)
+    """Profiles keyed by method, e.g., "functions.execute"."""
+    large_responses: list[LargeResponse] = field(default_factory=list)
+
+    def format(self) -> str:
+        """Format the report as a table of the mean milliseconds per call spent in each phase."""
+        columns = [phase.value for phase in Phase] + ["other"]
+        header = f"{'method':<32}{'calls':>7}{'total':>10}" + "".join(
+            f"{column:>21}" for column in columns
+        )
+        lines = ["ACI client profile (mean ms per call)", header + f"{'peak KiB':>10}"]
+        for method, profile in sorted(self.methods.items()):
+            line = f"{method:<32}{profile.calls:>7}{_ms(profile.duration, profile.calls):>10}"
+            for column in columns:
+                line += f"{_ms(profile.phases.get(column, 0.0), profile.calls):>21}"
+            peak = profile.max_memory_peak
+            line += f"{'-' if peak is None else str(peak // 1024):>10}"
+            lines.append(line)
+
+        if self.large_responses:
+            lines.append("large responses:")
+            for response in self.large_responses:
+                peak = response.memory_peak
+                lines.append(
+                    f"  {response.method}: {response.response_bytes // 1024} KiB in "
+                    f"{response.duration * 1000:.1f} ms, peak "
+                    f"{'-' if peak is None else f'{peak // 1024} KiB'}"
+                )
+        return "\n".join(lines)
+
+
+class CallProfile:
+    """Profile of a single sampled call, collecting the time spent in each phase."""
+
+    __slots__ = ("memory_start", "method", "phases", "response_bytes", "start")
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+        self.phases: dict[str, float] = {}
+        self.response_bytes = 0
+        self.memory_start: int | None = None
+        self.start = time.perf_counter()
+
+    def add(self, phase: Phase, duration: float) -> None:
+        self.phases[phase.value] = self.phases.get(phase.value, 0.0) + duration
+
+    def send(
+        self, httpx_client: httpx.Client, method: str, url: str, kwargs: dict[str, Any]
+    ) -> httpx.Response:
+        """Send a request like httpx.Client.request, timing its encoding and the network wait."""
+        start = time.perf_counter()
+        request = httpx_client.build_request(method, url, **kwargs)
+        built = time.perf_counter()
+        try:
+            response = httpx_client.send(request)
+        finally:
+            self.add(Phase.JSON_ENCODE, built - start)
+            self.add(Phase.NETWORK, time.perf_counter() - built)
+        self.response_bytes += len(response.content)
+        return response
+
+
+class _PhaseTimer:
+    __slots__ = ("call_profile", "phase", "start")
+
+    def __init__(self, call_profile: CallProfile, phase: Phase) -> None:
+        self.call_profile = call_profile
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.call_profile.add(self.phase, time.perf_counter() - self.start)
+
+
+# profile of the current call, if it is sampled
+_call_profile: contextvars.ContextVar[CallProfile | None] = contextvars.ContextVar(
+    "aci_call_profile", default=None
+)
+_NOT_PROFILED = contextlib.nullcontext()
+
+
+def get_call_profile() -> CallProfile | None:
+    """Return the profile of the current call, None if it is not profiled."""
+    return _call_profile.get()
+
+
+def profile_phase(phase: Phase) -> contextlib.AbstractContextManager[None]:
+    """Time the phase within the current call if it is profiled, otherwise do nothing."""
+    call_profile = _call_profile.get()
+    if call_profile is None:
+        return _NOT_PROFILED
+    return _PhaseTimer(call_profile, phase)
+
+
+class _MethodAggregate:
+    __slots__ = ("calls", "duration", "max_memory_peak", "phases", "response_bytes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.duration = 0.0
+        self.phases: dict[str, float] = {}
+        self.max_memory_peak: int | None = None
+        self.response_bytes = 0
+
+
+class Profiler:
+    """Profiles a sampled fraction of the calls of a client and aggregates their profiles.
+
+    Examples:
+        >>> client = ACI(profile=ProfileConfig(sample_rate=0.1))
+        >>> ...
+        >>> client.profiler.dump()
+    """
+
+    def __init__(self, config: ProfileConfig | None = None) -> None:
+        self.config = config or ProfileConfig()
+        self._lock = threading.Lock()
+        self._methods: dict[str, _MethodAggregate] = {}
+        self._large_responses: deque[LargeResponse] = deque(maxlen=self.config.max_large_responses)
+        # tracemalloc's peak is global, so only one call at a time is traced
+        self._memory_lock = threading.Lock()
+        self._started_tracemalloc = False
+        if self.config.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    @contextlib.contextmanager
+    def profile_call(self, method: str) -> Generator[None, None, None]:
+        """Profile the call of a method within the context, if it is sampled."""
+        if self.config.sample_rate < 1 and random.random() >= self.config.sample_rate:
+            yield
+            return
+
+        call_profile = CallProfile(method)
+        if (
+            self.config.trace_memory
+            and tracemalloc.is_tracing()
+            and self._memory_lock.acquire(blocking=False)
+        ):
+            tracemalloc.reset_peak()
+            call_profile.memory_start = tracemalloc.get_traced_memory()[0]
+        token = _call_profile.set(call_profile)
+        try:
+            yield
+        finally:
+            _call_profile.reset(token)
+            self._record(call_profile)
+
+    def report(self) -> ProfileReport:
+        """Return the profiles aggregated so far."""
+        with self._lock:
+            methods = {
+                method: MethodProfile(
+                    calls=aggregate.calls,
+                    duration=aggregate.duration,
+                    phases=dict(aggregate.phases),
+                    max_memory_peak=aggregate.max_memory_peak,
+                    response_bytes=aggregate.response_bytes,
+                )
+                for method, aggregate in self._methods.items()
+            }
+            return ProfileReport(methods=methods, large_responses=list(self._large_responses))
+
+    def dump(self, file: TextIO | None = None) -> None:
+        """Write the formatted report, to stderr by default."""
+        print(self.report().format(), file=file or sys.stderr)
+
+    def reset(self) -> None:
+        """Forget all profiles."""
+        with self._lock:
+            self._methods.clear()
+            self._large_responses.clear()
+
+    def close(self) -> None:
+        """Stop tracemalloc if it was started by the profiler."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _record(self, call_profile: CallProfile) -> None:
+        duration = time.perf_counter() - call_profile.start
+        memory_peak = None
+        if call_profile.memory_start is not None:
+            if tracemalloc.is_tracing():
+                memory_peak = max(tracemalloc.get_traced_memory()[1] - call_profile.memory_start, 0)
+            self._memory_lock.release()
+
+        with self._lock:
+            aggregate = self._methods.get(call_profile.method)
+            if aggregate is None:
+                aggregate = self._methods[call_profile.method] = _MethodAggregate()
+            aggregate.calls += 1
+            aggregate.duration += duration
+            aggregate.response_bytes += call_profile.response_bytes
+            for phase, phase_duration in call_profile.phases.items():
+                aggregate.phases[phase] = aggregate.phases.get(phase, 0.0) + phase_duration
+            aggregate.phases["other"] = aggregate.phases.get("other", 0.0) + max(
+                duration - sum(call_profile.phases.values()), 0.0
+            )
+            if memory_peak is not None:
+                aggregate.max_memory_peak = max(aggregate.max_memory_peak or 0, memory_peak)
+            if call_profile.response_bytes >= self.config.large_response_bytes:
+                self._large_responses.append(
+                    LargeResponse(
+                        method=call_profile.method,
+                        response_bytes=call_profile.response_bytes,
+                        duration=duration,
+                        memory_peak=memory_peak,
+                    )
+                )
+
+
+_env_profiler: Profiler | None = None
+_env_profiler_lock = threading.Lock()
+
+
+def get_env_profiler() -> Profiler | None:
+    """Return the profiler configured with the ACI_PROFILE environment variable, if any.
+
+    It is shared by all the clients created without a profile configuration, and its report is
+    written to stderr once, at exit.
+    """
+    global _env_profiler
+
+    config = ProfileConfig.from_env()
+    if config is None:
+        return None
+    with _env_profiler_lock:
+        if _env_profiler is None:
+            _env_profiler = Profiler(config)
+            atexit.register(_env_profiler.dump)
+        return _env_profiler
+
+
+def _parse_sample_rate(value: str) -> float:
+    sample_rate = float(value)
+    if not 0 <= sample_rate <= 1:
+        raise ValueError("sample rate must be between 0 and 1")
+    return sample_rate
+
+
+def _ms(duration: float, calls: int) -> str:
+    return f"{duration / calls * 1000:.3f}" if calls else "-"
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from aci._circuit_breaker import get_app_name
+from aci._metrics import HistogramSnapshot, MetricsCollector, MetricsSnapshot
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render_prometheus(snapshot: MetricsSnapshot, prefix: str = "aci_client") -> str:
+    """Render a metrics snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot: The metrics to render, see MetricsCollector.snapshot.
+        prefix: The prefix of all metric names.
+
+    Returns:
+        str: The metrics, one sample per line.
+    """
+    lines: list[str] = []
+
+    _add_header(lines, f"{prefix}_requests_total", "counter", "Requests by endpoint and status.")
+    for key, endpoint in sorted(snapshot.endpoints.items()):
+        labels = _endpoint_labels(key)
+        for status_code, count in sorted(endpoint.status_codes.items()):
+            _add_sample(
+                lines, f"{prefix}_requests_total", {**labels, "status": str(status_code)}, count
+            )
+        raised = endpoint.requests - sum(endpoint.status_codes.values())
+        if raised:
+            _add_sample(lines, f"{prefix}_requests_total", {**labels, "status": "error"}, raised)
+
+    _add_header(
+        lines, f"{prefix}_request_errors_total", "counter", "Requests that raised or got 4xx/5xx."
+    )
+    for key, endpoint in sorted(snapshot.endpoints.items()):
+        _add_sample(lines, f"{prefix}_request_errors_total", _endpoint_labels(key), endpoint.errors)
+
+    _add_header(
+        lines, f"{prefix}_request_duration_seconds", "histogram", "Request latency by endpoint."
+    )
+    for key, endpoint in sorted(snapshot.endpoints.items()):
+        _add_histogram(
+            lines, f"{prefix}_request_duration_seconds", _endpoint_labels(key), endpoint.latency
+        )
+
+    _add_header(lines, f"{prefix}_request_bytes_total", "counter", "Bytes of request bodies.")
+    for key, endpoint in sorted(snapshot.endpoints.items()):
+        _add_sample(
+            lines, f"{prefix}_request_bytes_total", _endpoint_labels(key), endpoint.request_bytes
+        )
+
+    _add_header(lines, f"{prefix}_response_bytes_total", "counter", "Bytes of response bodies.")
+    for key, endpoint in sorted(snapshot.endpoints.items()):
+        _add_sample(
+            lines, f"{prefix}_response_bytes_total", _endpoint_labels(key), endpoint.response_bytes
+        )
+
+    _add_header(
+        lines, f"{prefix}_function_duration_seconds", "histogram", "Request latency by function."
+    )
+    for function_name, latency in sorted(snapshot.functions.items()):
+        _add_histogram(
+            lines,
+            f"{prefix}_function_duration_seconds",
+            _function_labels(function_name),
+            latency,
+        )
+
+    _add_header(lines, f"{prefix}_function_errors_total", "counter", "Errors by function.")
+    for function_name, count in sorted(snapshot.function_errors.items()):
+        _add_sample(
+            lines, f"{prefix}_function_errors_total", _function_labels(function_name), count
+        )
+
+    _add_header(lines, f"{prefix}_retries_total", "counter", "Retries by SDK method.")
+    for method, count in sorted(snapshot.retries.items()):
+        _add_sample(lines, f"{prefix}_retries_total", {"method": method}, count)
+
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusExporter:
+    """Exports the metrics of a MetricsCollector in the Prometheus text format.
+
+    The metrics are rendered from a snapshot on demand, so exporting adds no overhead to requests.
+    They can be scraped from a local HTTP endpoint (`serve`) or pushed to a callback, e.g., one
+    posting them to a Pushgateway (`push`, `start_push`).
+
+    Examples:
+        >>> metrics = MetricsCollector()
+        >>> client = ACI(instrumentation_hooks=[metrics])
+        >>> exporter = PrometheusExporter(metrics)
+        >>> exporter.serve(port=9464)  # scrape http://127.0.0.1:9464/metrics
+    """
+
+    def __init__(self, collector: MetricsCollector, prefix: str = "aci_client") -> None:
+        self.collector = collector
+        self.prefix = prefix
+        self._server: ThreadingHTTPServer | None = None
+        self._stop_push = threading.Event()
+        self._push_thread: threading.Thread | None = None
+
+    def render(self) -> str:
+        """Render the current metrics in the Prometheus text format."""
+        return render_prometheus(self.collector.snapshot(), self.prefix)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464) -> tuple[str, int]:
+        """Serve the metrics at http://<host>:<port>/metrics from a daemon thread.
+
+        Args:
+            host: The host to bind to, local only by default.
+            port: The port to bind to, 0 to pick a free port.
+
+        Returns:
+            tuple[str, int]: The address the server is bound to.
+        """
+        if self._server is not None:
+            raise RuntimeError("The exporter is already serving")
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="aci-prometheus-exporter", daemon=True
+        ).start()
+        bound_host, bound_port = self._server.server_address[:2]
+        return str(bound_host), int(bound_port)
+
+    def push(self, callback: Callable[[str], None]) -> None:
+        """Render the current metrics and pass them to the callback."""
+        callback(self.render())
+
+    def start_push(self, callback: Callable[[str], None], interval: float = 15.0) -> None:
+        """Push the metrics to the callback every `interval` seconds from a daemon thread.
+
+        Errors raised by the callback are logged and do not stop pushing.
+        """
+        if self._push_thread is not None:
+            raise RuntimeError("The exporter is already pushing")
+
+        def push_periodically() -> None:
+            while not self._stop_push.wait(interval):
+                try:
+                    self.push(callback)
+                except Exception:
+                    logger.exception("Error pushing metrics")
+
+        self._stop_push.clear()
+        self._push_thread = threading.Thread(
+            target=push_periodically, name="aci-prometheus-push", daemon=True
+        )
+        self._push_thread.start()
+
+    def close(self) -> None:
+        """Stop serving and pushing."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._push_thread is not None:
+            self._stop_push.set()
+            self._push_thread.join()
+            self._push_thread = None
+
+
+def _endpoint_labels(key: str) -> dict[str, str]:
+    http_method, endpoint = key.split(" ", 1)
+    return {"http_method": http_method, "endpoint": endpoint}
+
+
+def _function_labels(function_name: str) -> dict[str, str]:
+    return {"function": function_name, "app": get_app_name(function_name)}
+
+
+def _add_header(lines: list[str], name: str, metric_type: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+
+
+def _add_sample(lines: list[str], name: str, labels: dict[str, str], value: float) -> None:
+    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+
+def _add_histogram(
+    lines: list[str], name: str, labels: dict[str, str], histogram: HistogramSnapshot
+) -> None:
+    cumulative = 0
+    for upper_bound, count in zip((*histogram.buckets, math.inf), histogram.counts, strict=True):
+        cumulative += count
+        _add_sample(
+            lines, f"{name}_bucket", {**labels, "le": _format_value(upper_bound)}, cumulative
+        )
+    _add_sample(lines, f"{name}_sum", labels, histogram.sum)
+    _add_sample(lines, f"{name}_count", labels, histogram.count)
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(label_value: str) -> str:
+    return label_value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return str(value) if isinstance(value, int) else repr(float(value))
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Generator
+
+import httpx
+from tenacity import (
+    RetryCallState,
+    Retrying,
+    after_log,
+    before_log,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+from tenacity.stop import stop_base
+
+from aci._constants import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RETRY_BUDGET_MIN_RETRIES_PER_SECOND,
+    DEFAULT_RETRY_BUDGET_RATIO,
+    DEFAULT_RETRY_BUDGET_WINDOW_SECONDS,
+    DEFAULT_RETRY_MAX_WAIT,
+    DEFAULT_RETRY_MIN_WAIT,
+    DEFAULT_RETRY_MULTIPLIER,
+)
+from aci._exceptions import (
+    RateLimitError,
+    ServerError,
+    UnknownError,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# errors that guarantee the backend did not process the request, so retrying is always safe
+SAFE_RETRY_ON: tuple[type[BaseException], ...] = (
+    RateLimitError,
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
+# 4xx status codes that are worth retrying, any other 4xx error is never retried
+RETRYABLE_CLIENT_ERROR_STATUS_CODES = frozenset({408, 425, 429})
+
+# absolute deadline (in time.monotonic() seconds) of the current call, if any
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "aci_deadline", default=None
+)
+
+
+@contextlib.contextmanager
+def deadline(timeout: float | None) -> Generator[None, None, None]:
+    """Bound the total time (including retries) of all ACI calls made within the context.
+
+    Retries are only attempted if they can complete (including the backoff wait) before the deadline,
+    and the timeout of every request is capped at the remaining time. Nested deadlines can only
+    shorten the deadline of the enclosing context, never extend it.
+
+    Args:
+        timeout: Seconds from now until the deadline, None for no (additional) deadline.
+
+    Examples:
+        >>> with deadline(5.0):
+        ...     client.functions.execute("BRAVE_SEARCH__WEB_SEARCH", {...}, "john_doe")
+    """
+    if timeout is None:
+        yield
+        return
+
+    new_deadline = time.monotonic() + timeout
+    current_deadline = _deadline.get()
+    if current_deadline is not None:
+        new_deadline = min(new_deadline, current_deadline)
+
+    token = _deadline.set(new_deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_remaining_time() -> float | None:
+    """Return the seconds left until the deadline of the current context, None if there is none."""
+    current_deadline = _deadline.get()
+    if current_deadline is None:
+        return None
+    return current_deadline - time.monotonic()
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry policy for requests to the ACI backend APIs.
+
+    Waits between attempts grow exponentially: multiplier * 2^attempt, bounded by min_wait and
+    max_wait (in seconds).
+    """
+
+    max_attempts: int = DEFAULT_MAX_RETRIES
+    """Maximum number of attempts, including the first one. 1 disables retries."""
+    multiplier: float = DEFAULT_RETRY_MULTIPLIER
+    min_wait: float = DEFAULT_RETRY_MIN_WAIT
+    max_wait: float = DEFAULT_RETRY_MAX_WAIT
+    retry_on: tuple[type[BaseException], ...] = (
+        ServerError,
+        RateLimitError,
+        UnknownError,
+        httpx.TimeoutException,
+        httpx.NetworkError,
+    )
+    """Exceptions that are retried. Errors of 4xx responses are only retried for
+    RETRYABLE_CLIENT_ERROR_STATUS_CODES, regardless of their type."""
+    timeout: float | None = None
+    """Default deadline (in seconds) of a call including all retries, see `deadline`."""
+
+    def is_retryable(self, exception: BaseException) -> bool:
+        """Return whether an exception raised by an attempt should be retried."""
+        if not isinstance(exception, self.retry_on):
+            return False
+        status_code = getattr(exception, "status_code", None)
+        if (
+            status_code is not None
+            and 400 <= status_code < 500
+            and status_code not in RETRYABLE_CLIENT_ERROR_STATUS_CODES
+        ):
+            return False
+        return True
+
+    def for_mutations(self) -> RetryPolicy:
+        """Return a copy of the policy that only retries errors in SAFE_RETRY_ON.
+
+        Used for mutations (e.g., function executions) when the backend can not deduplicate
+        retried requests, because retrying e.g. a timeout could execute a mutation twice.
+        """
+        return replace(
+            self,
+            retry_on=tuple(
+                exception for exception in SAFE_RETRY_ON if issubclass(exception, self.retry_on)
+            ),
+        )
+
+    def build_retrying(self, retry_budget: RetryBudget | None = None) -> Retrying:
+        """Build the tenacity Retrying for a single call following this policy.
+
+        Args:
+            retry_budget: The retry budget every retry has to be withdrawn from, if any.
+        """
+        wait = wait_exponential(multiplier=self.multiplier, min=self.min_wait, max=self.max_wait)
+        stop = stop_after_attempt(self.max_attempts) | _stop_before_deadline(wait)
+        if retry_budget is not None:
+            # must be the last stop condition, so that the budget is only withdrawn from
+            # if none of the other conditions stopped the retries
+            stop = stop | _stop_when_budget_exhausted(retry_budget)
+
+        return Retrying(
+            stop=stop,
+            wait=wait,
+            retry=retry_if_exception(self.is_retryable),
+            before=before_log(logger, logging.DEBUG),
+            after=after_log(logger, logging.DEBUG),
+            reraise=True,
+        )
+
+
+class RetryBudget:
+    """Limits retries to a fraction of the recent requests, to prevent retry storms.
+
+    Every call deposits into the budget, every retry withdraws from it. Within a sliding window,
+    retries are allowed as long as they stay below `ratio` times the number of calls plus a floor
+    of `min_retries_per_second`. The budget is thread-safe and meant to be shared, by default by
+    all ACI clients of the process.
+    """
+
+    def __init__(
+        self,
+        ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+        min_retries_per_second: float = DEFAULT_RETRY_BUDGET_MIN_RETRIES_PER_SECOND,
+        window_seconds: int = DEFAULT_RETRY_BUDGET_WINDOW_SECONDS,
+    ) -> None:
+        if window_seconds < 1:
+            raise ValueError("window_seconds must be at least 1")
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        # one bucket per second of the window: [second, requests, retries]
+        self._buckets: list[list[int]] = [[0, 0, 0] for _ in range(window_seconds)]
+
+    def record_request(self) -> None:
+        """Deposit a call into the budget."""
+        with self._lock:
+            self._current_bucket()[1] += 1
+
+    def try_acquire_retry(self) -> bool:
+        """Withdraw a retry from the budget.
+
+        Returns:
+            bool: True if the retry is allowed (and was withdrawn), False if the budget is exhausted.
+        """
+        with self._lock:
+            bucket = self._current_bucket()
+            requests, retries = self._totals()
+            allowed = self.ratio * requests + self.min_retries_per_second * self.window_seconds
+            if retries + 1 > allowed:
+                return False
+            bucket[2] += 1
+            return True
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of calls and retries within the current window."""
+        with self._lock:
+            self._current_bucket()
+            requests, retries = self._totals()
+            return {"requests": requests, "retries": retries}
+
+    def _current_bucket(self) -> list[int]:
+        second = int(time.monotonic())
+        bucket = self._buckets[second % self.window_seconds]
+        if bucket[0] != second:
+            bucket[0], bucket[1], bucket[2] = second, 0, 0
+        return bucket
+
+    def _totals(self) -> tuple[int, int]:
+        oldest = int(time.monotonic()) - self.window_seconds
+        requests = retries = 0
+        for second, bucket_requests, bucket_retries in self._buckets:
+            if second > oldest:
+                requests += bucket_requests
+                retries += bucket_retries
+        return requests, retries
+
+
+# Shared retry budget of all ACI clients in the process, unless configured otherwise
+DEFAULT_RETRY_BUDGET = RetryBudget()
+
+
+class _stop_before_deadline(stop_base):
+    """Stop if the wait before the next attempt would end after the deadline."""
+
+    def __init__(self, wait: wait_exponential) -> None:
+        self.wait = wait
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        remaining_time = get_remaining_time()
+        if remaining_time is None:
+            return False
+        if remaining_time <= self.wait(retry_state):
+            logger.debug(f"Not retrying, {remaining_time:.3f}s left until the deadline")
+            return True
+        return False
+
+
+class _stop_when_budget_exhausted(stop_base):
+    """Stop if the retry budget is exhausted."""
+
+    def __init__(self, retry_budget: RetryBudget) -> None:
+        self.retry_budget = retry_budget
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        if not self.retry_budget.try_acquire_retry():
+            logger.warning("Not retrying, the retry budget is exhausted")
+            return True
+        return False
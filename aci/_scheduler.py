@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Generator, Mapping
+
+from aci._exceptions import DeadlineExceededError
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# owner all requests made outside of a `scheduling_owner` context are scheduled as
+DEFAULT_OWNER = ""
+
+
+class Priority(IntEnum):
+    """Priority of requests, lower values are scheduled first."""
+
+    INTERACTIVE = 0  # user-facing calls, e.g., tool calls of a live agent turn
+    NORMAL = 1  # default
+    BACKGROUND = 2  # maintenance, e.g., catalog refreshes, audits, prefetching
+
+
+# linked account owner the requests of the current context are scheduled as
+_owner: contextvars.ContextVar[str | None] = contextvars.ContextVar("aci_owner", default=None)
+# priority the requests of the current context are scheduled with
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "aci_priority", default=Priority.NORMAL
+)
+
+
+@contextlib.contextmanager
+def scheduling_owner(owner: str | None) -> Generator[None, None, None]:
+    """Schedule all requests made within the context as requests of the given owner.
+
+    Function executions are scheduled as requests of their linked account owner automatically.
+
+    Args:
+        owner: The linked account owner id, None to keep the owner of the enclosing context.
+    """
+    if owner is None:
+        yield
+        return
+
+    token = _owner.set(owner)
+    try:
+        yield
+    finally:
+        _owner.reset(token)
+
+
+@contextlib.contextmanager
+def priority(value: Priority) -> Generator[None, None, None]:
+    """Schedule all requests made within the context with the given priority.
+
+    Args:
+        value: The priority, overriding the priority of the enclosing context.
+
+    Examples:
+        >>> with priority(Priority.BACKGROUND):
+        ...     client.linked_accounts.list()
+    """
+    token = _priority.set(Priority(value))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def get_owner() -> str:
+    """Return the owner the requests of the current context are scheduled as."""
+    return _owner.get() or DEFAULT_OWNER
+
+
+def get_priority() -> Priority:
+    """Return the priority the requests of the current context are scheduled with."""
+    return _priority.get()
+
+
+@dataclass(frozen=True)
+class SchedulerConfig:
+    """Configuration of the scheduling of requests by priority and across linked account owners.
+
+    At most `max_concurrency` requests are in flight, and at most `max_per_owner` of them belong to
+    the same owner. `reserved_interactive` of the slots can only be used by interactive requests.
+    Waiting requests are scheduled by priority first, so background requests only get slots no
+    other request is waiting for. Within a priority, free slots are handed out by weighted fair
+    queuing: an owner with weight 2 gets twice the slots of an owner with weight 1 while both are
+    waiting, so a single owner running bulk calls can not starve the others.
+    """
+
+    max_concurrency: int = 32
+    """Maximum number of requests in flight across all owners."""
+    max_per_owner: int = 8
+    """Maximum number of requests in flight per owner."""
+    owner_weights: Mapping[str, float] = field(default_factory=dict)
+    """Weights of specific owners, all other owners have `default_weight`."""
+    default_weight: float = 1.0
+    reserved_interactive: int = 0
+    """Number of slots reserved for interactive requests."""
+    max_background: int | None = None
+    """Maximum number of background requests in flight, None to only limit them to the slots
+    that are not reserved."""
+
+
+@dataclass
+class OwnerStats:
+    """Point-in-time statistics of the requests of an owner, or of a priority."""
+
+    in_flight: int
+    waiting: int
+
+
+@dataclass
+class SchedulerStats:
+    """Point-in-time statistics of a scheduler, owners without requests are omitted."""
+
+    in_flight: int
+    waiting: int
+    owners: dict[str, OwnerStats]
+    priorities: dict[Priority, OwnerStats] = field(default_factory=dict)
+
+
+class _Waiter:
+    __slots__ = ("event", "granted")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.granted = False
+
+
+class _Owner:
+    __slots__ = ("in_flight", "virtual_time", "waiters", "weight")
+
+    def __init__(self, weight: float, virtual_time: float) -> None:
+        self.weight = weight
+        self.virtual_time = virtual_time
+        self.in_flight = 0
+        # waiting requests by priority
+        self.waiters: tuple[deque[_Waiter], ...] = tuple(deque() for _ in Priority)
+
+    def is_waiting(self) -> bool:
+        return any(self.waiters)
+
+
+class FairScheduler:
+    """Thread-safe scheduler of requests with priorities, per-owner concurrency caps and weighted
+    fair queuing.
+
+    Every owner has a virtual time that advances by 1 / weight with every slot it is granted. Free
+    slots go to the waiting requests of the highest priority, and among those to the owner (below
+    its cap) with the smallest virtual time. Owners becoming active start at the current virtual
+    time, so being idle does not accumulate credit.
+    """
+
+    def __init__(self, config: SchedulerConfig | None = None) -> None:
+        self.config = config or SchedulerConfig()
+        if self.config.max_concurrency < 1 or self.config.max_per_owner < 1:
+            raise ValueError("max_concurrency and max_per_owner must be at least 1")
+        if not 0 <= self.config.reserved_interactive < self.config.max_concurrency:
+            raise ValueError("reserved_interactive must be between 0 and max_concurrency - 1")
+        self._lock = threading.Lock()
+        self._owners: dict[str, _Owner] = {}
+        self._in_flight = 0
+        self._in_flight_by_priority = [0 for _ in Priority]
+        self._virtual_time = 0.0
+
+    def acquire(
+        self, owner: str, priority: Priority = Priority.NORMAL, timeout: float | None = None
+    ) -> None:
+        """Wait until a request of the owner may be sent, and take its slot.
+
+        Args:
+            owner: The owner of the request.
+            priority: The priority of the request.
+            timeout: Maximum seconds to wait, None to wait until the request is scheduled.
+
+        Raises:
+            DeadlineExceededError: If the request was not scheduled within the timeout.
+        """
+        with self._lock:
+            state = self._get_owner(owner)
+            if not state.waiters[priority] and self._can_grant(state, priority):
+                self._grant(state, priority)
+                return
+            waiter = _Waiter()
+            state.waiters[priority].append(waiter)
+
+        if waiter.event.wait(timeout):
+            return
+
+        with self._lock:
+            if waiter.granted:
+                # granted just after the timeout expired
+                return
+            state.waiters[priority].remove(waiter)
+            self._forget_if_idle(owner, state)
+        raise DeadlineExceededError(
+            f"Deadline exceeded waiting to schedule a {priority.name.lower()} request of {owner!r}"
+        )
+
+    def release(self, owner: str, priority: Priority = Priority.NORMAL) -> None:
+        """Release the slot of a completed request of the owner and schedule waiting requests."""
+        with self._lock:
+            state = self._owners[owner]
+            state.in_flight -= 1
+            self._in_flight -= 1
+            self._in_flight_by_priority[priority] -= 1
+            self._dispatch()
+            self._forget_if_idle(owner, state)
+
+    def stats(self) -> SchedulerStats:
+        """Return a snapshot of the scheduler's state."""
+        with self._lock:
+            owners = {
+                owner: OwnerStats(
+                    in_flight=state.in_flight,
+                    waiting=sum(len(waiters) for waiters in state.waiters),
+                )
+                for owner, state in self._owners.items()
+            }
+            priorities = {
+                priority: OwnerStats(
+                    in_flight=self._in_flight_by_priority[priority],
+                    waiting=sum(len(state.waiters[priority]) for state in self._owners.values()),
+                )
+                for priority in Priority
+            }
+            return SchedulerStats(
+                in_flight=self._in_flight,
+                waiting=sum(owner_stats.waiting for owner_stats in owners.values()),
+                owners=owners,
+                priorities=priorities,
+            )
+
+    def _get_owner(self, owner: str) -> _Owner:
+        state = self._owners.get(owner)
+        if state is None:
+            weight = self.config.owner_weights.get(owner, self.config.default_weight)
+            state = self._owners[owner] = _Owner(weight, self._virtual_time)
+        return state
+
+    def _capacity(self, priority: Priority) -> int:
+        if priority == Priority.INTERACTIVE:
+            return self.config.max_concurrency
+        return self.config.max_concurrency - self.config.reserved_interactive
+
+    def _can_grant(self, state: _Owner, priority: Priority) -> bool:
+        if (
+            priority == Priority.BACKGROUND
+            and self.config.max_background is not None
+            and self._in_flight_by_priority[priority] >= self.config.max_background
+        ):
+            return False
+        return (
+            self._in_flight < self._capacity(priority)
+            and state.in_flight < self.config.max_per_owner
+        )
+
+    def _grant(self, state: _Owner, priority: Priority) -> None:
+        self._in_flight += 1
+        self._in_flight_by_priority[priority] += 1
+        state.in_flight += 1
+        self._virtual_time = max(self._virtual_time, state.virtual_time)
+        state.virtual_time += 1 / state.weight
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self.config.max_concurrency:
+            for priority in Priority:
+                candidates = [
+                    state
+                    for state in self._owners.values()
+                    if state.waiters[priority] and self._can_grant(state, priority)
+                ]
+                if candidates:
+                    break
+            else:
+                return
+            state = min(candidates, key=lambda candidate: candidate.virtual_time)
+            waiter = state.waiters[priority].popleft()
+            self._grant(state, priority)
+            waiter.granted = True
+            waiter.event.set()
+
+    def _forget_if_idle(self, owner: str, state: _Owner) -> None:
+        if not state.in_flight and not state.is_waiting():
+            del self._owners[owner]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import hmac
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Generator, Mapping
+
+from aci._instrumentation import RequestEvent
+from aci._scheduler import DEFAULT_OWNER, get_owner
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import SpanKind, StatusCode
+
+    _OPENTELEMETRY_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    _OPENTELEMETRY_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from opentelemetry.trace import Span
+
+
+@dataclass(frozen=True)
+class TracingConfig:
+    """Configuration of OpenTelemetry tracing, requires the `opentelemetry-api` package.
+
+    Every SDK method call, each of its attempts, each request and each `handle_function_call` get
+    a span, and the W3C `traceparent` header is injected into the requests.
+    """
+
+    tracer_provider: Any | None = None
+    """The OpenTelemetry TracerProvider to use, None for the global one."""
+    propagate: bool = True
+    """Whether to inject the trace context (e.g., `traceparent`) into the requests."""
+    owner_id_key: bytes | None = None
+    """Secret key of the HMAC-SHA256 of the linked account owner ids recorded as
+    `aci.owner_id.hash`, None to not record them. Owner ids are often guessable (e.g., emails),
+    so an unkeyed hash could be reversed by anyone reading the traces."""
+
+    def __post_init__(self) -> None:
+        if self.owner_id_key is not None and not self.owner_id_key:
+            raise ValueError("owner_id_key must not be empty")
+
+
+class Tracing:
+    """Creates the spans of a client."""
+
+    def __init__(self, config: TracingConfig | None = None) -> None:
+        if not _OPENTELEMETRY_AVAILABLE:
+            raise ImportError(
+                "Tracing requires the opentelemetry-api package, "
+                "install it with: pip install 'aci-sdk[tracing]'"
+            )
+        self.config = config or TracingConfig()
+        self._tracer = trace.get_tracer("aci", tracer_provider=self.config.tracer_provider)
+
+    def hash_owner_id(self, owner_id: str) -> str | None:
+        """Return a short, stable hash of a linked account owner id, keyed by `owner_id_key`, to
+        not record the id itself, or None without a key."""
+        if self.config.owner_id_key is None:
+            return None
+        digest = hmac.new(self.config.owner_id_key, owner_id.encode(), hashlib.sha256)
+        return digest.hexdigest()[:16]
+
+    @contextlib.contextmanager
+    def span(self, name: str, attributes: Mapping[str, Any]) -> Generator[Span, None, None]:
+        """Start a span that is current within the context, recording any exception raised."""
+        with self._tracer.start_as_current_span(
+            name, attributes={key: value for key, value in attributes.items() if value is not None}
+        ) as span:
+            yield span
+
+    @contextlib.contextmanager
+    def request_span(self, event: RequestEvent) -> Generator[Span, None, None]:
+        """Start the span of a request, see `record_response`."""
+        owner = get_owner()
+        attributes: dict[str, Any] = {
+            "http.request.method": event.http_method,
+            "url.template": event.endpoint,
+            "aci.method": event.method,
+            "aci.attempt": event.attempt,
+            "aci.function.name": event.function_name,
+            "aci.app.name": event.app_name,
+            "aci.owner_id.hash": self.hash_owner_id(owner) if owner != DEFAULT_OWNER else None,
+        }
+        with self._tracer.start_as_current_span(
+            f"{event.http_method} {event.endpoint}",
+            kind=SpanKind.CLIENT,
+            attributes={key: value for key, value in attributes.items() if value is not None},
+        ) as span:
+            yield span
+
+    def inject(self, headers: Mapping[str, str] | None) -> dict[str, str]:
+        """Return the headers with the context of the current span injected, e.g., `traceparent`."""
+        carrier = dict(headers or {})
+        if self.config.propagate:
+            propagate.inject(carrier)
+        return carrier
+
+    def record_response(self, span: Span, event: RequestEvent) -> None:
+        """Record the status and sizes of a request's response on its span."""
+        if event.status_code is not None:
+            span.set_attribute("http.response.status_code", event.status_code)
+            if event.status_code >= 400:
+                span.set_status(StatusCode.ERROR)
+        span.set_attribute("http.request.body.size", event.request_bytes)
+        span.set_attribute("http.response.body.size", event.response_bytes)
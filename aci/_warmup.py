@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# connection pool limits of HTTPX, which clients without warm-up keep
+_DEFAULT_MAX_CONNECTIONS = 100
+_DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+# events of the trace extension of httpcore when it opened a connection
+_CONNECT_EVENTS = {"connection.connect_tcp.complete", "connection.connect_unix_socket.complete"}
+
+
+@dataclass(frozen=True)
+class WarmupConfig:
+    """Configuration of the warm-up of the connections of a client, so that its first requests
+    (e.g., the first call of an agent session, possibly after an idle period) do not wait for DNS,
+    TCP and TLS.
+
+    `connections` connections are opened in the background when the client is created, then pinged
+    every `keepalive_interval` seconds, which keeps them open in the pool of the client and keeps
+    load balancers and NATs from dropping them as idle. Pinged connections found to have been
+    closed by the other end are replaced right away.
+    """
+
+    connections: int = 2
+    """Number of connections opened and kept warm, e.g., the number of concurrent calls of an
+    agent session."""
+    keepalive_interval: float | None = 20.0
+    """Time (in seconds) between pings, None to only warm up the connections once. It should be
+    shorter than the idle timeouts of the backend and of the proxies in front of it."""
+    keepalive_expiry: float = 60.0
+    """Time (in seconds) the connection pool keeps idle connections open, if the pool is created
+    by the client (i.e., not with a `transport` or `http_client`). It must be longer than
+    `keepalive_interval`, for the pings to find the connections still open."""
+    ping_path: str = ""
+    """Path, relative to the base URL, of the GET requests sent as pings. Their responses (e.g., a
+    404) are ignored, so the path should be cheap for the backend to answer."""
+    timeout: float = 5.0
+    """Timeout (in seconds) of the pings."""
+    wait: bool = False
+    """Whether creating the client waits for the connections to be opened, instead of opening
+    them in the background."""
+
+    def __post_init__(self) -> None:
+        if self.connections < 1:
+            raise ValueError("connections must be at least 1")
+        if self.keepalive_interval is not None and not (
+            0 < self.keepalive_interval < self.keepalive_expiry
+        ):
+            raise ValueError("keepalive_interval must be positive and less than keepalive_expiry")
+
+    def get_pool_limits(self) -> httpx.Limits:
+        """Return the limits of a connection pool keeping the warm connections open."""
+        return httpx.Limits(
+            max_connections=max(_DEFAULT_MAX_CONNECTIONS, self.connections),
+            max_keepalive_connections=max(_DEFAULT_MAX_KEEPALIVE_CONNECTIONS, self.connections),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+@dataclass
+class WarmupStats:
+    """Counters of the warm-up of connections."""
+
+    warmups: int = 0
+    """Number of rounds of pings, the first one opening the connections."""
+    pings: int = 0
+    """Number of pings answered."""
+    failed_pings: int = 0
+    """Number of pings that failed even on a new connection, e.g., as the backend is down."""
+    stale_connections: int = 0
+    """Number of pooled connections found closed by the other end, and replaced."""
+    connections_opened: int = 0
+    """Number of connections opened by pings. It stays at `connections` as long as the pings
+    keep the same connections open."""
+
+
+class ConnectionWarmer:
+    """Opens connections of an HTTPX client ahead of its requests and keeps them open.
+
+    Pings are sent with the HTTPX client directly, so they are neither retried nor reported to
+    the instrumentation hooks of the ACI client.
+    """
+
+    def __init__(self, httpx_client: httpx.Client, url: str, config: WarmupConfig) -> None:
+        """
+        Args:
+            httpx_client: The client whose connection pool is warmed up.
+            url: The absolute URL pinged.
+            config: The configuration of the warm-up.
+        """
+        self.httpx_client = httpx_client
+        self.url = url
+        self.config = config
+        self._lock = threading.Lock()
+        self._stats = WarmupStats()
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Open the connections, in the background unless `config.wait`, then keep them open."""
+        if self.config.wait:
+            self.warm()
+        if self.config.keepalive_interval is None and self._ready.is_set():
+            return
+        self._thread = threading.Thread(target=self._run, name="aci-warmup", daemon=True)
+        self._thread.start()
+
+    def warm(self) -> int:
+        """Ping `config.connections` connections at once, opening the ones that are not already
+        open in the pool.
+
+        Returns:
+            int: The number of connections that answered.
+        """
+        count = self.config.connections
+        # every ping holds its connection until all were answered, so that they use different ones
+        barrier = threading.Barrier(count, timeout=self.config.timeout)
+        answered = [False] * count
+
+        def ping(index: int) -> None:
+            answered[index] = self._ping(barrier)
+
+        threads = [
+            threading.Thread(target=ping, args=(index,), name=f"aci-warmup-{index}", daemon=True)
+            for index in range(1, count)
+        ]
+        for thread in threads:
+            thread.start()
+        ping(0)
+        for thread in threads:
+            thread.join()
+        with self._lock:
+            self._stats.warmups += 1
+        self._ready.set()
+        return sum(answered)
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Wait for the connections to be opened.
+
+        Returns:
+            bool: Whether the connections were opened (or failed to be) within the timeout.
+        """
+        return self._ready.wait(timeout)
+
+    def stats(self) -> WarmupStats:
+        """Return a snapshot of the warm-up counters."""
+        with self._lock:
+            return WarmupStats(
+                warmups=self._stats.warmups,
+                pings=self._stats.pings,
+                failed_pings=self._stats.failed_pings,
+                stale_connections=self._stats.stale_connections,
+                connections_opened=self._stats.connections_opened,
+            )
+
+    def close(self) -> None:
+        """Stop pinging the connections."""
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(self.config.timeout * 2)
+
+    def _run(self) -> None:
+        if not self._ready.is_set():
+            self._warm_safely()
+        interval = self.config.keepalive_interval
+        if interval is None:
+            return
+        while not self._stopped.wait(interval) and not self.httpx_client.is_closed:
+            self._warm_safely()
+
+    def _warm_safely(self) -> None:
+        try:
+            self.warm()
+        except Exception:
+            # the warm-up is an optimization, requests open their own connections without it
+            logger.warning("Error warming up connections", exc_info=True)
+
+    def _ping(self, barrier: threading.Barrier) -> bool:
+        response = None
+        try:
+            try:
+                response = self._send()
+            except httpx.TransportError:
+                # a pooled connection closed by the other end (e.g., a proxy dropping idle
+                # connections) fails when it is reused, and is replaced by a new one
+                response = self._send()
+                with self._lock:
+                    self._stats.stale_connections += 1
+        except Exception as e:
+            logger.debug("Ping of %s failed: %r", self.url, e)
+            with self._lock:
+                self._stats.failed_pings += 1
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        if response is None:
+            return False
+
+        try:
+            # reading the body returns the connection to the pool, open
+            response.read()
+        except Exception as e:
+            logger.debug("Ping of %s failed: %r", self.url, e)
+            with self._lock:
+                self._stats.failed_pings += 1
+            return False
+        finally:
+            response.close()
+        with self._lock:
+            self._stats.pings += 1
+        return True
+
+    def _send(self) -> httpx.Response:
+        """Send a ping, holding its connection until its body is read."""
+        request = self.httpx_client.build_request(
+            "GET",
+            self.url,
+            timeout=self.config.timeout,
+            extensions={"trace": self._trace},
+        )
+        return self.httpx_client.send(request, stream=True)
+
+    def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name in _CONNECT_EVENTS:
+            with self._lock:
+                self._stats.connections_opened += 1
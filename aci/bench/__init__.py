@@ -0,0 +1,20 @@
+"""Load generation against the ACI API or its simulator, to size the workers and connection
+pools of clients from measurements, see `python -m aci.bench --help`."""
+
+from aci.bench._load import (
+    DEFAULT_MIX,
+    OPERATIONS,
+    LoadConfig,
+    LoadReport,
+    OperationReport,
+    run_load,
+)
+
+__all__ = [
+    "DEFAULT_MIX",
+    "OPERATIONS",
+    "LoadConfig",
+    "LoadReport",
+    "OperationReport",
+    "run_load",
+]
@@ -0,0 +1,126 @@
+"""Drive a mix of ACI calls with concurrent workers and report how the client performed.
+
+Without --base-url, the load is sent over HTTP to a local simulator, with the faults given by the
+--sim-* options.
+
+Usage:
+    python -m aci.bench --workers 16 --duration 30 --mix search=4,get_definition=3,execute=2
+    python -m aci.bench --sim-latency-mean 0.05 --sim-rate-limit-rate 0.02 --sim-retry-after 1
+    ACI_API_KEY=... python -m aci.bench --base-url https://api.aci.dev/v1/ --function-name \\
+        BRAVE_SEARCH__WEB_SEARCH --function-arguments '{"query": {"q": "aci"}}' --owner-id me
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import sys
+from collections.abc import Sequence
+from dataclasses import asdict
+
+from aci.bench._load import DEFAULT_MIX, LoadConfig, run_load
+from aci.simulator import FaultConfig, LatencyDistribution, SimulatorConfig, SimulatorServer
+
+
+def _parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n")[0] if __doc__ else None,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--base-url", help="base URL of the API, a local simulator if not set")
+    parser.add_argument("--api-key", help="API key, read from ACI_API_KEY if not set")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent workers")
+    parser.add_argument("--duration", type=float, default=10.0, help="duration in seconds")
+    parser.add_argument("--calls", type=int, help="total calls, instead of a duration")
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=DEFAULT_MIX,
+        help="weights of the operations, e.g., search=4,get_definition=3,execute=2",
+    )
+    parser.add_argument("--function-name", default="APP_00__FUNCTION_00", help="function to call")
+    parser.add_argument(
+        "--function-arguments",
+        type=json.loads,
+        default={"query": "load test"},
+        help="JSON arguments of the function",
+    )
+    parser.add_argument("--intent", default="search the web", help="intent of function searches")
+    parser.add_argument("--owner-id", default="aci-bench", help="linked account owner id")
+    parser.add_argument("--max-connections", type=int, default=100, help="connection pool size")
+    parser.add_argument(
+        "--max-keepalive-connections", type=int, default=20, help="idle connections kept open"
+    )
+    parser.add_argument("--seed", type=int, help="seed of the operation mix and simulator faults")
+    parser.add_argument("--sim-latency-mean", type=float, default=0.0, help="simulated latency")
+    parser.add_argument("--sim-latency-stddev", type=float, default=0.0, help="its stddev")
+    parser.add_argument("--sim-error-rate", type=float, default=0.0, help="fraction of 5xx")
+    parser.add_argument("--sim-rate-limit-rate", type=float, default=0.0, help="fraction of 429")
+    parser.add_argument("--sim-retry-after", type=float, help="Retry-After of 429 and 503")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        workers=args.workers,
+        duration=args.duration,
+        calls=args.calls,
+        mix=args.mix,
+        function_name=args.function_name,
+        function_arguments=args.function_arguments,
+        intent=args.intent,
+        linked_account_owner_id=args.owner_id,
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_keepalive_connections,
+        seed=args.seed,
+    )
+    with contextlib.ExitStack() as stack:
+        base_url, api_key = args.base_url, args.api_key
+        if base_url is None:
+            latency = LatencyDistribution(
+                "lognormal" if args.sim_latency_stddev else "constant",
+                args.sim_latency_mean,
+                args.sim_latency_stddev,
+            )
+            server = SimulatorServer(
+                SimulatorConfig(
+                    faults=FaultConfig(
+                        latency=latency,
+                        error_rate=args.sim_error_rate,
+                        rate_limit_rate=args.sim_rate_limit_rate,
+                        retry_after=args.sim_retry_after,
+                    ),
+                    seed=args.seed,
+                )
+            )
+            base_url = stack.enter_context(server).base_url
+            api_key = api_key or "aci-bench"
+        report = run_load(config, api_key=api_key, base_url=base_url)
+
+    print(report.format())
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    **asdict(report),
+                    "throughput": report.throughput,
+                    "error_rate": report.error_rate,
+                    "retry_rate": report.retry_rate,
+                    "connection_reuse": report.connection_reuse,
+                },
+                f,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
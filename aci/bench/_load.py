@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import functools
+import math
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from aci._client import ACI
+from aci._metrics import MetricsCollector
+
+OPERATIONS = ("search", "get_definition", "execute", "handle_function_call")
+DEFAULT_MIX: dict[str, float] = {
+    "search": 4,
+    "get_definition": 3,
+    "execute": 2,
+    "handle_function_call": 1,
+}
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    """Configuration of a load generation run."""
+
+    workers: int = 8
+    """Number of threads sharing the client, each sending one call at a time."""
+    duration: float = 10.0
+    """Duration of the run in seconds, unless it ends after `calls` calls."""
+    calls: int | None = None
+    """Total number of calls of the run, None to run for `duration`."""
+    mix: Mapping[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    """Relative weights of the operations, keyed by name, see OPERATIONS."""
+    function_name: str = "APP_00__FUNCTION_00"
+    """The function to get the definition of and to execute, by default one of the simulator."""
+    function_arguments: Mapping[str, Any] = field(default_factory=lambda: {"query": "load test"})
+    intent: str = "search the web"
+    """The intent of function searches."""
+    linked_account_owner_id: str = "aci-bench"
+    max_connections: int | None = 100
+    """Connection pool limits of the client, as in httpx.Limits."""
+    max_keepalive_connections: int | None = 20
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        unknown_operations = set(self.mix) - set(OPERATIONS)
+        if unknown_operations:
+            raise ValueError(f"Unknown operations in mix: {sorted(unknown_operations)}")
+        if not any(weight > 0 for weight in self.mix.values()):
+            raise ValueError("At least one operation of the mix must have a positive weight")
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1")
+
+
+@dataclass(frozen=True)
+class OperationReport:
+    """Calls of an operation during a load generation run."""
+
+    calls: int
+    errors: dict[str, int]
+    """Number of calls that raised, keyed by exception type."""
+    latency_percentiles: dict[str, float]
+    """Latencies (in seconds) of the calls keyed by percentile, e.g., "p99"."""
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.calls if self.calls else 0.0
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """Results of a load generation run."""
+
+    workers: int
+    duration: float
+    operations: dict[str, OperationReport]
+    requests: int
+    """Number of HTTP requests sent, including retries and hedged requests."""
+    retries: int
+    connections: int
+    """Number of connections opened."""
+
+    @property
+    def calls(self) -> int:
+        return sum(operation.calls for operation in self.operations.values())
+
+    @property
+    def throughput(self) -> float:
+        """Calls per second."""
+        return self.calls / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        errors = sum(sum(operation.errors.values()) for operation in self.operations.values())
+        return errors / self.calls if self.calls else 0.0
+
+    @property
+    def retry_rate(self) -> float:
+        """Retries per call."""
+        return self.retries / self.calls if self.calls else 0.0
+
+    @property
+    def connection_reuse(self) -> float:
+        """Fraction of the requests sent on an already open connection."""
+        return 1 - self.connections / self.requests if self.requests else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"{self.calls} calls in {self.duration:.1f}s with {self.workers} workers: "
+            f"{self.throughput:.1f} calls/s, {self.error_rate:.2%} errors, "
+            f"{self.retry_rate:.3f} retries per call",
+            f"{self.requests} requests on {self.connections} connections: "
+            f"{self.connection_reuse:.2%} connection reuse",
+            "",
+            f"{'operation':<22}{'calls':>8}{'errors':>8}"
+            + "".join(f"{name + ' ms':>10}" for name in _PERCENTILES),
+        ]
+        for name, operation in self.operations.items():
+            lines.append(
+                f"{name:<22}{operation.calls:>8}{sum(operation.errors.values()):>8}"
+                + "".join(
+                    f"{operation.latency_percentiles[percentile] * 1000:>10.1f}"
+                    for percentile in _PERCENTILES
+                )
+            )
+        errors: dict[str, int] = {}
+        for operation in self.operations.values():
+            for error, count in operation.errors.items():
+                errors[error] = errors.get(error, 0) + count
+        if errors:
+            lines.append("")
+            lines.append(
+                "errors: " + ", ".join(f"{name} {count}" for name, count in errors.items())
+            )
+        return "\n".join(lines)
+
+
+_PERCENTILES = {"p50": 50, "p90": 90, "p99": 99, "max": 100}
+
+
+class _ConnectionCountingTransport(httpx.HTTPTransport):
+    """Counts the connections the pool opens, with the trace extension of httpcore."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        # chained to the trace extension of the request, e.g., of a hedged request
+        trace = request.extensions.get("trace")
+        request.extensions["trace"] = functools.partial(self._trace, trace)
+        return super().handle_request(request)
+
+    def _trace(
+        self,
+        trace: Callable[[str, dict[str, Any]], None] | None,
+        event_name: str,
+        info: dict[str, Any],
+    ) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections += 1
+        if trace is not None:
+            trace(event_name, info)
+
+
+class _Worker:
+    def __init__(
+        self, operations: dict[str, Callable[[], Any]], config: LoadConfig, seed: int | None
+    ):
+        self.operations = operations
+        self.rng = random.Random(seed)
+        self.names = [name for name, weight in config.mix.items() if weight > 0]
+        self.weights = [config.mix[name] for name in self.names]
+        self.latencies: dict[str, list[float]] = {name: [] for name in self.names}
+        self.errors: dict[str, dict[str, int]] = {name: {} for name in self.names}
+
+    def call(self) -> None:
+        name = self.rng.choices(self.names, self.weights)[0]
+        start = time.perf_counter()
+        try:
+            self.operations[name]()
+        except Exception as e:
+            errors = self.errors[name]
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+        self.latencies[name].append(time.perf_counter() - start)
+
+
+def run_load(
+    config: LoadConfig,
+    *,
+    api_key: str | None = None,
+    base_url: str | None = None,
+    **client_kwargs: Any,
+) -> LoadReport:
+    """Drive a mix of function searches, definitions, executions and `handle_function_call`
+    calls with concurrent workers sharing a client, and report how the client performed.
+
+    Args:
+        config: The configuration of the run.
+        api_key: The API key of the client, read from ACI_API_KEY if not set.
+        base_url: The base URL of the client, e.g., the one of a SimulatorServer.
+        client_kwargs: Other arguments of the client, e.g., `retry_policy` or `hedging`.
+
+    Returns:
+        LoadReport: The throughput, latency percentiles, error and retry rates, and connection
+        reuse of the run.
+    """
+    metrics = MetricsCollector()
+    transport = _ConnectionCountingTransport(
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+        )
+    )
+    client = ACI(
+        api_key=api_key,
+        base_url=base_url,
+        transport=transport,
+        instrumentation_hooks=[*client_kwargs.pop("instrumentation_hooks", ()), metrics],
+        **client_kwargs,
+    )
+    operations: dict[str, Callable[[], Any]] = {
+        "search": lambda: client.functions.search(intent=config.intent, limit=10),
+        "get_definition": lambda: client.functions.get_definition(config.function_name),
+        "execute": lambda: client.functions.execute(
+            config.function_name, dict(config.function_arguments), config.linked_account_owner_id
+        ),
+        "handle_function_call": lambda: client.handle_function_call(
+            config.function_name, dict(config.function_arguments), config.linked_account_owner_id
+        ),
+    }
+    workers = [
+        _Worker(operations, config, None if config.seed is None else config.seed + index)
+        for index in range(config.workers)
+    ]
+    remaining_calls = config.calls
+    lock = threading.Lock()
+    barrier = threading.Barrier(config.workers + 1)
+
+    deadline = math.inf
+
+    def run(worker: _Worker) -> None:
+        nonlocal remaining_calls
+        barrier.wait()
+        while time.perf_counter() < deadline:
+            if remaining_calls is not None:
+                with lock:
+                    if remaining_calls <= 0:
+                        return
+                    remaining_calls -= 1
+            worker.call()
+
+    threads = [
+        threading.Thread(target=run, args=(worker,), name=f"aci-bench-{index}")
+        for index, worker in enumerate(workers)
+    ]
+    with client:
+        for thread in threads:
+            thread.start()
+        start = time.perf_counter()
+        if config.calls is None:
+            deadline = start + config.duration
+        barrier.wait()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - start
+
+    snapshot = metrics.snapshot()
+    return LoadReport(
+        workers=config.workers,
+        duration=duration,
+        operations={name: _operation_report(workers, name) for name in workers[0].names},
+        requests=sum(endpoint.requests for endpoint in snapshot.endpoints.values()),
+        retries=sum(snapshot.retries.values()),
+        connections=transport.connections,
+    )
+
+
+def _operation_report(workers: list[_Worker], name: str) -> OperationReport:
+    latencies = sorted(latency for worker in workers for latency in worker.latencies[name])
+    errors: dict[str, int] = {}
+    for worker in workers:
+        for error, count in worker.errors[name].items():
+            errors[error] = errors.get(error, 0) + count
+    return OperationReport(
+        calls=len(latencies),
+        errors=errors,
+        latency_percentiles={
+            percentile: _percentile(latencies, value) for percentile, value in _PERCENTILES.items()
+        },
+    )
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percentile / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
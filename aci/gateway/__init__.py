@@ -0,0 +1,17 @@
+"""A local gateway multiplexing the ACI clients of many worker processes of a host.
+
+The gateway exposes the ACI API over localhost or a Unix domain socket, and forwards requests with
+one pooled upstream client. It caches catalog reads (function searches and definitions, app
+searches and details) for all workers, coalesces identical concurrent reads into one upstream
+request, and rate limits upstream requests host-wide. Clients only need to point at it:
+`ACI(base_url="http://localhost/v1/", uds="/run/aci-gateway.sock")`.
+"""
+
+from aci.gateway._gateway import Gateway, GatewayConfig, GatewayServer, GatewayStats
+
+__all__ = [
+    "Gateway",
+    "GatewayConfig",
+    "GatewayServer",
+    "GatewayStats",
+]
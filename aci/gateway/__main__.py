@@ -0,0 +1,69 @@
+"""Serve a local ACI gateway for the clients of all worker processes of a host.
+
+Usage:
+    python -m aci.gateway --uds /run/aci-gateway.sock --rate-limit 50
+    python -m aci.gateway --port 8010 --upstream-url https://api.aci.dev/v1/ --cache-ttl 600
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+from collections.abc import Sequence
+
+from aci._cache import CacheConfig, InMemoryLRUCache, SQLiteCache
+from aci._constants import DEFAULT_SERVER_URL
+from aci.gateway._gateway import CATALOG_ENDPOINTS, GatewayConfig, GatewayServer
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0] if __doc__ else None)
+    parser.add_argument("--host", default="127.0.0.1", help="host to bind to")
+    parser.add_argument("--port", type=int, default=8010, help="port to bind to, 0 for any")
+    parser.add_argument("--uds", help="Unix domain socket to serve on instead of host and port")
+    parser.add_argument("--upstream-url", default=DEFAULT_SERVER_URL, help="base URL of the API")
+    parser.add_argument("--max-connections", type=int, default=100, help="upstream connections")
+    parser.add_argument(
+        "--max-keepalive-connections", type=int, default=20, help="idle upstream connections"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="upstream timeout in seconds")
+    parser.add_argument(
+        "--cache-ttl", type=float, default=300.0, help="catalog cache TTL, 0 for none"
+    )
+    parser.add_argument("--cache-max-entries", type=int, default=10_000, help="cached responses")
+    parser.add_argument(
+        "--cache-sqlite", help="SQLite file to cache responses in, e.g., to keep them"
+    )
+    parser.add_argument("--rate-limit", type=float, help="upstream requests per second of the host")
+    parser.add_argument("--rate-limit-burst", type=float, default=10.0, help="burst of requests")
+    args = parser.parse_args(argv)
+
+    config = GatewayConfig(
+        upstream_url=args.upstream_url,
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_keepalive_connections,
+        timeout=args.timeout,
+        cache=CacheConfig(
+            backend=SQLiteCache(args.cache_sqlite)
+            if args.cache_sqlite
+            else InMemoryLRUCache(args.cache_max_entries),
+            ttls=dict.fromkeys(CATALOG_ENDPOINTS, args.cache_ttl),
+        )
+        if args.cache_ttl > 0
+        else None,
+        rate_limit=args.rate_limit,
+        rate_limit_burst=args.rate_limit_burst,
+    )
+    with GatewayServer(config, args.host, args.port, args.uds) as server:
+        where = args.uds or server.base_url
+        print(f"Serving the ACI gateway at {where}, forwarding to {args.upstream_url}", flush=True)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import socketserver
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple, cast
+from urllib.parse import urlsplit
+
+import httpx
+
+from aci._cache import (
+    DEFAULT_CACHE_TTLS,
+    LINKED_ACCOUNT_CACHE_TTLS,
+    CacheConfig,
+    ResponseCache,
+)
+from aci._constants import DEFAULT_SERVER_URL
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+BASE_PATH = "/v1/"
+CACHE_STATUS_HEADER = "X-ACI-Gateway-Cache"
+# reads of the catalog, which is the same for all workers and changes rarely
+CATALOG_ENDPOINTS = (
+    "GET functions/search",
+    "GET functions/{function_name}/definition",
+    "GET apps/search",
+    "GET apps/{app_name}",
+)
+# endpoint templates of the cacheable reads, by pattern of their paths
+_READ_ENDPOINTS = [
+    (re.compile("^" + re.sub(r"\{\w+\}", "[^/]+", endpoint.split(" ", 1)[1]) + "$"), endpoint)
+    for endpoint in sorted(
+        [*DEFAULT_CACHE_TTLS, *LINKED_ACCOUNT_CACHE_TTLS], key=lambda endpoint: "{" in endpoint
+    )
+]
+# reads whose paths match a cacheable endpoint, e.g., the one-time URLs of OAuth2 flows
+_UNCACHEABLE_PATHS = {"linked-accounts/oauth2"}
+_CACHED_HEADERS = [("Content-Type", "application/json")]
+# headers of a single connection, which are not forwarded
+_HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "host", "content-length", "transfer-encoding"}
+# the upstream client negotiates the encoding of the responses itself, and decodes them
+_REQUEST_HEADERS_NOT_FORWARDED = _HOP_BY_HOP_HEADERS | {"accept-encoding"}
+_RESPONSE_HEADERS_NOT_FORWARDED = _HOP_BY_HOP_HEADERS | {"content-encoding"}
+
+
+@dataclass(frozen=True)
+class GatewayConfig:
+    """Configuration of a local gateway shared by the ACI clients of a host."""
+
+    upstream_url: str = DEFAULT_SERVER_URL
+    """The base URL of the ACI API the gateway forwards requests to."""
+    max_connections: int = 100
+    """Connection pool limits of the upstream client, as in httpx.Limits."""
+    max_keepalive_connections: int = 20
+    timeout: float = 30.0
+    """Timeout (in seconds) of upstream requests."""
+    cache: CacheConfig | None = field(
+        default_factory=lambda: CacheConfig(ttls=dict.fromkeys(CATALOG_ENDPOINTS, 300.0))
+    )
+    """Caching of the responses shared by all clients, by default of the catalog reads (function
+    searches and definitions, app searches and details) for 5 minutes, None to not cache them."""
+    rate_limit: float | None = None
+    """Maximum upstream requests per second of the host, None for no limit."""
+    rate_limit_burst: float = 10.0
+    """Number of upstream requests that can be sent in a burst after a quiet period."""
+    rate_limit_max_wait: float = 1.0
+    """Time (in seconds) a request waits for the rate limit before being answered with a 429."""
+
+
+@dataclass
+class GatewayStats:
+    """Counters of the requests handled by a gateway."""
+
+    requests: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    """Number of reads answered by the upstream response of an identical concurrent read."""
+    upstream_requests: int = 0
+    rate_limited: int = 0
+    """Number of requests answered with a 429 by the gateway's rate limiter."""
+
+
+class _Response(NamedTuple):
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+class _Flight:
+    __slots__ = ("done", "response")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: _Response | None = None
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float) -> bool:
+        """Take a token, waiting up to `max_wait` seconds for one. Returns False on timeout."""
+        deadline = time.monotonic() + max_wait
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class Gateway:
+    """Forwards requests of the ACI clients of a host to the ACI API, with one pooled upstream
+    client, a shared cache of catalog reads, coalescing of identical concurrent reads and a
+    host-wide rate limit.
+
+    It is independent of how requests reach it: see GatewayServer to serve it over localhost or a
+    Unix domain socket.
+    """
+
+    def __init__(self, config: GatewayConfig | None = None) -> None:
+        self.config = config or GatewayConfig()
+        self.upstream = httpx.Client(
+            base_url=self.config.upstream_url,
+            timeout=self.config.timeout,
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+            ),
+        )
+        self._lock = threading.Lock()
+        self.cache = ResponseCache(self.config.cache) if self.config.cache else None
+        self._flights: dict[tuple[str, str], _Flight] = {}
+        self._rate_limiter = (
+            _TokenBucket(self.config.rate_limit, self.config.rate_limit_burst)
+            if self.config.rate_limit
+            else None
+        )
+        self._stats = GatewayStats()
+
+    def handle(
+        self, method: str, path: str, query: str, headers: list[tuple[str, str]], body: bytes
+    ) -> _Response:
+        """Handle a request to a path relative to the base URL, e.g., "functions/search"."""
+        with self._lock:
+            self._stats.requests += 1
+        target = f"{path}?{query}" if query else path
+        forwarded_headers = [
+            (name, value)
+            for name, value in headers
+            if name.lower() not in _REQUEST_HEADERS_NOT_FORWARDED
+        ]
+        api_key = next((value for name, value in headers if name.lower() == "x-api-key"), "")
+        # responses can depend on the project of the API key, e.g., with allowed_only
+        namespace = hashlib.sha256(api_key.encode()).hexdigest()[:32]
+        endpoint = _get_read_endpoint(path) if method == "GET" else None
+        cache = self.cache
+
+        if cache is None or endpoint is None or not cache.is_cached(endpoint):
+            response = self._forward(method, target, forwarded_headers, body)
+            if cache is not None and method != "GET" and response.status_code < 400:
+                cache.invalidate(namespace, f"{method} {path}")
+            return response
+
+        cache_key = cache.key(namespace, endpoint, target)
+        content = None if cache_key is None else cache.get(cache_key)
+        if content is not None:
+            with self._lock:
+                self._stats.cache_hits += 1
+            return _Response(200, [*_CACHED_HEADERS, (CACHE_STATUS_HEADER, "hit")], content)
+
+        key = (namespace, target)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            with self._lock:
+                self._stats.coalesced += 1
+            assert flight.response is not None
+            return _with_cache_status(flight.response, "coalesced")
+
+        try:
+            response = self._forward(method, target, forwarded_headers, body)
+            flight.response = response
+        except BaseException:
+            flight.response = _error_response(502, "Upstream request failed")
+            raise
+        finally:
+            if (
+                cache_key is not None
+                and flight.response is not None
+                and flight.response.status_code == 200
+            ):
+                cache.set(endpoint, cache_key, flight.response.body)
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return _with_cache_status(response, "miss")
+
+    def stats(self) -> GatewayStats:
+        with self._lock:
+            return GatewayStats(**vars(self._stats))
+
+    def close(self) -> None:
+        self.upstream.close()
+
+    def _forward(
+        self, method: str, target: str, headers: list[tuple[str, str]], body: bytes
+    ) -> _Response:
+        if self._rate_limiter is not None and not self._rate_limiter.acquire(
+            self.config.rate_limit_max_wait
+        ):
+            with self._lock:
+                self._stats.rate_limited += 1
+            response = _error_response(429, "Rate limit of the gateway exceeded")
+            retry_after = f"{1 / self._rate_limiter.rate:.3f}"
+            return response._replace(headers=[*response.headers, ("Retry-After", retry_after)])
+
+        with self._lock:
+            self._stats.upstream_requests += 1
+        try:
+            upstream_response = self.upstream.request(
+                method, target, headers=headers, content=body or None
+            )
+        except httpx.TimeoutException:
+            return _error_response(504, "Upstream request timed out")
+        except httpx.TransportError as e:
+            logger.warning("Upstream request %s %s failed: %r", method, target, e)
+            return _error_response(502, "Upstream request failed")
+        return _Response(
+            upstream_response.status_code,
+            [
+                (name, value)
+                for name, value in upstream_response.headers.items()
+                if name.lower() not in _RESPONSE_HEADERS_NOT_FORWARDED
+            ],
+            upstream_response.content,
+        )
+
+
+class GatewayServer:
+    """Serves a gateway over HTTP/1.1 on localhost or a Unix domain socket, for the ACI clients of
+    all worker processes of a host.
+
+    Examples:
+        >>> with GatewayServer(GatewayConfig(rate_limit=50), uds="/run/aci-gateway.sock"):
+        ...     # in each worker process
+        ...     client = ACI(base_url="http://localhost/v1/", uds="/run/aci-gateway.sock")
+    """
+
+    def __init__(
+        self,
+        config: GatewayConfig | Gateway | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        uds: str | None = None,
+    ) -> None:
+        """
+        Args:
+            config: The configuration of the gateway, or a gateway to serve.
+            host: The host to bind to, local only by default.
+            port: The port to bind to, 0 to pick a free port.
+            uds: The path of a Unix domain socket to serve on instead of host and port.
+        """
+        self.gateway = config if isinstance(config, Gateway) else Gateway(config)
+        self.host = host
+        self.port = port
+        self.uds = uds
+        self._server: socketserver.BaseServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("The gateway is not started")
+        if self.uds is not None:
+            return f"http://localhost{BASE_PATH}"
+        host, port = cast(tuple[str, int], self._server.server_address)[:2]
+        return f"http://{host}:{port}{BASE_PATH}"
+
+    def start(self) -> str:
+        """Start serving from a daemon thread.
+
+        Returns:
+            str: The base URL clients should use, e.g., "http://127.0.0.1:8000/v1/".
+        """
+        if self._server is not None:
+            raise RuntimeError("The gateway is already started")
+
+        gateway = self.gateway
+        tcp = self.uds is None
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, which Nagle's algorithm would delay
+            disable_nagle_algorithm = tcp
+
+            def handle_gateway(self) -> None:
+                url = urlsplit(self.path)
+                if not url.path.startswith(BASE_PATH):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                response = gateway.handle(
+                    self.command,
+                    url.path[len(BASE_PATH) :],
+                    url.query,
+                    list(self.headers.items()),
+                    self.rfile.read(length) if length else b"",
+                )
+                self.send_response(response.status_code)
+                for name, value in response.headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(response.body)))
+                self.end_headers()
+                self.wfile.write(response.body)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = handle_gateway
+
+            def address_string(self) -> str:
+                # the client address is empty on Unix domain sockets
+                return str(self.client_address[0]) if self.client_address else "uds"
+
+            def log_message(self, format: str, *args: object) -> None:
+                logger.debug(format % args)
+
+        if self.uds is not None:
+            self._server = _ThreadingUnixHTTPServer(self.uds, Handler)
+        else:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="aci-gateway", daemon=True).start()
+        return self.base_url
+
+    def close(self) -> None:
+        """Stop serving and close the upstream connections."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            if self.uds is not None:
+                os.unlink(self.uds)
+        self.gateway.close()
+
+    def __enter__(self) -> GatewayServer:
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def _get_read_endpoint(path: str) -> str | None:
+    if path in _UNCACHEABLE_PATHS:
+        return None
+    for pattern, endpoint in _READ_ENDPOINTS:
+        if pattern.match(path):
+            return endpoint
+    return None
+
+
+def _with_cache_status(response: _Response, status: str) -> _Response:
+    return response._replace(headers=[*response.headers, (CACHE_STATUS_HEADER, status)])
+
+
+def _error_response(status_code: int, message: str) -> _Response:
+    body = json.dumps({"message": message}).encode()
+    return _Response(status_code, [("Content-Type", "application/json")], body)
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import copy
+import json
+from enum import IntEnum
+from typing import Any, Callable, Iterable
+
+from ._compatible_schema import NOT_GIVEN, is_dict, is_list
+from ._function_definition import (
+    FunctionDefinition,
+    detect_function_definition_format,
+    parse_function_definition,
+    render_function_definition,
+)
+from ._manifest import canonical_json
+
+"""
+Token-budget-aware compaction of tool schemas.
+
+Large parameter schemas cost prompt tokens on every LLM turn. This module shrinks tool definitions
+(server-fetched or generated locally with `to_json_schema`) in increasingly aggressive levels,
+optionally escalating until the tool list fits a token budget.
+"""
+
+# rough average for json-heavy text across common LLM tokenizers
+CHARS_PER_TOKEN = 4
+# sub-schemas shorter than this (in serialized characters) are not worth replacing with a $ref
+_MIN_DEDUPE_LENGTH = 80
+_TRUNCATION_SUFFIX = "..."
+
+# keywords whose value is a single sub-schema
+_SCHEMA_KEYWORDS = ("items", "additionalProperties", "not", "contains", "propertyNames")
+# keywords whose value is a list of sub-schemas
+_SCHEMA_LIST_KEYWORDS = ("anyOf", "oneOf", "allOf", "prefixItems")
+# keywords whose value is a map from names to sub-schemas
+_SCHEMA_MAP_KEYWORDS = ("properties", "patternProperties", "$defs", "definitions")
+
+
+class CompactionLevel(IntEnum):
+    """How aggressively to compact a tool schema. Every level includes the previous ones."""
+
+    NONE = 0
+    """Leave the schema untouched."""
+    STRIP = 1
+    """Drop `title` and `default: null`, collapse single-variant `anyOf`/`oneOf`/`allOf`."""
+    DEDUPE = 2
+    """Move sub-schemas that appear more than once into `$defs` and reference them."""
+    TRUNCATE = 3
+    """Truncate long descriptions and drop `examples`."""
+    MINIMAL = 4
+    """Drop parameter descriptions altogether, only the tool description is kept (truncated)."""
+
+
+def estimate_tokens(obj: Any) -> int:
+    """Estimate the number of prompt tokens an object (e.g., a list of tools) costs.
+
+    This is a cheap heuristic based on the length of the compact json serialization, it is meant
+    for budgeting and not an exact count for any specific tokenizer.
+    """
+    return -(-len(canonical_json(obj)) // CHARS_PER_TOKEN)
+
+
+def compact_json_schema(
+    schema: dict[str, Any],
+    level: CompactionLevel = CompactionLevel.STRIP,
+    *,
+    max_description_length: int = 256,
+) -> dict[str, Any]:
+    """Return a compacted copy of a json schema, e.g., the parameters of a tool.
+
+    Args:
+        schema: The json schema to compact, it is not modified.
+        level: The compaction level to apply.
+        max_description_length: Maximum length of descriptions, applied from
+            CompactionLevel.TRUNCATE on.
+
+    Returns:
+        dict: The compacted json schema.
+    """
+    schema = copy.deepcopy(schema)
+    if level >= CompactionLevel.STRIP:
+        _walk(schema, _strip)
+    if level >= CompactionLevel.DEDUPE:
+        _dedupe(schema)
+    if level >= CompactionLevel.MINIMAL:
+        _walk(schema, _drop_description)
+    elif level >= CompactionLevel.TRUNCATE:
+        _walk(schema, lambda node: _truncate(node, max_description_length))
+    return schema
+
+
+def compact_tools(
+    tools: Iterable[dict],
+    level: CompactionLevel = CompactionLevel.STRIP,
+    *,
+    max_tokens: int | None = None,
+    max_description_length: int = 256,
+    max_tool_description_length: int = 1024,
+) -> list[dict]:
+    """Compact tool definitions in any FunctionDefinitionFormat, optionally to fit a token budget.
+
+    Each tool keeps its format. If `max_tokens` is given, the compaction level is escalated from
+    `level` until the estimated token cost of the tools fits the budget. If even
+    CompactionLevel.MINIMAL does not fit, the most compact result is returned.
+
+    Args:
+        tools: The tool definitions, e.g., from `functions.search` or `to_json_schema`.
+        level: The (minimum) compaction level to apply.
+        max_tokens: Optional token budget for the whole tool list, see `estimate_tokens`.
+        max_description_length: Maximum length of parameter descriptions, applied from
+            CompactionLevel.TRUNCATE on.
+        max_tool_description_length: Maximum length of tool descriptions, applied from
+            CompactionLevel.TRUNCATE on.
+
+    Returns:
+        list[dict]: The compacted tool definitions, in the same order.
+    """
+    tools = list(tools)
+    if max_tokens is None:
+        return [
+            _compact_tool(tool, level, max_description_length, max_tool_description_length)
+            for tool in tools
+        ]
+
+    compacted = tools
+    for current_level in CompactionLevel:
+        if current_level < level:
+            continue
+        compacted = [
+            _compact_tool(tool, current_level, max_description_length, max_tool_description_length)
+            for tool in tools
+        ]
+        if estimate_tokens(compacted) <= max_tokens:
+            break
+
+    return compacted
+
+
+def _compact_tool(
+    tool: dict,
+    level: CompactionLevel,
+    max_description_length: int,
+    max_tool_description_length: int,
+) -> dict:
+    if level == CompactionLevel.NONE:
+        return tool
+
+    format = detect_function_definition_format(tool)
+    definition = parse_function_definition(tool)
+    description = definition.description
+    if level >= CompactionLevel.TRUNCATE:
+        description = _truncate_text(description, max_tool_description_length)
+
+    return render_function_definition(
+        FunctionDefinition(
+            name=definition.name,
+            description=description,
+            parameters=(
+                compact_json_schema(
+                    definition.parameters, level, max_description_length=max_description_length
+                )
+                if definition.parameters is not None
+                else None
+            ),
+        ),
+        format,
+    )
+
+
+def _walk(schema: object, visit: Callable[[dict[str, Any]], None]) -> None:
+    """Call `visit` on the schema and all of its sub-schemas, depth first (children first)."""
+    if not is_dict(schema):
+        return
+
+    for keyword in _SCHEMA_MAP_KEYWORDS:
+        sub_schemas = schema.get(keyword)
+        if is_dict(sub_schemas):
+            for sub_schema in sub_schemas.values():
+                _walk(sub_schema, visit)
+    for keyword in _SCHEMA_LIST_KEYWORDS:
+        sub_schemas = schema.get(keyword)
+        if is_list(sub_schemas):
+            for sub_schema in sub_schemas:
+                _walk(sub_schema, visit)
+    for keyword in _SCHEMA_KEYWORDS:
+        _walk(schema.get(keyword), visit)
+
+    visit(schema)
+
+
+def _strip(schema: dict[str, Any]) -> None:
+    schema.pop("title", None)
+    if schema.get("default", NOT_GIVEN) is None:
+        schema.pop("default")
+
+    for keyword in ("anyOf", "oneOf", "allOf"):
+        variants = schema.get(keyword)
+        if is_list(variants) and len(variants) == 1 and is_dict(variants[0]):
+            schema.pop(keyword)
+            # properties of the schema itself take priority over the ones of the variant
+            merged = {**variants[0], **schema}
+            schema.clear()
+            schema.update(merged)
+
+
+def _drop_description(schema: dict[str, Any]) -> None:
+    schema.pop("description", None)
+    schema.pop("examples", None)
+
+
+def _truncate(schema: dict[str, Any], max_length: int) -> None:
+    schema.pop("examples", None)
+    description = schema.get("description")
+    if isinstance(description, str):
+        schema["description"] = _truncate_text(description, max_length)
+
+
+def _truncate_text(text: str, max_length: int) -> str:
+    if len(text) <= max_length:
+        return text
+    return text[: max(max_length - len(_TRUNCATION_SUFFIX), 0)].rstrip() + _TRUNCATION_SUFFIX
+
+
+def _dedupe(root: dict[str, Any]) -> None:
+    """Move sub-schemas that occur more than once into `$defs` of the root schema."""
+    occurrences: dict[str, int] = {}
+
+    def count(schema: dict[str, Any]) -> None:
+        if schema is not root:
+            key = canonical_json(schema)
+            occurrences[key] = occurrences.get(key, 0) + 1
+
+    _walk(root, count)
+
+    duplicates = [
+        key
+        for key, n in occurrences.items()
+        if n > 1 and len(key) >= _MIN_DEDUPE_LENGTH and '"$ref"' not in key
+    ]
+    if not duplicates:
+        return
+
+    defs = root.setdefault("$defs", {})
+    refs: dict[str, str] = {}
+    for key in duplicates:
+        name = f"schema{len(refs)}"
+        while name in defs:
+            name += "_"
+        defs[name] = json.loads(key)
+        refs[key] = f"#/$defs/{name}"
+
+    _replace_duplicates(root, refs, root)
+
+
+def _replace_duplicates(schema: dict[str, Any], refs: dict[str, str], root: dict[str, Any]) -> None:
+    """Replace sub-schemas with their `$ref`, top down so that parents are matched before children."""
+
+    def replace(sub_schema: object) -> object:
+        if not is_dict(sub_schema):
+            return sub_schema
+        ref = refs.get(canonical_json(sub_schema))
+        if ref is not None:
+            return {"$ref": ref}
+        _replace_duplicates(sub_schema, refs, root)
+        return sub_schema
+
+    for keyword in _SCHEMA_MAP_KEYWORDS:
+        sub_schemas = schema.get(keyword)
+        if not is_dict(sub_schemas):
+            continue
+        if schema is root and keyword == "$defs":
+            # the definitions must not be replaced by references to themselves, only their content
+            for sub_schema in sub_schemas.values():
+                if is_dict(sub_schema):
+                    _replace_duplicates(sub_schema, refs, root)
+        else:
+            for name, sub_schema in sub_schemas.items():
+                sub_schemas[name] = replace(sub_schema)
+    for keyword in _SCHEMA_LIST_KEYWORDS:
+        sub_schemas = schema.get(keyword)
+        if is_list(sub_schemas):
+            schema[keyword] = [replace(sub_schema) for sub_schema in sub_schemas]
+    for keyword in _SCHEMA_KEYWORDS:
+        if keyword in schema:
+            schema[keyword] = replace(schema[keyword])
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from aci.types.enums import FunctionDefinitionFormat
+
+"""
+Client-side rendering of function definitions into every FunctionDefinitionFormat.
+
+All the LLM tool formats carry the same three pieces of information (name, description and the
+json schema of the parameters), only the envelope differs. So a definition fetched from the backend
+once, in any of the non-BASIC formats, can be rendered into all the other formats locally without
+an extra round trip to the server.
+"""
+
+
+@dataclass(frozen=True)
+class FunctionDefinition:
+    """Format-agnostic representation of a function (tool) definition."""
+
+    name: str
+    """The name of the function."""
+    description: str
+    """The description of the function."""
+    parameters: dict[str, Any] | None
+    """The json schema of the function parameters, None if unknown (e.g., BASIC format)."""
+
+
+def detect_function_definition_format(definition: dict) -> FunctionDefinitionFormat:
+    """Detect the FunctionDefinitionFormat of a function definition.
+
+    Args:
+        definition: The function definition.
+
+    Returns:
+        FunctionDefinitionFormat: The format of the definition.
+
+    Raises:
+        ValueError: If the format of the definition can not be recognized.
+    """
+    if definition.get("type") == "function" and isinstance(definition.get("function"), dict):
+        return FunctionDefinitionFormat.OPENAI
+    elif "input_schema" in definition:
+        return FunctionDefinitionFormat.ANTHROPIC
+    elif "parameters" in definition:
+        return FunctionDefinitionFormat.OPENAI_RESPONSES
+    elif "name" in definition:
+        return FunctionDefinitionFormat.BASIC
+    else:
+        raise ValueError(f"Unrecognized function definition format: {definition}")
+
+
+def parse_function_definition(definition: dict) -> FunctionDefinition:
+    """Parse a function definition in any FunctionDefinitionFormat into a FunctionDefinition.
+
+    Args:
+        definition: The function definition, e.g., as returned by `functions.get_definition` or
+            as one of the items returned by `functions.search`.
+
+    Returns:
+        FunctionDefinition: The format-agnostic function definition.
+
+    Raises:
+        ValueError: If the format of the definition can not be recognized.
+    """
+    format = detect_function_definition_format(definition)
+    body = definition["function"] if format == FunctionDefinitionFormat.OPENAI else definition
+    if "name" not in body:
+        raise ValueError(f"Function definition is missing 'name': {definition}")
+
+    if format == FunctionDefinitionFormat.ANTHROPIC:
+        parameters = body["input_schema"]
+    elif format == FunctionDefinitionFormat.BASIC:
+        parameters = None
+    else:
+        parameters = body.get("parameters")
+
+    return FunctionDefinition(
+        name=body["name"],
+        description=body.get("description") or "",
+        parameters=parameters,
+    )
+
+
+def render_function_definition(
+    definition: FunctionDefinition, format: FunctionDefinitionFormat
+) -> dict:
+    """Render a FunctionDefinition in the specified format.
+
+    Args:
+        definition: The format-agnostic function definition.
+        format: The format to render the definition in.
+
+    Returns:
+        dict: The function definition in the requested format.
+
+    Raises:
+        ValueError: If the format requires parameters but the definition has none, or the format is
+            not supported.
+    """
+    if format == FunctionDefinitionFormat.BASIC:
+        return {
+            "name": definition.name,
+            "description": definition.description,
+        }
+
+    if definition.parameters is None:
+        raise ValueError(
+            f"Can not render function definition of {definition.name} in {format} format "
+            "because it has no parameters, e.g., it was fetched in BASIC format"
+        )
+
+    if format == FunctionDefinitionFormat.OPENAI:
+        return {
+            "type": "function",
+            "function": {
+                "name": definition.name,
+                "description": definition.description,
+                "parameters": definition.parameters,
+            },
+        }
+    elif format == FunctionDefinitionFormat.OPENAI_RESPONSES:
+        return {
+            "type": "function",
+            "name": definition.name,
+            "description": definition.description,
+            "parameters": definition.parameters,
+        }
+    elif format == FunctionDefinitionFormat.ANTHROPIC:
+        return {
+            "name": definition.name,
+            "description": definition.description,
+            "input_schema": definition.parameters,
+        }
+    else:
+        raise ValueError(f"Unsupported schema format: {format}")
+
+
+def convert_function_definition(definition: dict, format: FunctionDefinitionFormat) -> dict:
+    """Convert a function definition from any FunctionDefinitionFormat into the specified format.
+
+    This lets you fetch a definition once (in any format other than BASIC) and serve it to
+    different LLM providers without extra requests to the backend.
+
+    Args:
+        definition: The function definition in any FunctionDefinitionFormat.
+        format: The format to convert the definition to.
+
+    Returns:
+        dict: The function definition in the requested format.
+
+    Examples:
+        >>> definition = client.functions.get_definition("BRAVE_SEARCH__WEB_SEARCH")
+        >>> anthropic_definition = convert_function_definition(
+        ...     definition, FunctionDefinitionFormat.ANTHROPIC
+        ... )
+    """
+    return render_function_definition(parse_function_definition(definition), format)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from ._function_definition import parse_function_definition
+
+"""
+Deterministic tool manifests.
+
+LLM providers only hit their prompt (prefix) cache if the tools block of a request is byte-identical
+to the one of a previous request. Tool definitions coming from `functions.search`, meta functions and
+`to_json_schema` are plain dicts whose key order and result order depend on how they were produced,
+so the same set of tools can serialize differently between requests.
+
+A ToolManifest puts a set of tools into a canonical form once (tools ordered by name, keys of every
+object sorted) and keeps the serialized bytes and a content hash around, so equal tool sets always
+produce identical bytes and the manifest can be reused across requests.
+"""
+
+
+@dataclass(frozen=True)
+class ToolManifest:
+    """An immutable, canonically ordered and pre-serialized list of LLM tools."""
+
+    tools: list[dict[str, Any]] = field(hash=False, compare=False)
+    """The tools in canonical order, every dict has its keys sorted. Pass this to the LLM API."""
+    json: str
+    """The compact canonical json serialization of the tools."""
+    sha256: str = field(compare=False)
+    """The hex digest of the sha256 hash of `json`, can be used as a cache key."""
+
+    @property
+    def names(self) -> list[str]:
+        """The names of the tools in the manifest, in canonical order."""
+        return [parse_function_definition(tool).name for tool in self.tools]
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+
+def canonical_json(obj: Any) -> str:
+    """Serialize an object to compact json with sorted keys."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def build_tool_manifest(tools: Iterable[dict], *, sort_tools: bool = True) -> ToolManifest:
+    """Build a ToolManifest from tool definitions in any FunctionDefinitionFormat.
+
+    Exact duplicates are dropped, so building a manifest from overlapping search results is safe.
+
+    Args:
+        tools: The tool definitions, e.g., from `functions.search`, `MetaFunctionBase.to_json_schema`
+            or `to_json_schema`. Can mix different sources but should use the same format.
+        sort_tools: If true, order tools by name (then by content), otherwise keep the given order.
+            Keeping the given order (e.g., the relevance order of search results) is only
+            deterministic if the input order is.
+
+    Returns:
+        ToolManifest: The canonical manifest.
+
+    Raises:
+        ValueError: If a tool definition is not in a recognized format.
+
+    Examples:
+        >>> manifest = build_tool_manifest(
+        ...     [
+        ...         *client.functions.search(intent="search the web"),
+        ...         ACISearchFunctions.to_json_schema(FunctionDefinitionFormat.OPENAI),
+        ...     ]
+        ... )
+        >>> openai.chat.completions.create(model="gpt-4o", messages=messages, tools=manifest.tools)
+    """
+    serialized: dict[str, str] = {}
+    for tool in tools:
+        tool_json = canonical_json(tool)
+        if tool_json not in serialized:
+            serialized[tool_json] = parse_function_definition(tool).name
+
+    ordered = list(serialized)
+    if sort_tools:
+        ordered.sort(key=lambda tool_json: (serialized[tool_json], tool_json))
+
+    manifest_json = "[" + ",".join(ordered) + "]"
+
+    return ToolManifest(
+        # re-parse the canonical json so the key order of the returned dicts is canonical as well
+        tools=json.loads(manifest_json),
+        json=manifest_json,
+        sha256=hashlib.sha256(manifest_json.encode("utf-8")).hexdigest(),
+    )
@@ -4,6 +4,7 @@ from typing import Any, Callable, Optional
 
 from aci.types.enums import FunctionDefinitionFormat
 
+from ._function_definition import FunctionDefinition, render_function_definition
 from ._function_schema import DocstringStyle, function_schema
 
 """
@@ -31,6 +32,7 @@ def to_json_schema(
             - FunctionDefinitionFormat.OPENAI: for openai chat completions api
             - FunctionDefinitionFormat.OPENAI_RESPONSES: for openai responses api
             - FunctionDefinitionFormat.ANTHROPIC: for anthropic api
+            - FunctionDefinitionFormat.BASIC: name and description only
         name_override: Optional custom name for the function
         description_override: Optional custom description
         docstring_style: Optional docstring style for parsing
@@ -57,29 +59,11 @@ def to_json_schema(
         use_docstring_info=use_docstring_info,
     )
 
-    # Generate schema based on format
-    if format == FunctionDefinitionFormat.OPENAI:
-        return {
-            "type": "function",
-            "function": {
-                "name": base_schema.name,
-                "description": base_schema.description or "",
-                "parameters": base_schema.params_json_schema,
-            },
-        }
-    elif format == FunctionDefinitionFormat.OPENAI_RESPONSES:
-        return {
-            "type": "function",
-            "name": base_schema.name,
-            "description": base_schema.description or "",
-            "parameters": base_schema.params_json_schema,
-        }
-    elif format == FunctionDefinitionFormat.ANTHROPIC:
-        return {
-            "name": base_schema.name,
-            "description": base_schema.description or "",
-            "input_schema": base_schema.params_json_schema,
-        }
-    else:
-        # This should never happen due to type restrictions, but just in case
-        raise ValueError(f"Unsupported schema format: {format}")
+    return render_function_definition(
+        FunctionDefinition(
+            name=base_schema.name,
+            description=base_schema.description or "",
+            parameters=base_schema.params_json_schema,
+        ),
+        format,
+    )
@@ -1,3 +1,4 @@
+from aci.libs._function_definition import FunctionDefinition, render_function_definition
 from aci.types.enums import FunctionDefinitionFormat
 
 
@@ -21,30 +22,14 @@ class MetaFunctionBase:
         """
         base_schema = cls._get_base_schema()
 
-        if format == FunctionDefinitionFormat.OPENAI:
-            return {
-                "type": "function",
-                "function": {
-                    "name": base_schema["name"],
-                    "description": base_schema["description"],
-                    "parameters": base_schema["parameters"],
-                },
-            }
-        elif format == FunctionDefinitionFormat.OPENAI_RESPONSES:
-            return {
-                "type": "function",
-                "name": base_schema["name"],
-                "description": base_schema["description"],
-                "parameters": base_schema["parameters"],
-            }
-        elif format == FunctionDefinitionFormat.ANTHROPIC:
-            return {
-                "name": base_schema["name"],
-                "description": base_schema["description"],
-                "input_schema": base_schema["parameters"],
-            }
-        else:
-            raise ValueError(f"Unsupported schema format: {format}")
+        return render_function_definition(
+            FunctionDefinition(
+                name=base_schema["name"],
+                description=base_schema["description"],
+                parameters=base_schema["parameters"],
+            ),
+            format,
+        )
 
     @classmethod
     def _get_base_schema(cls) -> dict:
@@ -1,23 +1,20 @@
+import contextlib
+import contextvars
+import functools
 import logging
-from typing import Any
+import time
+import uuid
+from typing import Any, Callable, Mapping, TypeVar
 
 import httpx
-from tenacity import (
-    after_log,
-    before_log,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
 
-from aci._constants import (
-    DEFAULT_MAX_RETRIES,
-    DEFAULT_RETRY_MAX_WAIT,
-    DEFAULT_RETRY_MIN_WAIT,
-    DEFAULT_RETRY_MULTIPLIER,
-)
+from aci._compression import encode_json_body
+from aci._concurrency import RequestOutcome, get_request_outcome
+from aci._config import ClientConfig
+from aci._constants import IDEMPOTENCY_KEY_HEADER
 from aci._exceptions import (
     AuthenticationError,
+    DeadlineExceededError,
     NotFoundError,
     PermissionError,
     RateLimitError,
@@ -25,15 +22,262 @@ from aci._exceptions import (
     UnknownError,
     ValidationError,
 )
+from aci._instrumentation import Instrumentation, RequestEvent, RetryEvent
+from aci._profiling import Phase, get_call_profile, profile_phase
+from aci._retry import deadline, get_remaining_time
+from aci._scheduler import get_owner, get_priority
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+# names of all methods decorated with `retryable`, e.g., "functions.execute"
+RETRYABLE_METHODS: set[str] = set()
+# names of the methods that must not be sent twice, e.g., "functions.execute"
+NON_IDEMPOTENT_METHODS: set[str] = set()
+
+# name of the method of the current call, e.g., "functions.search"
+_method: contextvars.ContextVar[str | None] = contextvars.ContextVar("aci_method", default=None)
+# attempt of the current call, starting at 1
+_attempt: contextvars.ContextVar[int] = contextvars.ContextVar("aci_attempt", default=1)
+# idempotency key of the current call of a non-idempotent method, shared by all of its attempts
+_idempotency_key: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "aci_idempotency_key", default=None
+)
+
 
 class APIResource:
     _httpx_client: httpx.Client
+    _config: ClientConfig
 
-    def __init__(self, httpx_client: httpx.Client) -> None:
+    def __init__(self, httpx_client: httpx.Client, config: ClientConfig | None = None) -> None:
         self._httpx_client = httpx_client
+        self._config = config or ClientConfig()
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        path_params: Mapping[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Sends a request to the ACI backend, within the deadline of the current call if any.
+
+        Args:
+            method: The HTTP method.
+            url: The URL relative to the base URL of the client, a template formatted with
+                `path_params`, e.g., "functions/{function_name}/execute".
+            path_params: The parameters of the URL template, if any.
+            **kwargs: Passed to httpx.Client.request, e.g., params or json.
+
+        GET requests of the methods configured for hedging are hedged, see HedgingPolicy.
+
+        Raises:
+            DeadlineExceededError: If the deadline of the current call has already passed.
+        """
+        endpoint = url
+        function_name = None
+        if path_params:
+            url = url.format(**path_params)
+            function_name = path_params.get("function_name")
+
+        shared_client_base_url = self._config.shared_client_base_url
+        if shared_client_base_url is not None:
+            url = str(shared_client_base_url.join(url))
+            kwargs["headers"] = {
+                **self._config.shared_client_headers,
+                **kwargs.get("headers", {}),
+            }
+
+        idempotency_key = _idempotency_key.get()
+        if idempotency_key is not None and method != "GET":
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                IDEMPOTENCY_KEY_HEADER: idempotency_key,
+            }
+
+        compression = self._config.compression
+        if compression is not None and kwargs.get("json") is not None:
+            # encoded here rather than by httpx, which only sends JSON bodies uncompressed
+            with profile_phase(Phase.JSON_ENCODE):
+                body, body_headers = encode_json_body(kwargs.pop("json"), compression)
+            kwargs["content"] = body
+            kwargs["headers"] = {**kwargs.get("headers", {}), **body_headers}
+
+        cache = self._config.cache
+        if cache is None:
+            return self._send_or_hedge(method, url, endpoint, function_name, **kwargs)
+
+        cache_endpoint = f"{method} {endpoint}"
+        cache_key = None
+        if cache.is_cached(cache_endpoint):
+            cache_url = str(httpx.URL(url, params=kwargs.get("params")))
+            cache_key = cache.key(self._config.cache_namespace, cache_endpoint, cache_url)
+            content = None if cache_key is None else cache.get(cache_key)
+            if content is not None:
+                return httpx.Response(
+                    200,
+                    headers={"Content-Type": "application/json"},
+                    content=content,
+                    request=httpx.Request(method, url),
+                )
+
+        response = self._send_or_hedge(method, url, endpoint, function_name, **kwargs)
+        if cache_key is not None and response.status_code == 200:
+            cache.set(cache_endpoint, cache_key, response.content)
+        elif method != "GET" and response.status_code < 400:
+            cache.invalidate(self._config.cache_namespace, cache_endpoint)
+        return response
+
+    def _send_or_hedge(
+        self, method: str, url: str, endpoint: str, function_name: str | None, **kwargs: Any
+    ) -> httpx.Response:
+        """Sends a request, hedged if it is a GET request of a method configured for hedging."""
+        hedger = self._config.hedger
+        current_method = _method.get()
+        if (
+            hedger is not None
+            and method == "GET"
+            and current_method is not None
+            and hedger.should_hedge(current_method)
+        ):
+            return hedger.send(
+                current_method,
+                lambda extensions: self._send(
+                    method, url, endpoint, function_name, extensions=extensions, **kwargs
+                ),
+            )
+
+        return self._send(method, url, endpoint, function_name, **kwargs)
+
+    def _send(
+        self, method: str, url: str, endpoint: str, function_name: str | None, **kwargs: Any
+    ) -> httpx.Response:
+        """Sends a single request once the scheduler of the client (if any) schedules it.
+
+        Raises:
+            DeadlineExceededError: If the deadline of the current call passed before the request
+                could be sent.
+        """
+        scheduler = self._config.scheduler
+        if scheduler is None:
+            return self._send_within_limit(method, url, endpoint, function_name, **kwargs)
+
+        owner = get_owner()
+        priority = get_priority()
+        scheduler.acquire(owner, priority, timeout=get_remaining_time())
+        try:
+            return self._send_within_limit(method, url, endpoint, function_name, **kwargs)
+        finally:
+            scheduler.release(owner, priority)
+
+    def _send_within_limit(
+        self, method: str, url: str, endpoint: str, function_name: str | None, **kwargs: Any
+    ) -> httpx.Response:
+        """Sends a single request within the concurrency limit of the client if any.
+
+        Raises:
+            DeadlineExceededError: If the deadline of the current call passed before the request
+                could be sent.
+        """
+        limiter = self._config.concurrency_limiter
+        if limiter is None:
+            return self._send_instrumented(method, url, endpoint, function_name, **kwargs)
+
+        start = limiter.acquire(timeout=get_remaining_time())
+        outcome = RequestOutcome.IGNORE
+        try:
+            response = self._send_instrumented(method, url, endpoint, function_name, **kwargs)
+            outcome = get_request_outcome(response.status_code)
+            return response
+        except httpx.TimeoutException:
+            outcome = RequestOutcome.OVERLOAD
+            raise
+        finally:
+            # the latencies of functions (e.g., of their executions) differ by nature
+            limiter_endpoint = f"{method} {endpoint}"
+            if function_name is not None:
+                limiter_endpoint = f"{limiter_endpoint} {function_name}"
+            limiter.release(start, outcome, limiter_endpoint)
+
+    def _send_instrumented(
+        self, method: str, url: str, endpoint: str, function_name: str | None, **kwargs: Any
+    ) -> httpx.Response:
+        """Sends a single request, reporting it to the instrumentation hooks and tracing of the
+        client if any.
+
+        Raises:
+            DeadlineExceededError: If the deadline of the current call has already passed.
+        """
+        kwargs = self._cap_to_deadline(method, url, kwargs)
+        instrumentation = self._config.instrumentation
+        tracing = self._config.tracing
+        if instrumentation is None and tracing is None:
+            return self._send_http(method, url, kwargs)
+
+        event = RequestEvent(
+            method=_method.get() or "",
+            http_method=method,
+            endpoint=endpoint,
+            url=url,
+            attempt=_attempt.get(),
+            function_name=function_name,
+        )
+        if tracing is None:
+            return self._send_observed(event, instrumentation, kwargs)
+
+        with tracing.request_span(event) as span:
+            kwargs["headers"] = tracing.inject(kwargs.get("headers"))
+            response = self._send_observed(event, instrumentation, kwargs)
+            tracing.record_response(span, event)
+            return response
+
+    def _send_observed(
+        self,
+        event: RequestEvent,
+        instrumentation: Instrumentation | None,
+        kwargs: dict[str, Any],
+    ) -> httpx.Response:
+        """Sends the request of the event, filling in its outcome and reporting it."""
+        if instrumentation is not None:
+            instrumentation.request_start(event)
+        start = time.perf_counter()
+        try:
+            response = self._send_http(event.http_method, event.url, kwargs)
+        except Exception as e:
+            event.latency = time.perf_counter() - start
+            event.error = e
+            if instrumentation is not None:
+                instrumentation.error(event)
+            raise
+
+        event.latency = time.perf_counter() - start
+        event.status_code = response.status_code
+        event.request_bytes = len(response.request.content)
+        event.response_bytes = len(response.content)
+        if instrumentation is not None:
+            instrumentation.response(event)
+        return response
+
+    def _send_http(self, method: str, url: str, kwargs: dict[str, Any]) -> httpx.Response:
+        """Sends a request with the HTTPX client, timing it if the current call is profiled."""
+        call_profile = get_call_profile()
+        if call_profile is None:
+            return self._httpx_client.request(method, url, **kwargs)
+        return call_profile.send(self._httpx_client, method, url, kwargs)
+
+    def _cap_to_deadline(self, method: str, url: str, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Returns the request kwargs with the timeout capped at the time left until the deadline.
+
+        Raises:
+            DeadlineExceededError: If the deadline of the current call has already passed.
+        """
+        remaining_time = get_remaining_time()
+        if remaining_time is None:
+            return kwargs
+        if remaining_time <= 0:
+            raise DeadlineExceededError(f"Deadline exceeded before sending {method} {url}")
+        return {**kwargs, "timeout": _cap_timeout(self._httpx_client.timeout, remaining_time)}
 
     def _handle_response(self, response: httpx.Response) -> Any:
         """Processes API responses and handles errors.
@@ -63,19 +307,19 @@ class APIResource:
 
             # TODO: cross-check with backend
             if response.status_code == 401:
-                raise AuthenticationError(error_message) from e
+                raise AuthenticationError(error_message, status_code=response.status_code) from e
             elif response.status_code == 403:
-                raise PermissionError(error_message) from e
+                raise PermissionError(error_message, status_code=response.status_code) from e
             elif response.status_code == 404:
-                raise NotFoundError(error_message) from e
+                raise NotFoundError(error_message, status_code=response.status_code) from e
             elif response.status_code == 400:
-                raise ValidationError(error_message) from e
+                raise ValidationError(error_message, status_code=response.status_code) from e
             elif response.status_code == 429:
-                raise RateLimitError(error_message) from e
+                raise RateLimitError(error_message, status_code=response.status_code) from e
             elif 500 <= response.status_code < 600:
-                raise ServerError(error_message) from e
+                raise ServerError(error_message, status_code=response.status_code) from e
             else:
-                raise UnknownError(error_message) from e
+                raise UnknownError(error_message, status_code=response.status_code) from e
 
     def _get_response_data(self, response: httpx.Response) -> Any:
         """Get the response data from the response.
@@ -83,7 +327,8 @@ class APIResource:
         TODO: handle non-json response?
         """
         try:
-            response_data = response.json() if response.content else {}
+            with profile_phase(Phase.DECODE):
+                response_data = response.json() if response.content else {}
         except Exception as e:
             logger.warning(f"error parsing json response: {e!s}")
             response_data = response.text
@@ -100,24 +345,76 @@ class APIResource:
             return str(error)
 
 
-# Shared retry config for all requests to the ACI backend APIs
-retry_config = {
-    "stop": stop_after_attempt(DEFAULT_MAX_RETRIES),
-    "wait": wait_exponential(
-        multiplier=DEFAULT_RETRY_MULTIPLIER,
-        min=DEFAULT_RETRY_MIN_WAIT,
-        max=DEFAULT_RETRY_MAX_WAIT,
-    ),
-    "retry": retry_if_exception_type(
-        (
-            ServerError,
-            RateLimitError,
-            UnknownError,
-            httpx.TimeoutException,
-            httpx.NetworkError,
-        )
-    ),
-    "before": before_log(logger, logging.DEBUG),
-    "after": after_log(logger, logging.DEBUG),
-    "reraise": True,
-}
+def retryable(method: str, idempotent: bool = True) -> Callable[[_F], _F]:
+    """Retries the decorated APIResource method following the retry policy configured for it.
+
+    Args:
+        method: Name of the method the retry policy is configured by, e.g., "functions.execute".
+        idempotent: Whether the method can safely be sent more than once, False for mutations.
+            All attempts of a call of a non-idempotent method send the same idempotency key, and
+            are only retried as configured for mutations, see ClientConfig.get_retry_policy.
+    """
+    RETRYABLE_METHODS.add(method)
+    if not idempotent:
+        NON_IDEMPOTENT_METHODS.add(method)
+
+    def decorator(func: _F) -> _F:
+        @functools.wraps(func)
+        def wrapper(self: APIResource, *args: Any, **kwargs: Any) -> Any:
+            policy = self._config.get_retry_policy(method, idempotent)
+            retry_budget = self._config.retry_budget
+            if retry_budget is not None:
+                retry_budget.record_request()
+
+            instrumentation = self._config.instrumentation
+            tracing = self._config.tracing
+            profiler = self._config.profiler
+            attempt = 0
+            last_error: BaseException | None = None
+
+            @functools.wraps(func)
+            def call_attempt() -> Any:
+                nonlocal attempt, last_error
+                attempt += 1
+                if instrumentation is not None and last_error is not None:
+                    instrumentation.retry(RetryEvent(method, attempt, last_error))
+                attempt_token = _attempt.set(attempt)
+                try:
+                    if tracing is None:
+                        return func(self, *args, **kwargs)
+                    with tracing.span(f"aci.{method}.attempt", {"aci.attempt": attempt}):
+                        return func(self, *args, **kwargs)
+                except BaseException as e:
+                    last_error = e
+                    raise
+                finally:
+                    _attempt.reset(attempt_token)
+
+            method_token = _method.set(method)
+            token = _idempotency_key.set(None if idempotent else str(uuid.uuid4()))
+            try:
+                with (
+                    contextlib.nullcontext() if profiler is None else profiler.profile_call(method),
+                    contextlib.nullcontext()
+                    if tracing is None
+                    else tracing.span(f"aci.{method}", {"aci.method": method}),
+                    deadline(policy.timeout),
+                ):
+                    return policy.build_retrying(retry_budget)(call_attempt)
+            finally:
+                _idempotency_key.reset(token)
+                _method.reset(method_token)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _cap_timeout(timeout: httpx.Timeout, cap: float) -> httpx.Timeout:
+    """Caps every component of a timeout at the given number of seconds."""
+    return httpx.Timeout(
+        connect=cap if timeout.connect is None else min(timeout.connect, cap),
+        read=cap if timeout.read is None else min(timeout.read, cap),
+        write=cap if timeout.write is None else min(timeout.write, cap),
+        pool=cap if timeout.pool is None else min(timeout.pool, cap),
+    )
@@ -1,9 +1,7 @@
 import logging
 from typing import List
 
-from tenacity import retry
-
-from aci.resource._base import APIResource, retry_config
+from aci.resource._base import APIResource, retryable
 from aci.types.app_configurations import (
     AppConfiguration,
     AppConfigurationCreate,
@@ -17,7 +15,7 @@ logger: logging.Logger = logging.getLogger(__name__)
 class AppConfigurationsResource(APIResource):
     """Resource for managing app configurations."""
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("app_configurations.list")
     def list(
         self,
         app_names: list[str] | None = None,
@@ -45,7 +43,8 @@ class AppConfigurationsResource(APIResource):
         ).model_dump(exclude_none=True, mode="json")
 
         logger.info(f"Listing app configurations with params: {validated_params}")
-        response = self._httpx_client.get(
+        response = self._request(
+            "GET",
             "app-configurations",
             params=validated_params,
         )
@@ -54,7 +53,7 @@ class AppConfigurationsResource(APIResource):
         app_configurations = [AppConfiguration.model_validate(config) for config in data]
         return app_configurations
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("app_configurations.get")
     def get(self, app_name: str) -> AppConfiguration:
         """Get an app configuration by app name.
 
@@ -68,13 +67,15 @@ class AppConfigurationsResource(APIResource):
             Various exceptions defined in _handle_response for different HTTP status codes.
         """
         logger.info(f"Getting app configuration for app: {app_name}")
-        response = self._httpx_client.get(f"app-configurations/{app_name}")
+        response = self._request(
+            "GET", "app-configurations/{app_name}", path_params={"app_name": app_name}
+        )
         data: dict = self._handle_response(response)
         app_configuration = AppConfiguration.model_validate(data)
 
         return app_configuration
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("app_configurations.create", idempotent=False)
     def create(
         self,
         app_name: str,
@@ -103,7 +104,8 @@ class AppConfigurationsResource(APIResource):
 
         logger.info(f"Creating app configuration: {validated_params}")
 
-        response = self._httpx_client.post(
+        response = self._request(
+            "POST",
             "app-configurations",
             json=validated_params,
         )
@@ -111,7 +113,7 @@ class AppConfigurationsResource(APIResource):
 
         return AppConfiguration.model_validate(data)
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("app_configurations.delete", idempotent=False)
     def delete(self, app_name: str) -> None:
         """Delete an app configuration.
 
@@ -122,7 +124,9 @@ class AppConfigurationsResource(APIResource):
             Various exceptions defined in _handle_response for different HTTP status codes.
         """
         logger.info(f"Deleting app configuration for app: {app_name}")
-        response = self._httpx_client.delete(f"app-configurations/{app_name}")
+        response = self._request(
+            "DELETE", "app-configurations/{app_name}", path_params={"app_name": app_name}
+        )
         self._handle_response(response)
 
     # TODO: update are not supported for now
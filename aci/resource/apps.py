@@ -1,15 +1,14 @@
 import logging
 
-from tenacity import retry
-
-from aci.resource._base import APIResource, retry_config
+from aci._profiling import Phase, profile_phase
+from aci.resource._base import APIResource, retryable
 from aci.types.apps import AppBasic, AppDetails, SearchAppsParams
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 
 class AppsResource(APIResource):
-    @retry(**retry_config)  # type: ignore
+    @retryable("apps.search")
     def search(
         self,
         intent: str | None = None,
@@ -35,30 +34,36 @@ class AppsResource(APIResource):
         Raises:
             Various exceptions defined in _handle_response for different HTTP status codes.
         """
-        validated_params = SearchAppsParams(
-            intent=intent,
-            allowed_apps_only=allowed_apps_only,
-            include_functions=include_functions,
-            categories=categories,
-            limit=limit,
-            offset=offset,
-        ).model_dump(exclude_none=True, mode="json")
+        with profile_phase(Phase.VALIDATION):
+            search_params = SearchAppsParams(
+                intent=intent,
+                allowed_apps_only=allowed_apps_only,
+                include_functions=include_functions,
+                categories=categories,
+                limit=limit,
+                offset=offset,
+            )
+        with profile_phase(Phase.MODEL_DUMP):
+            validated_params = search_params.model_dump(exclude_none=True, mode="json")
 
         logger.info(f"Searching apps with params: {validated_params}")
-        response = self._httpx_client.get(
+        response = self._request(
+            "GET",
             "apps/search",
             params=validated_params,
         )
 
         data: list[dict] = self._handle_response(response)
-        apps = [AppBasic.model_validate(app) for app in data]
+        with profile_phase(Phase.RESPONSE_VALIDATION):
+            apps = [AppBasic.model_validate(app) for app in data]
 
         return apps
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("apps.get")
     def get(self, app_name: str) -> AppDetails:
         """Gets detailed information about an app."""
-        response = self._httpx_client.get(f"apps/{app_name}")
+        response = self._request("GET", "apps/{app_name}", path_params={"app_name": app_name})
         data: dict = self._handle_response(response)
-        app_details: AppDetails = AppDetails.model_validate(data)
+        with profile_phase(Phase.RESPONSE_VALIDATION):
+            app_details: AppDetails = AppDetails.model_validate(data)
         return app_details
@@ -1,9 +1,8 @@
 import logging
 
-import httpx
-from tenacity import retry
-
-from aci.resource._base import APIResource, retry_config
+from aci._profiling import Phase, profile_phase
+from aci._scheduler import scheduling_owner
+from aci.resource._base import APIResource, retryable
 from aci.types.enums import FunctionDefinitionFormat
 from aci.types.functions import (
     FunctionExecutionParams,
@@ -11,15 +10,13 @@ from aci.types.functions import (
     GetFunctionDefinitionParams,
     SearchFunctionsParams,
 )
+from aci.utils._logging import get_logger
 
-logger: logging.Logger = logging.getLogger(__name__)
+logger: logging.Logger = get_logger(__name__)
 
 
 class FunctionsResource(APIResource):
-    def __init__(self, httpx_client: httpx.Client) -> None:
-        super().__init__(httpx_client)
-
-    @retry(**retry_config)  # type: ignore
+    @retryable("functions.search")
     def search(
         self,
         app_names: list[str] | None = None,
@@ -56,17 +53,21 @@ class FunctionsResource(APIResource):
                 "'allowed_apps_only' is deprecated and will be removed in a future version; use 'allowed_only' instead."
             )
 
-        validated_params = SearchFunctionsParams(
-            app_names=app_names,
-            intent=intent,
-            allowed_only=allowed_only or allowed_apps_only,
-            format=format,
-            limit=limit,
-            offset=offset,
-        ).model_dump(exclude_none=True, mode="json")
-
-        logger.info(f"Searching functions with params: {validated_params}")
-        response = self._httpx_client.get(
+        with profile_phase(Phase.VALIDATION):
+            search_params = SearchFunctionsParams(
+                app_names=app_names,
+                intent=intent,
+                allowed_only=allowed_only or allowed_apps_only,
+                format=format,
+                limit=limit,
+                offset=offset,
+            )
+        with profile_phase(Phase.MODEL_DUMP):
+            validated_params = search_params.model_dump(exclude_none=True, mode="json")
+
+        logger.info("Searching functions with params: %(params)s", {"params": validated_params})
+        response = self._request(
+            "GET",
             "functions/search",
             params=validated_params,
         )
@@ -75,7 +76,7 @@ class FunctionsResource(APIResource):
 
         return data
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("functions.get_definition")
     def get_definition(
         self, function_name: str, format: FunctionDefinitionFormat = FunctionDefinitionFormat.OPENAI
     ) -> dict:
@@ -93,14 +94,20 @@ class FunctionsResource(APIResource):
         Raises:
             Various exceptions defined in _handle_response for different HTTP status codes.
         """
-        validated_params = GetFunctionDefinitionParams(function_name=function_name, format=format)
+        with profile_phase(Phase.VALIDATION):
+            validated_params = GetFunctionDefinitionParams(
+                function_name=function_name, format=format
+            )
 
         logger.info(
-            f"Getting function definition of {validated_params.function_name}, "
-            f"format: {validated_params.format}"
+            "Getting function definition of %s, format: %s",
+            validated_params.function_name,
+            validated_params.format,
         )
-        response = self._httpx_client.get(
-            f"functions/{validated_params.function_name}/definition",
+        response = self._request(
+            "GET",
+            "functions/{function_name}/definition",
+            path_params={"function_name": validated_params.function_name},
             params={"format": validated_params.format.value},
         )
 
@@ -108,7 +115,7 @@ class FunctionsResource(APIResource):
 
         return function_definition
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("functions.execute", idempotent=False)
     def execute(
         self, function_name: str, function_arguments: dict, linked_account_owner_id: str
     ) -> FunctionExecutionResult:
@@ -123,26 +130,60 @@ class FunctionsResource(APIResource):
             FunctionExecutionResult: containing the function execution results.
 
         Raises:
+            CircuitOpenError: If the circuit breaker is enabled and the circuit of the function or
+                its app is open. It is raised without calling the backend and is not retried.
             Various exceptions defined in _handle_response for different HTTP status codes.
         """
-        validated_params = FunctionExecutionParams(
-            function_name=function_name,
-            function_arguments=function_arguments,
-            linked_account_owner_id=linked_account_owner_id,
-        )
+        with profile_phase(Phase.VALIDATION):
+            validated_params = FunctionExecutionParams(
+                function_name=function_name,
+                function_arguments=function_arguments,
+                linked_account_owner_id=linked_account_owner_id,
+            )
 
-        logger.info(f"Executing function with: {validated_params.model_dump()}")
+        # formatted (and redacted) only if the record is logged, without dumping the params
+        logger.info(
+            "Executing function with: function_name=%(function_name)s, "
+            "function_arguments=%(function_arguments)s, "
+            "linked_account_owner_id=%(linked_account_owner_id)s",
+            {
+                "function_name": validated_params.function_name,
+                "function_arguments": validated_params.function_arguments,
+                "linked_account_owner_id": validated_params.linked_account_owner_id,
+            },
+        )
         request_body = {
             "function_input": validated_params.function_arguments,
             "linked_account_owner_id": validated_params.linked_account_owner_id,
         }
-        response = self._httpx_client.post(
-            f"functions/{validated_params.function_name}/execute",
-            json=request_body,
-        )
-
-        function_execution_result: FunctionExecutionResult = FunctionExecutionResult.model_validate(
-            self._handle_response(response)
-        )
+        circuit_breaker = self._config.circuit_breaker
+        if circuit_breaker is not None:
+            circuit_breaker.before_call(validated_params.function_name)
+
+        exception: BaseException | None = None
+        try:
+            with scheduling_owner(validated_params.linked_account_owner_id):
+                response = self._request(
+                    "POST",
+                    "functions/{function_name}/execute",
+                    path_params={"function_name": validated_params.function_name},
+                    json=request_body,
+                )
+            data = self._handle_response(response)
+        except BaseException as e:
+            exception = e
+            raise
+        finally:
+            # recorded even on KeyboardInterrupt, so that half-open trial slots are not leaked
+            if circuit_breaker is not None:
+                if exception is None:
+                    circuit_breaker.record_success(validated_params.function_name)
+                else:
+                    circuit_breaker.record_exception(validated_params.function_name, exception)
+
+        with profile_phase(Phase.RESPONSE_VALIDATION):
+            function_execution_result: FunctionExecutionResult = (
+                FunctionExecutionResult.model_validate(data)
+            )
 
         return function_execution_result
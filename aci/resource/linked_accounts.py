@@ -3,10 +3,9 @@ from typing import List
 from uuid import UUID
 
 from httpx import Response
-from tenacity import retry
 
 from aci._constants import DEFAULT_AFTER_OAUTH2_FLOW_REDIRECT_URL
-from aci.resource._base import APIResource, retry_config
+from aci.resource._base import APIResource, retryable
 from aci.types.enums import SecurityScheme
 from aci.types.linked_accounts import (
     LinkedAccount,
@@ -24,7 +23,7 @@ logger: logging.Logger = logging.getLogger(__name__)
 class LinkedAccountsResource(APIResource):
     """Resource for managing linked accounts."""
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("linked_accounts.list")
     def list(
         self,
         app_name: str | None = None,
@@ -49,14 +48,14 @@ class LinkedAccountsResource(APIResource):
         ).model_dump(exclude_none=True, mode="json")
 
         logger.info(f"Listing linked accounts with params: {params}")
-        response = self._httpx_client.get("linked-accounts", params=params)
+        response = self._request("GET", "linked-accounts", params=params)
 
         data: List[dict] = self._handle_response(response)
         linked_accounts = [LinkedAccount.model_validate(account) for account in data]
 
         return linked_accounts
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("linked_accounts.get")
     def get(self, linked_account_id: UUID) -> LinkedAccountWithCredentials:
         """Get a linked account by its ID.
 
@@ -72,13 +71,17 @@ class LinkedAccountsResource(APIResource):
             Various exceptions defined in _handle_response for different HTTP status codes.
         """
         logger.info(f"Getting linked account with linked_account_id: {linked_account_id}")
-        response = self._httpx_client.get(f"linked-accounts/{linked_account_id}")
+        response = self._request(
+            "GET",
+            "linked-accounts/{linked_account_id}",
+            path_params={"linked_account_id": linked_account_id},
+        )
         data: dict = self._handle_response(response)
         linked_account = LinkedAccountWithCredentials.model_validate(data)
 
         return linked_account
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("linked_accounts.link", idempotent=False)
     def link(
         self,
         app_name: str,
@@ -120,7 +123,7 @@ class LinkedAccountsResource(APIResource):
                 f"Creating linked account with API key for app: {app_name}, owner_id: {linked_account_owner_id}"
             )
 
-            response = self._httpx_client.post("linked-accounts/api-key", json=validated_params)
+            response = self._request("POST", "linked-accounts/api-key", json=validated_params)
 
             return LinkedAccount.model_validate(self._handle_response(response))
 
@@ -134,7 +137,7 @@ class LinkedAccountsResource(APIResource):
                 f"Creating linked account with no auth for app: {app_name}, owner_id: {linked_account_owner_id}"
             )
 
-            response = self._httpx_client.post("linked-accounts/no-auth", json=validated_params)
+            response = self._request("POST", "linked-accounts/no-auth", json=validated_params)
 
             return LinkedAccount.model_validate(self._handle_response(response))
 
@@ -149,12 +152,12 @@ class LinkedAccountsResource(APIResource):
                 f"Creating linked account with OAuth2 for app: {app_name}, owner_id: {linked_account_owner_id}"
             )
 
-            response = self._httpx_client.get("linked-accounts/oauth2", params=validated_params)
+            response = self._request("GET", "linked-accounts/oauth2", params=validated_params)
             response_data: dict[str, str] = self._handle_response(response)
 
             return response_data["url"]
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("linked_accounts.delete", idempotent=False)
     def delete(self, linked_account_id: UUID) -> None:
         """Delete a linked account.
 
@@ -165,10 +168,14 @@ class LinkedAccountsResource(APIResource):
             Various exceptions defined in _handle_response for different HTTP status codes.
         """
         logger.info(f"Deleting linked account with ID: {linked_account_id}")
-        response = self._httpx_client.delete(f"linked-accounts/{linked_account_id}")
+        response = self._request(
+            "DELETE",
+            "linked-accounts/{linked_account_id}",
+            path_params={"linked_account_id": linked_account_id},
+        )
         self._handle_response(response)
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("linked_accounts.disable", idempotent=False)
     def disable(self, linked_account_id: UUID) -> LinkedAccount:
         """Disable a linked account.
 
@@ -183,7 +190,7 @@ class LinkedAccountsResource(APIResource):
         """
         return self._update(linked_account_id, enabled=False)
 
-    @retry(**retry_config)  # type: ignore
+    @retryable("linked_accounts.enable", idempotent=False)
     def enable(self, linked_account_id: UUID) -> LinkedAccount:
         """Enable a linked account.
 
@@ -216,8 +223,10 @@ class LinkedAccountsResource(APIResource):
         ).model_dump(exclude_none=True, mode="json")
 
         logger.info(f"Updating linked account with ID: {linked_account_id}")
-        response = self._httpx_client.patch(
-            f"linked-accounts/{linked_account_id}",
+        response = self._request(
+            "PATCH",
+            "linked-accounts/{linked_account_id}",
+            path_params={"linked_account_id": linked_account_id},
             json=validated_params,
         )
         data: dict = self._handle_response(response)
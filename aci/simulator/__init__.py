@@ -0,0 +1,25 @@
+"""A local simulator of the ACI API with injectable faults, to test and benchmark clients
+without the real backend.
+
+It implements the endpoints used by the SDK over a generated app catalog, and injects latency,
+rate limiting (429 with Retry-After), server errors, slow bodies and large payloads as
+configured. It can be used in-process (SimulatorTransport), served over HTTP (SimulatorServer,
+`python -m aci.simulator`) or served by any ASGI server (SimulatorASGIApp).
+"""
+
+from aci.simulator._backend import SimulatedResponse, Simulator, SimulatorStats
+from aci.simulator._config import FaultConfig, LatencyDistribution, SimulatorConfig
+from aci.simulator._server import SimulatorASGIApp, SimulatorServer
+from aci.simulator._transport import SimulatorTransport
+
+__all__ = [
+    "FaultConfig",
+    "LatencyDistribution",
+    "SimulatedResponse",
+    "Simulator",
+    "SimulatorASGIApp",
+    "SimulatorConfig",
+    "SimulatorServer",
+    "SimulatorStats",
+    "SimulatorTransport",
+]
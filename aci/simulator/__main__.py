@@ -0,0 +1,65 @@
+"""Serve a simulated ACI API over HTTP.
+
+Usage:
+    python -m aci.simulator --port 8000 --latency-mean 0.05 --rate-limit-rate 0.05 --retry-after 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+from collections.abc import Sequence
+
+from aci.simulator._config import FaultConfig, LatencyDistribution, SimulatorConfig
+from aci.simulator._server import SimulatorServer
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0] if __doc__ else None)
+    parser.add_argument("--host", default="127.0.0.1", help="host to bind to")
+    parser.add_argument("--port", type=int, default=8000, help="port to bind to, 0 for any")
+    parser.add_argument(
+        "--latency",
+        choices=["constant", "uniform", "exponential", "lognormal"],
+        default="constant",
+        help="latency distribution",
+    )
+    parser.add_argument("--latency-mean", type=float, default=0.0, help="mean latency in seconds")
+    parser.add_argument("--latency-stddev", type=float, default=0.0, help="latency stddev")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 5xx errors")
+    parser.add_argument("--retry-after", type=float, help="Retry-After of 429 and 503 responses")
+    parser.add_argument("--slow-body-rate", type=float, default=0.0, help="fraction of slow bodies")
+    parser.add_argument("--large-payload-bytes", type=int, default=0, help="padding of responses")
+    parser.add_argument("--apps", type=int, default=10, help="apps in the catalog")
+    parser.add_argument("--functions-per-app", type=int, default=10, help="functions per app")
+    parser.add_argument("--api-key", help="the only API key accepted, any by default")
+    parser.add_argument("--seed", type=int, help="seed of the random faults and latencies")
+    args = parser.parse_args(argv)
+
+    config = SimulatorConfig(
+        faults=FaultConfig(
+            latency=LatencyDistribution(args.latency, args.latency_mean, args.latency_stddev),
+            rate_limit_rate=args.rate_limit_rate,
+            error_rate=args.error_rate,
+            retry_after=args.retry_after,
+            slow_body_rate=args.slow_body_rate,
+            large_payload_bytes=args.large_payload_bytes,
+        ),
+        apps=args.apps,
+        functions_per_app=args.functions_per_app,
+        api_key=args.api_key,
+        seed=args.seed,
+    )
+    with SimulatorServer(config, args.host, args.port) as server:
+        print(f"Serving the simulated ACI API at {server.base_url}", flush=True)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,492 @@
+from __future__ import annotations
+
+import dataclasses
+import gzip
+import json
+import random
+import re
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+from urllib.parse import parse_qs
+
+from aci._constants import IDEMPOTENCY_KEY_HEADER
+from aci.libs._function_definition import FunctionDefinition, render_function_definition
+from aci.simulator._config import FaultConfig, SimulatorConfig
+from aci.types.enums import FunctionDefinitionFormat
+
+_CATEGORIES = ("productivity", "dev-tools", "search", "communication")
+_PROJECT_ID = str(uuid.UUID(int=0))
+
+
+@dataclass
+class SimulatedResponse:
+    """A response of the simulator, to be sent by one of its frontends."""
+
+    status_code: int
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+    latency: float = 0.0
+    """Delay (in seconds) before the response is sent."""
+    chunks: int = 1
+    """Number of chunks the body is sent in."""
+    chunk_delay: float = 0.0
+    """Delay (in seconds) before each chunk of the body."""
+
+    def iter_chunks(self) -> list[bytes]:
+        size = -(-len(self.body) // self.chunks) or 1
+        return [self.body[start : start + size] for start in range(0, len(self.body), size)]
+
+
+@dataclass
+class SimulatorStats:
+    """Counters of the requests handled by a simulator."""
+
+    requests: dict[str, int] = field(default_factory=dict)
+    """Number of requests by endpoint, e.g., "GET functions/search"."""
+    rate_limited: int = 0
+    errors: int = 0
+    slow_bodies: int = 0
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+_Handler = Callable[["Simulator", dict[str, str], dict[str, list[str]], Any], Any]
+_ROUTES: list[tuple[str, re.Pattern[str], str, _Handler]] = []
+
+
+def _route(method: str, template: str) -> Callable[[_Handler], _Handler]:
+    pattern = re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", template) + "$")
+
+    def decorator(handler: _Handler) -> _Handler:
+        _ROUTES.append((method, pattern, template, handler))
+        return handler
+
+    return decorator
+
+
+class Simulator:
+    """A simulated ACI backend implementing the endpoints used by the SDK, with injected faults.
+
+    It keeps a generated app catalog and the linked accounts and app configurations created
+    through it in memory. It is independent of any transport: see SimulatorTransport to use it
+    in-process, and SimulatorServer or SimulatorASGIApp to serve it over HTTP.
+    """
+
+    def __init__(self, config: SimulatorConfig | None = None) -> None:
+        self.config = config or SimulatorConfig()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._stats = SimulatorStats()
+        self._apps = _build_catalog(self.config.apps, self.config.functions_per_app)
+        self._functions: dict[str, dict[str, Any]] = {
+            function["name"]: function
+            for app in self._apps.values()
+            for function in app["functions"]
+        }
+        self._linked_accounts: dict[str, dict[str, Any]] = {}
+        self._app_configurations: dict[str, dict[str, Any]] = {}
+        # responses by idempotency key, the least recently used first
+        self._idempotent_responses: OrderedDict[str, SimulatedResponse] = OrderedDict()
+
+    def handle(
+        self, method: str, path: str, query: str, headers: dict[str, str], body: bytes
+    ) -> SimulatedResponse:
+        """Handle a request to a path relative to the base URL, e.g., "functions/search".
+
+        Args:
+            method: The HTTP method.
+            path: The path relative to the base URL.
+            query: The raw query string.
+            headers: The request headers, with lowercase names.
+            body: The request body.
+        """
+        method = method.upper()
+        path = path.strip("/")
+        route = _match_route(method, path)
+        if route is None:
+            return _json_response(404, {"message": f"Not found: {method} {path}"})
+        endpoint, handler, path_params = route
+
+        idempotency_key = headers.get(IDEMPOTENCY_KEY_HEADER.lower())
+        if idempotency_key is not None and method != "GET":
+            with self._lock:
+                cached = self._idempotent_responses.get(idempotency_key)
+                if cached is not None:
+                    self._idempotent_responses.move_to_end(idempotency_key)
+            if cached is not None:
+                return dataclasses.replace(cached, headers=dict(cached.headers))
+
+        faults = self.config.get_faults(endpoint)
+        with self._lock:
+            self._stats.requests[endpoint] = self._stats.requests.get(endpoint, 0) + 1
+            latency = faults.latency.sample(self._rng)
+            draw = self._rng.random()
+            slow = self._rng.random() < faults.slow_body_rate
+            error_status = self._rng.choice(faults.error_statuses) if faults.error_statuses else 500
+
+        response = self._inject_error(faults, draw, error_status)
+        if response is None:
+            response = self._dispatch(handler, path_params, query, headers, body, faults)
+            if slow and response.status_code < 400:
+                response.chunks = faults.slow_body_chunks
+                response.chunk_delay = faults.slow_body_chunk_delay
+                with self._lock:
+                    self._stats.slow_bodies += 1
+            if idempotency_key is not None and method != "GET" and response.status_code < 500:
+                with self._lock:
+                    self._idempotent_responses[idempotency_key] = response
+                    while len(self._idempotent_responses) > self.config.max_idempotency_keys:
+                        self._idempotent_responses.popitem(last=False)
+        response.latency = latency
+        return response
+
+    def stats(self) -> SimulatorStats:
+        with self._lock:
+            return SimulatorStats(
+                requests=dict(self._stats.requests),
+                rate_limited=self._stats.rate_limited,
+                errors=self._stats.errors,
+                slow_bodies=self._stats.slow_bodies,
+            )
+
+    def _inject_error(
+        self, faults: FaultConfig, draw: float, error_status: int
+    ) -> SimulatedResponse | None:
+        if draw < faults.rate_limit_rate:
+            status_code = 429
+        elif draw < faults.rate_limit_rate + faults.error_rate:
+            status_code = error_status
+        else:
+            return None
+
+        with self._lock:
+            if status_code == 429:
+                self._stats.rate_limited += 1
+            else:
+                self._stats.errors += 1
+        response = _json_response(status_code, {"message": "Injected fault"})
+        if faults.retry_after is not None and status_code in (429, 503):
+            response.headers["Retry-After"] = f"{faults.retry_after:g}"
+        return response
+
+    def _dispatch(
+        self,
+        handler: _Handler,
+        path_params: dict[str, str],
+        query: str,
+        headers: dict[str, str],
+        body: bytes,
+        faults: FaultConfig,
+    ) -> SimulatedResponse:
+        api_key = headers.get("x-api-key")
+        if not api_key or (self.config.api_key is not None and api_key != self.config.api_key):
+            return _json_response(401, {"message": "Invalid API key"})
+        content_encoding = headers.get("content-encoding", "identity")
+        if content_encoding not in ("identity", "gzip"):
+            return _json_response(415, {"message": f"Unsupported encoding: {content_encoding}"})
+        if content_encoding == "gzip":
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError, zlib.error):
+                return _json_response(400, {"message": "Invalid gzip-encoded body"})
+        try:
+            data = handler(self, path_params, parse_qs(query), json.loads(body) if body else None)
+        except _HTTPError as e:
+            return _json_response(e.status_code, {"message": str(e)})
+        except (ValueError, KeyError, TypeError) as e:
+            return _json_response(400, {"message": f"Invalid request: {e}"})
+
+        if isinstance(data, dict) and faults.large_payload_bytes:
+            data = {**data, "padding": "x" * faults.large_payload_bytes}
+        return _json_response(200, data)
+
+    # functions
+
+    @_route("GET", "functions/search")
+    def _search_functions(self, path_params: dict, query: dict, body: Any) -> Any:
+        app_names = set(query.get("app_names", []))
+        intent = _first(query, "intent", "").lower()
+        format = FunctionDefinitionFormat(_first(query, "format", "openai"))
+        functions = [
+            function
+            for function in self._functions.values()
+            if (not app_names or function["app_name"] in app_names)
+            and (
+                not intent
+                or any(word in function["description"].lower() for word in intent.split())
+            )
+        ]
+        return [_render(function, format) for function in _paginate(functions, query)]
+
+    @_route("GET", "functions/{function_name}/definition")
+    def _get_function_definition(self, path_params: dict, query: dict, body: Any) -> Any:
+        function = self._get_function(path_params["function_name"])
+        return _render(function, FunctionDefinitionFormat(_first(query, "format", "openai")))
+
+    @_route("POST", "functions/{function_name}/execute")
+    def _execute_function(self, path_params: dict, query: dict, body: Any) -> Any:
+        function = self._get_function(path_params["function_name"])
+        return {
+            "success": True,
+            "data": {
+                "function": function["name"],
+                "input": body["function_input"],
+                "linked_account_owner_id": body["linked_account_owner_id"],
+            },
+        }
+
+    # apps
+
+    @_route("GET", "apps/search")
+    def _search_apps(self, path_params: dict, query: dict, body: Any) -> Any:
+        categories = set(query.get("categories", []))
+        include_functions = _first(query, "include_functions", "false").lower() == "true"
+        apps = [
+            {
+                "name": app["name"],
+                "description": app["description"],
+                "functions": [
+                    {"name": function["name"], "description": function["description"]}
+                    for function in app["functions"]
+                ]
+                if include_functions
+                else None,
+            }
+            for app in self._apps.values()
+            if not categories or categories & set(app["categories"])
+        ]
+        return _paginate(apps, query)
+
+    @_route("GET", "apps/{app_name}")
+    def _get_app(self, path_params: dict, query: dict, body: Any) -> Any:
+        return self._get_app_details(path_params["app_name"])
+
+    # linked accounts
+
+    @_route("GET", "linked-accounts")
+    def _list_linked_accounts(self, path_params: dict, query: dict, body: Any) -> Any:
+        app_name = _first(query, "app_name", None)
+        owner_id = _first(query, "linked_account_owner_id", None)
+        with self._lock:
+            accounts = list(self._linked_accounts.values())
+        return [
+            account
+            for account in accounts
+            if (app_name is None or account["app_name"] == app_name)
+            and (owner_id is None or account["linked_account_owner_id"] == owner_id)
+        ]
+
+    @_route("GET", "linked-accounts/oauth2")
+    def _link_oauth2(self, path_params: dict, query: dict, body: Any) -> Any:
+        self._get_app_details(_first(query, "app_name", ""))
+        return {"url": f"https://simulator.aci.dev/oauth2/authorize?state={uuid.uuid4()}"}
+
+    @_route("POST", "linked-accounts/api-key")
+    def _link_api_key(self, path_params: dict, query: dict, body: Any) -> Any:
+        return self._create_linked_account(body, "api_key")
+
+    @_route("POST", "linked-accounts/no-auth")
+    def _link_no_auth(self, path_params: dict, query: dict, body: Any) -> Any:
+        return self._create_linked_account(body, "no_auth")
+
+    @_route("GET", "linked-accounts/{linked_account_id}")
+    def _get_linked_account(self, path_params: dict, query: dict, body: Any) -> Any:
+        return {
+            **self._find_linked_account(path_params["linked_account_id"]),
+            "security_credentials": {},
+        }
+
+    @_route("PATCH", "linked-accounts/{linked_account_id}")
+    def _update_linked_account(self, path_params: dict, query: dict, body: Any) -> Any:
+        account = self._find_linked_account(path_params["linked_account_id"])
+        with self._lock:
+            if body.get("enabled") is not None:
+                account["enabled"] = body["enabled"]
+            account["updated_at"] = _now()
+            return dict(account)
+
+    @_route("DELETE", "linked-accounts/{linked_account_id}")
+    def _delete_linked_account(self, path_params: dict, query: dict, body: Any) -> Any:
+        self._find_linked_account(path_params["linked_account_id"])
+        with self._lock:
+            self._linked_accounts.pop(path_params["linked_account_id"], None)
+        return {}
+
+    # app configurations
+
+    @_route("GET", "app-configurations")
+    def _list_app_configurations(self, path_params: dict, query: dict, body: Any) -> Any:
+        app_names = set(query.get("app_names", []))
+        with self._lock:
+            configurations = list(self._app_configurations.values())
+        return _paginate(
+            [c for c in configurations if not app_names or c["app_name"] in app_names], query
+        )
+
+    @_route("POST", "app-configurations")
+    def _create_app_configuration(self, path_params: dict, query: dict, body: Any) -> Any:
+        app = self._get_app_details(body["app_name"])
+        with self._lock:
+            if app["name"] in self._app_configurations:
+                raise _HTTPError(409, f"App configuration already exists: {app['name']}")
+            now = _now()
+            configuration = self._app_configurations[app["name"]] = {
+                "id": str(uuid.uuid4()),
+                "project_id": _PROJECT_ID,
+                "app_name": app["name"],
+                "security_scheme": body["security_scheme"],
+                "enabled": True,
+                "all_functions_enabled": body.get("all_functions_enabled", True),
+                "enabled_functions": body.get("enabled_functions") or [],
+                "created_at": now,
+                "updated_at": now,
+            }
+            return dict(configuration)
+
+    @_route("GET", "app-configurations/{app_name}")
+    def _get_app_configuration(self, path_params: dict, query: dict, body: Any) -> Any:
+        with self._lock:
+            configuration = self._app_configurations.get(path_params["app_name"])
+        if configuration is None:
+            raise _HTTPError(404, f"App configuration not found: {path_params['app_name']}")
+        return dict(configuration)
+
+    @_route("DELETE", "app-configurations/{app_name}")
+    def _delete_app_configuration(self, path_params: dict, query: dict, body: Any) -> Any:
+        with self._lock:
+            if self._app_configurations.pop(path_params["app_name"], None) is None:
+                raise _HTTPError(404, f"App configuration not found: {path_params['app_name']}")
+        return {}
+
+    def _get_function(self, function_name: str) -> dict[str, Any]:
+        function = self._functions.get(function_name)
+        if function is None:
+            raise _HTTPError(404, f"Function not found: {function_name}")
+        return function
+
+    def _get_app_details(self, app_name: str) -> dict[str, Any]:
+        app = self._apps.get(app_name)
+        if app is None:
+            raise _HTTPError(404, f"App not found: {app_name}")
+        return app
+
+    def _find_linked_account(self, linked_account_id: str) -> dict[str, Any]:
+        with self._lock:
+            account = self._linked_accounts.get(linked_account_id)
+        if account is None:
+            raise _HTTPError(404, f"Linked account not found: {linked_account_id}")
+        return account
+
+    def _create_linked_account(self, body: Any, security_scheme: str) -> dict[str, Any]:
+        self._get_app_details(body["app_name"])
+        now = _now()
+        account = {
+            "id": str(uuid.uuid4()),
+            "project_id": _PROJECT_ID,
+            "app_name": body["app_name"],
+            "linked_account_owner_id": body["linked_account_owner_id"],
+            "security_scheme": security_scheme,
+            "enabled": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+        with self._lock:
+            self._linked_accounts[account["id"]] = account
+        return dict(account)
+
+
+def _match_route(method: str, path: str) -> tuple[str, _Handler, dict[str, str]] | None:
+    for route_method, pattern, template, handler in _ROUTES:
+        match = pattern.match(path)
+        if match is not None and route_method == method:
+            return f"{method} {template}", handler, match.groupdict()
+    return None
+
+
+def _build_catalog(apps: int, functions_per_app: int) -> dict[str, dict[str, Any]]:
+    catalog = {}
+    for app_index in range(apps):
+        app_name = f"APP_{app_index:02d}"
+        functions = [
+            {
+                "id": str(uuid.UUID(int=app_index * functions_per_app + function_index + 1)),
+                "app_name": app_name,
+                "name": f"{app_name}__FUNCTION_{function_index:02d}",
+                "description": f"Function {function_index} of app {app_index}, for "
+                f"{_CATEGORIES[(app_index + function_index) % len(_CATEGORIES)]} tasks.",
+                "tags": [_CATEGORIES[app_index % len(_CATEGORIES)]],
+                "visibility": "public",
+                "active": True,
+                "protocol": "rest",
+                "protocol_data": {},
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "The query."},
+                        "limit": {"type": "integer", "description": "Maximum number of results."},
+                    },
+                    "required": ["query"],
+                    "additionalProperties": False,
+                },
+                "response": {},
+            }
+            for function_index in range(functions_per_app)
+        ]
+        catalog[app_name] = {
+            "id": str(uuid.UUID(int=10**6 + app_index)),
+            "name": app_name,
+            "display_name": f"App {app_index}",
+            "provider": "ACI Simulator",
+            "version": "1.0.0",
+            "description": f"Simulated app {app_index}.",
+            "logo": None,
+            "categories": [_CATEGORIES[app_index % len(_CATEGORIES)]],
+            "visibility": "public",
+            "active": True,
+            "security_schemes": ["api_key", "no_auth", "oauth2"],
+            "functions": functions,
+        }
+    return catalog
+
+
+def _render(function: dict[str, Any], format: FunctionDefinitionFormat) -> dict:
+    return render_function_definition(
+        FunctionDefinition(
+            name=function["name"],
+            description=function["description"],
+            parameters=function["parameters"],
+        ),
+        format,
+    )
+
+
+def _paginate(items: list[Any], query: dict[str, list[str]]) -> list[Any]:
+    offset = int(_first(query, "offset", "0"))
+    limit = _first(query, "limit", None)
+    return items[offset:] if limit is None else items[offset : offset + int(limit)]
+
+
+def _first(query: dict[str, list[str]], name: str, default: Any) -> Any:
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _json_response(status_code: int, data: Any) -> SimulatedResponse:
+    return SimulatedResponse(
+        status_code=status_code,
+        body=json.dumps(data).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Literal
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """Distribution of the latency (in seconds) added to each simulated response.
+
+    Examples:
+        >>> LatencyDistribution("constant", mean=0.05)
+        >>> LatencyDistribution("lognormal", mean=0.08, stddev=0.05, max=2.0)
+    """
+
+    kind: Literal["constant", "uniform", "exponential", "lognormal"] = "constant"
+    mean: float = 0.0
+    """The mean latency, the latency of every response for "constant"."""
+    stddev: float = 0.0
+    """The standard deviation, for "uniform" (half the width of the range) and "lognormal"."""
+    max: float | None = None
+    """Cap of the sampled latencies, None for no cap."""
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "constant":
+            latency = self.mean
+        elif self.kind == "uniform":
+            latency = rng.uniform(self.mean - self.stddev, self.mean + self.stddev)
+        elif self.kind == "exponential":
+            latency = rng.expovariate(1 / self.mean) if self.mean > 0 else 0.0
+        elif self.mean > 0:
+            # parameters of the underlying normal distribution giving this mean and stddev
+            sigma = math.sqrt(math.log(1 + (self.stddev / self.mean) ** 2))
+            latency = rng.lognormvariate(math.log(self.mean) - sigma**2 / 2, sigma)
+        else:
+            latency = 0.0
+        latency = max(latency, 0.0)
+        return latency if self.max is None else min(latency, self.max)
+
+
+@dataclass(frozen=True)
+class FaultConfig:
+    """Faults injected into the simulated responses, each request drawing at most one error."""
+
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    rate_limit_rate: float = 0.0
+    """Fraction of the requests answered with 429."""
+    error_rate: float = 0.0
+    """Fraction of the requests answered with one of `error_statuses`."""
+    error_statuses: tuple[int, ...] = (500, 502, 503)
+    retry_after: float | None = None
+    """Value (in seconds) of the Retry-After header of 429 and 503 responses, None to omit it."""
+    slow_body_rate: float = 0.0
+    """Fraction of the successful responses whose body is sent slowly, in chunks."""
+    slow_body_chunks: int = 10
+    slow_body_chunk_delay: float = 0.05
+    """Delay (in seconds) before each chunk of a slow body."""
+    large_payload_bytes: int = 0
+    """Padding added to every successful response that is a JSON object, to simulate large
+    payloads, e.g., large function execution results."""
+
+    def __post_init__(self) -> None:
+        for name in ("rate_limit_rate", "error_rate", "slow_body_rate"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if self.rate_limit_rate + self.error_rate > 1:
+            raise ValueError("rate_limit_rate + error_rate must be at most 1")
+
+
+@dataclass(frozen=True)
+class SimulatorConfig:
+    """Configuration of a simulated ACI backend."""
+
+    faults: FaultConfig = field(default_factory=FaultConfig)
+    """Faults of all endpoints, unless overridden in `endpoint_faults`."""
+    endpoint_faults: dict[str, FaultConfig] = field(default_factory=dict)
+    """Faults by endpoint, keyed by HTTP method and endpoint template as the SDK names them,
+    e.g., "POST functions/{function_name}/execute"."""
+    apps: int = 10
+    """Number of apps in the simulated catalog."""
+    functions_per_app: int = 10
+    api_key: str | None = None
+    """The only API key accepted, None to accept any non-empty key."""
+    seed: int | None = None
+    """Seed of the random faults and latencies, for reproducible runs."""
+    max_idempotency_keys: int = 10_000
+    """Number of most recent idempotency keys whose responses are replayed to retried mutations,
+    so that long runs do not keep every response in memory."""
+
+    def get_faults(self, endpoint: str) -> FaultConfig:
+        return self.endpoint_faults.get(endpoint, self.faults)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Awaitable, Callable, MutableMapping, cast
+from urllib.parse import urlsplit
+
+from aci.simulator._backend import Simulator
+from aci.simulator._config import SimulatorConfig
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+BASE_PATH = "/v1/"
+
+
+class SimulatorServer:
+    """Serves a simulator over HTTP/1.1 from daemon threads, to be used as the base URL of clients
+    in other threads or processes.
+
+    Examples:
+        >>> with SimulatorServer(SimulatorConfig(faults=FaultConfig(rate_limit_rate=0.05))) as server:
+        ...     client = ACI(api_key="any", base_url=server.base_url)
+    """
+
+    def __init__(
+        self,
+        config: SimulatorConfig | Simulator | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        uds: str | None = None,
+    ) -> None:
+        """
+        Args:
+            config: The configuration of the simulator, or a simulator to share, e.g., with a
+                SimulatorTransport.
+            host: The host to bind to, local only by default.
+            port: The port to bind to, 0 to pick a free port.
+            uds: The path of a Unix domain socket to serve on instead of host and port, for
+                clients created with `ACI(uds=...)`.
+        """
+        self.simulator = config if isinstance(config, Simulator) else Simulator(config)
+        self.host = host
+        self.port = port
+        self.uds = uds
+        self._server: socketserver.BaseServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("The server is not started")
+        if self.uds is not None:
+            # the host is only sent in the Host header, requests go through the socket
+            return f"http://localhost{BASE_PATH}"
+        host, port = cast(tuple[str, int], self._server.server_address)[:2]
+        return f"http://{host}:{port}{BASE_PATH}"
+
+    def start(self) -> str:
+        """Start serving from a daemon thread.
+
+        Returns:
+            str: The base URL of the simulated API, e.g., "http://127.0.0.1:8000/v1/".
+        """
+        if self._server is not None:
+            raise RuntimeError("The server is already started")
+
+        simulator = self.simulator
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, which Nagle's algorithm would delay
+            disable_nagle_algorithm = True
+
+            def handle_simulated(self) -> None:
+                url = urlsplit(self.path)
+                if not url.path.startswith(BASE_PATH):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                response = simulator.handle(
+                    self.command,
+                    url.path[len(BASE_PATH) :],
+                    url.query,
+                    {name.lower(): value for name, value in self.headers.items()},
+                    self.rfile.read(length) if length else b"",
+                )
+                if response.latency:
+                    time.sleep(response.latency)
+                self.send_response(response.status_code)
+                for name, value in response.headers.items():
+                    self.send_header(name, value)
+                if response.chunks <= 1:
+                    self.send_header("Content-Length", str(len(response.body)))
+                    self.end_headers()
+                    self.wfile.write(response.body)
+                    return
+
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for chunk in response.iter_chunks():
+                    time.sleep(response.chunk_delay)
+                    self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+            do_GET = do_POST = do_PATCH = do_DELETE = handle_simulated
+
+            def address_string(self) -> str:
+                # the client address is empty on Unix domain sockets
+                return str(self.client_address[0]) if self.client_address else "uds"
+
+            def log_message(self, format: str, *args: object) -> None:
+                logger.debug(format % args)
+
+        if self.uds is not None:
+            Handler.disable_nagle_algorithm = False
+            self._server = _ThreadingUnixHTTPServer(self.uds, Handler)
+        else:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        threading.Thread(
+            target=self._server.serve_forever, name="aci-simulator", daemon=True
+        ).start()
+        return self.base_url
+
+    def close(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            if self.uds is not None:
+                os.unlink(self.uds)
+
+    def __enter__(self) -> SimulatorServer:
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class SimulatorASGIApp:
+    """A simulator as an ASGI application, to be served by any ASGI server, e.g.,
+    `uvicorn.run(SimulatorASGIApp(), port=8000)`, or used in-process by async clients through
+    `httpx.ASGITransport`.
+
+    The API is served under /v1/, as the real backend.
+    """
+
+    def __init__(self, config: SimulatorConfig | Simulator | None = None) -> None:
+        self.simulator = config if isinstance(config, Simulator) else Simulator(config)
+
+    async def __call__(
+        self,
+        scope: MutableMapping[str, Any],
+        receive: Callable[[], Awaitable[MutableMapping[str, Any]]],
+        send: Callable[[MutableMapping[str, Any]], Awaitable[None]],
+    ) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        path: str = scope["path"]
+        if not path.startswith(BASE_PATH):
+            await send({"type": "http.response.start", "status": 404, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        response = self.simulator.handle(
+            scope["method"],
+            path[len(BASE_PATH) :],
+            scope["query_string"].decode(),
+            {name.decode().lower(): value.decode() for name, value in scope["headers"]},
+            body,
+        )
+        if response.latency:
+            await asyncio.sleep(response.latency)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (name.lower().encode(), value.encode())
+                    for name, value in response.headers.items()
+                ],
+            }
+        )
+        chunks = (response.iter_chunks() if response.chunks > 1 else None) or [response.body]
+        for index, chunk in enumerate(chunks):
+            if response.chunks > 1:
+                await asyncio.sleep(response.chunk_delay)
+            await send(
+                {"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1}
+            )
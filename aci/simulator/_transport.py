@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+
+import httpx
+
+from aci._constants import DEFAULT_SERVER_URL
+from aci.simulator._backend import SimulatedResponse, Simulator
+from aci.simulator._config import SimulatorConfig
+
+
+class _SlowStream(httpx.SyncByteStream):
+    def __init__(self, response: SimulatedResponse) -> None:
+        self._response = response
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._response.iter_chunks():
+            time.sleep(self._response.chunk_delay)
+            yield chunk
+
+
+class SimulatorTransport(httpx.BaseTransport):
+    """An httpx transport answering requests with a simulator in-process, with no sockets.
+
+    The latency of the responses is slept in the calling thread, so that timeouts, deadlines and
+    hedging behave as against a remote backend.
+
+    Examples:
+        >>> transport = SimulatorTransport(SimulatorConfig(faults=FaultConfig(error_rate=0.1)))
+        >>> client = ACI(api_key="any", transport=transport)
+    """
+
+    def __init__(
+        self,
+        config: SimulatorConfig | Simulator | None = None,
+        base_url: str = DEFAULT_SERVER_URL,
+    ) -> None:
+        """
+        Args:
+            config: The configuration of the simulator, or a simulator to share, e.g., with a
+                SimulatorServer.
+            base_url: The base URL of the client, whose path is stripped from the requests.
+        """
+        self.simulator = config if isinstance(config, Simulator) else Simulator(config)
+        self._base_path = httpx.URL(base_url).path
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.startswith(self._base_path):
+            path = path[len(self._base_path) :]
+        response = self.simulator.handle(
+            request.method,
+            path,
+            request.url.query.decode(),
+            {name.lower(): value for name, value in request.headers.items()},
+            request.read(),
+        )
+        if response.latency:
+            time.sleep(response.latency)
+        if response.chunks > 1:
+            return httpx.Response(
+                response.status_code, headers=response.headers, stream=_SlowStream(response)
+            )
+        return httpx.Response(response.status_code, headers=response.headers, content=response.body)
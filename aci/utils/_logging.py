@@ -1,17 +1,67 @@
+import json
 import logging
 import os
+import random
 import shutil
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any, TypeVar
 
 from typing_extensions import override
 
 from aci.utils._type_check import is_dict
 
 logger: logging.Logger = logging.getLogger("ACI")
+# parent of the loggers of all SDK modules
+package_logger: logging.Logger = logging.getLogger("aci")
 httpx_logger: logging.Logger = logging.getLogger("httpx")
 
 
 SENSITIVE_HEADERS = {"x-api-key", "authorization"}
+# argument fields whose values are never logged, matched case-insensitively
+SENSITIVE_FIELDS = {
+    "api_key",
+    "apikey",
+    "x-api-key",
+    "authorization",
+    "password",
+    "passwd",
+    "secret",
+    "client_secret",
+    "token",
+    "access_token",
+    "refresh_token",
+    "id_token",
+    "private_key",
+    "cookie",
+    "session",
+}
+SENSITIVE_FIELD_SUFFIXES = ("_token", "_secret", "_password", "_api_key")
+REDACTED = "<redacted>"
+
+_T = TypeVar("_T")
+
+
+def get_env(name: str, parse: Callable[[str], _T], default: _T) -> _T:
+    """Return the parsed value of an environment variable, the default if it is unset or invalid,
+    so that a typo in the environment does not make importing the SDK fail."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return parse(value)
+    except ValueError:
+        logger.warning("Invalid %s=%r, using %r", name, value, default)
+        return default
+
+
 ACI_LOG_LEVEL = os.environ.get("ACI_LOG_LEVEL", "warn")
+# "text" or "json" (one JSON object per line)
+ACI_LOG_FORMAT = os.environ.get("ACI_LOG_FORMAT", "text")
+# fraction of the debug and info records of the hot paths that are logged
+ACI_LOG_SAMPLE_RATE = get_env("ACI_LOG_SAMPLE_RATE", float, 1.0)
+# strings in logged arguments longer than this are truncated
+ACI_LOG_MAX_VALUE_LENGTH = get_env("ACI_LOG_MAX_VALUE_LENGTH", int, 256)
 
 
 def setup_logging() -> None:
@@ -24,11 +74,19 @@ def setup_logging() -> None:
     logger.addFilter(SensitiveHeadersFilter())
 
     if ACI_LOG_LEVEL == "debug":
-        logger.setLevel(logging.DEBUG)
+        level = logging.DEBUG
     elif ACI_LOG_LEVEL == "info":
-        logger.setLevel(logging.INFO)
+        level = logging.INFO
     else:
-        logger.setLevel(logging.WARN)
+        level = logging.WARN
+    logger.setLevel(level)
+    # the level of the loggers of the SDK modules is left to the application, unless it is set
+    # explicitly, e.g., so that an application logging at info level gets their info records
+    if "ACI_LOG_LEVEL" in os.environ:
+        package_logger.setLevel(level)
+
+    if ACI_LOG_FORMAT == "json":
+        configure_logging(json_lines=True)
 
 
 class SensitiveHeadersFilter(logging.Filter):
@@ -40,9 +98,152 @@ class SensitiveHeadersFilter(logging.Filter):
                 headers = record.args["headers"] = {**headers}
                 for header in headers:
                     if str(header).lower() in SENSITIVE_HEADERS:
-                        headers[header] = "<redacted>"
+                        headers[header] = REDACTED
+        return True
+
+
+class SensitiveFieldsFilter(SensitiveHeadersFilter):
+    """Redacts sensitive fields and truncates long strings in the (nested) values of records
+    logged with a mapping of arguments, e.g.,
+    `logger.info("Executing %(function_name)s with %(function_arguments)s", {...})`.
+
+    The logged values are copied, never modified.
+    """
+
+    def __init__(
+        self,
+        fields: Iterable[str] = SENSITIVE_FIELDS,
+        max_value_length: int | None = ACI_LOG_MAX_VALUE_LENGTH,
+    ) -> None:
+        super().__init__()
+        self.fields = frozenset(field.lower() for field in fields)
+        self.max_value_length = max_value_length
+
+    @override
+    def filter(self, record: logging.LogRecord) -> bool:
+        super().filter(record)
+        if is_dict(record.args):
+            record.args = {
+                str(key): self.redact(str(key), value) for key, value in record.args.items()
+            }
         return True
 
+    def is_sensitive(self, field: str) -> bool:
+        field = field.lower()
+        return field in self.fields or field.endswith(SENSITIVE_FIELD_SUFFIXES)
+
+    def redact(self, field: str, value: Any) -> Any:
+        """Return a copy of the value of a field that is safe and small enough to log."""
+        if self.is_sensitive(field):
+            return REDACTED
+        if is_dict(value):
+            return {key: self.redact(str(key), item) for key, item in value.items()}
+        if isinstance(value, list | tuple):
+            return [self.redact(field, item) for item in value]
+        if (
+            isinstance(value, str)
+            and self.max_value_length is not None
+            and len(value) > self.max_value_length
+        ):
+            truncated = len(value) - self.max_value_length
+            return f"{value[: self.max_value_length]}...<{truncated} more chars>"
+        return value
+
+
+class LogSamplingFilter(logging.Filter):
+    """Lets through only a fraction of the debug and info records, warnings and errors are always
+    logged."""
+
+    def __init__(self, sample_rate: float = ACI_LOG_SAMPLE_RATE) -> None:
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    @override
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.sample_rate >= 1:
+            return True
+        return random.random() < self.sample_rate
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line.
+
+    The arguments of records logged with a mapping of arguments become fields of the object.
+    """
+
+    @override
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if is_dict(record.args):
+            for key, value in record.args.items():
+                entry.setdefault(str(key), value)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+_sampling_filter = LogSamplingFilter()
+_redaction_filter = SensitiveFieldsFilter()
+_json_lines_handler: logging.Handler | None = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return the logger of a module on a hot path, which samples and redacts its records, see
+    `configure_logging`."""
+    module_logger = logging.getLogger(name)
+    module_logger.addFilter(_sampling_filter)
+    module_logger.addFilter(_redaction_filter)
+    return module_logger
+
+
+def configure_logging(
+    *,
+    sample_rate: float | None = None,
+    max_value_length: int | None = None,
+    sensitive_fields: Iterable[str] | None = None,
+    json_lines: bool | None = None,
+) -> None:
+    """Configure how the SDK logs, the arguments left as None keep their current value.
+
+    The defaults can also be set with the ACI_LOG_SAMPLE_RATE, ACI_LOG_MAX_VALUE_LENGTH and
+    ACI_LOG_FORMAT=json environment variables.
+
+    Args:
+        sample_rate: Fraction (0-1) of the debug and info records of function searches and
+            executions that are logged. Warnings and errors are always logged.
+        max_value_length: Strings in logged arguments longer than this are truncated.
+        sensitive_fields: Names of argument fields whose values are logged as "<redacted>",
+            replacing the default ones. Fields ending in e.g. "_token" or "_secret" are always
+            redacted.
+        json_lines: Whether the SDK logs one JSON object per line to stderr, instead of
+            propagating its records to the root logger.
+    """
+    global _json_lines_handler
+
+    if sample_rate is not None:
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        _sampling_filter.sample_rate = sample_rate
+    if max_value_length is not None:
+        _redaction_filter.max_value_length = max_value_length
+    if sensitive_fields is not None:
+        _redaction_filter.fields = frozenset(field.lower() for field in sensitive_fields)
+
+    if json_lines and _json_lines_handler is None:
+        _json_lines_handler = logging.StreamHandler()
+        _json_lines_handler.setFormatter(JSONLinesFormatter())
+        package_logger.addHandler(_json_lines_handler)
+        package_logger.propagate = False
+    elif json_lines is False and _json_lines_handler is not None:
+        package_logger.removeHandler(_json_lines_handler)
+        package_logger.propagate = True
+        _json_lines_handler = None
+
 
 def create_headline(title: str, fill_char: str = "-") -> str:
     """Create a header that fills the terminal width with the given title centered.
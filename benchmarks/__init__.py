@@ -0,0 +1,4 @@
+"""Benchmarks of the ACI client, run against in-process fakes so that they measure the SDK only.
+
+Run them with `uv run python -m benchmarks.bench_client --help`.
+"""
@@ -0,0 +1,226 @@
+"""Benchmark of every resource method of the client against the in-process fake backend.
+
+For each method, it reports the calls per second, the client-side overhead per call (the time of
+a call minus the time the fake backend spent answering it) and the memory allocated per call. It
+also reports how the throughput of `handle_function_call` scales with the number of threads
+sharing a client.
+
+Usage:
+    uv run python -m benchmarks.bench_client
+    uv run python -m benchmarks.bench_client --output results.json
+    uv run python -m benchmarks.bench_client --baseline results.json --max-regression 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from aci import ACI
+from aci.types.enums import SecurityScheme
+
+from .fake_backend import APP_NAME, BASE_URL, FUNCTION_NAME, LINKED_ACCOUNT_ID, FakeBackend
+
+OWNER_ID = "bench-owner"
+
+
+@dataclass
+class MethodResult:
+    method: str
+    ops_per_sec: float
+    overhead_us: float
+    """Mean client-side time per call, in microseconds."""
+    peak_kib: float
+    """Mean peak of the memory allocated during a call, in KiB."""
+    retained_bytes: float
+    """Mean memory still allocated after a call, in bytes, which should be about 0."""
+
+
+@dataclass
+class ScalingResult:
+    threads: int
+    ops_per_sec: float
+    speedup: float
+
+
+def get_benchmarks(client: ACI) -> dict[str, Callable[[], Any]]:
+    """Return a call of every resource method and of `handle_function_call`, keyed by name."""
+    return {
+        "functions.search": lambda: client.functions.search(intent="find issues", limit=10),
+        "functions.get_definition": lambda: client.functions.get_definition(FUNCTION_NAME),
+        "functions.execute": lambda: client.functions.execute(
+            FUNCTION_NAME, {"query": "is:open label:bug", "per_page": 20}, OWNER_ID
+        ),
+        "apps.search": lambda: client.apps.search(intent="issues", include_functions=True),
+        "apps.get": lambda: client.apps.get(APP_NAME),
+        "linked_accounts.list": lambda: client.linked_accounts.list(app_name=APP_NAME),
+        "linked_accounts.get": lambda: client.linked_accounts.get(LINKED_ACCOUNT_ID),
+        "linked_accounts.link": lambda: client.linked_accounts.link(
+            APP_NAME, SecurityScheme.API_KEY, OWNER_ID, api_key="sk-bench"
+        ),
+        "linked_accounts.enable": lambda: client.linked_accounts.enable(LINKED_ACCOUNT_ID),
+        "linked_accounts.disable": lambda: client.linked_accounts.disable(LINKED_ACCOUNT_ID),
+        "linked_accounts.delete": lambda: client.linked_accounts.delete(LINKED_ACCOUNT_ID),
+        "app_configurations.list": lambda: client.app_configurations.list(),
+        "app_configurations.get": lambda: client.app_configurations.get(APP_NAME),
+        "app_configurations.create": lambda: client.app_configurations.create(
+            APP_NAME, SecurityScheme.OAUTH2
+        ),
+        "app_configurations.delete": lambda: client.app_configurations.delete(APP_NAME),
+        "handle_function_call.execute": lambda: client.handle_function_call(
+            FUNCTION_NAME, {"query": "is:open label:bug", "per_page": 20}, OWNER_ID
+        ),
+        "handle_function_call.search": lambda: client.handle_function_call(
+            "ACI_SEARCH_FUNCTIONS", {"intent": "find issues", "limit": 10}, OWNER_ID
+        ),
+    }
+
+
+def bench_method(
+    name: str, call: Callable[[], Any], backend: FakeBackend, iterations: int
+) -> MethodResult:
+    for _ in range(min(iterations, 20)):
+        call()
+
+    backend.reset()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    elapsed = time.perf_counter() - start
+    overhead = (elapsed - backend.server_time) / iterations
+
+    memory_iterations = max(iterations // 10, 1)
+    tracemalloc.start()
+    try:
+        peaks = 0
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(memory_iterations):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            call()
+            peaks += tracemalloc.get_traced_memory()[1] - current
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    return MethodResult(
+        method=name,
+        ops_per_sec=iterations / elapsed,
+        overhead_us=overhead * 1e6,
+        peak_kib=peaks / memory_iterations / 1024,
+        retained_bytes=retained / memory_iterations,
+    )
+
+
+def bench_scaling(
+    call: Callable[[], Any], thread_counts: Sequence[int], iterations: int
+) -> list[ScalingResult]:
+    results: list[ScalingResult] = []
+    for threads in thread_counts:
+        barrier = threading.Barrier(threads + 1)
+
+        def worker(barrier: threading.Barrier) -> None:
+            barrier.wait()
+            for _ in range(iterations):
+                call()
+
+        workers = [threading.Thread(target=worker, args=(barrier,)) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in workers:
+            thread.join()
+        ops_per_sec = threads * iterations / (time.perf_counter() - start)
+        speedup = ops_per_sec / results[0].ops_per_sec if results else 1.0
+        results.append(ScalingResult(threads=threads, ops_per_sec=ops_per_sec, speedup=speedup))
+    return results
+
+
+def find_regressions(
+    results: list[MethodResult], baseline: dict[str, Any], max_regression: float
+) -> list[str]:
+    """Return the methods whose throughput dropped by more than `max_regression` (0-1)."""
+    baseline_ops = {result["method"]: result["ops_per_sec"] for result in baseline["methods"]}
+    return [
+        f"{result.method}: {result.ops_per_sec:.0f} ops/s, baseline {baseline_ops[result.method]:.0f}"
+        for result in results
+        if result.method in baseline_ops
+        and result.ops_per_sec < baseline_ops[result.method] * (1 - max_regression)
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0] if __doc__ else None)
+    parser.add_argument("--iterations", type=int, default=2000, help="calls per method")
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="thread counts to scale to"
+    )
+    parser.add_argument("--methods", nargs="+", help="only benchmark these methods")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="fail if the throughput of a method dropped by more than this fraction",
+    )
+    args = parser.parse_args(argv)
+
+    backend = FakeBackend()
+    with ACI(api_key="bench-api-key", base_url=BASE_URL, transport=backend) as client:
+        benchmarks = get_benchmarks(client)
+        names = args.methods or list(benchmarks)
+
+        print(f"{'method':<32}{'ops/s':>10}{'overhead us':>14}{'peak KiB':>11}{'retained B':>12}")
+        results = []
+        for name in names:
+            result = bench_method(name, benchmarks[name], backend, args.iterations)
+            results.append(result)
+            print(
+                f"{result.method:<32}{result.ops_per_sec:>10.0f}{result.overhead_us:>14.1f}"
+                f"{result.peak_kib:>11.1f}{result.retained_bytes:>12.0f}"
+            )
+
+        print("\nhandle_function_call.execute by threads sharing a client")
+        print(f"{'threads':>7}{'ops/s':>10}{'speedup':>9}")
+        scaling = bench_scaling(
+            benchmarks["handle_function_call.execute"],
+            args.threads,
+            max(args.iterations // max(args.threads), 1),
+        )
+        for scaling_result in scaling:
+            print(
+                f"{scaling_result.threads:>7}{scaling_result.ops_per_sec:>10.0f}"
+                f"{scaling_result.speedup:>9.2f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "methods": [asdict(result) for result in results],
+                    "scaling": [asdict(result) for result in scaling],
+                },
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.max_regression)
+        if regressions:
+            print("\nregressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Benchmark of the CPU cost of compressing payloads against the bytes it saves.
+
+For typical request bodies (function executions with small to large inputs) and responses
+(function definitions and searches, app details, execution results), it reports the size of each
+payload compressed with gzip at several levels, deflate, and br and zstd if brotli and zstandard
+are installed, the time to compress and decompress it, and the transfer time it saves at a given
+bandwidth. Compressing a payload pays off when the transfer time saved exceeds the CPU time, which
+is what CompressionConfig.min_bytes should be tuned for.
+
+Usage:
+    uv run python -m benchmarks.bench_compression
+    uv run python -m benchmarks.bench_compression --bandwidth-mbps 20 --output results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import gzip
+import json
+import random
+import sys
+import time
+import zlib
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .fake_backend import FUNCTION_NAME, build_payloads
+
+_Codec = tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+_WORDS = (
+    "the of and to in is for on with as by at from this that be are it an or was which not but "
+    "issue pull request merge branch commit review deploy build release customer invoice order "
+    "meeting calendar event email thread reply attachment report quarter revenue forecast budget"
+).split()
+
+
+@dataclass
+class CompressionResult:
+    payload: str
+    codec: str
+    original_bytes: int
+    compressed_bytes: int
+    compress_us: float
+    decompress_us: float
+    saved_us: float
+    """Time saved transferring the compressed payload at the bandwidth of the run."""
+
+    @property
+    def ratio(self) -> float:
+        return self.compressed_bytes / self.original_bytes
+
+    @property
+    def net_us(self) -> float:
+        """Transfer time saved minus the CPU time of compressing and decompressing."""
+        return self.saved_us - self.compress_us - self.decompress_us
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _execute_body(function_input: dict[str, Any]) -> dict[str, Any]:
+    return {"function_input": function_input, "linked_account_owner_id": "owner"}
+
+
+def get_payloads(seed: int = 0) -> dict[str, bytes]:
+    """JSON payloads keyed by name, encoded like the client and the backend encode them."""
+    rng = random.Random(seed)
+    responses = build_payloads()
+    payloads: dict[str, Any] = {
+        "execute request, small input": _execute_body({"query": "open issues", "limit": 10}),
+        "execute request, 4 KiB email": _execute_body(
+            {"to": ["team@example.com"], "subject": "Weekly report", "body": _text(rng, 700)}
+        ),
+        "execute request, 200 KiB document": _execute_body(
+            {"name": "report.md", "content": _text(rng, 35_000)}
+        ),
+        "execute request, 1000 rows": _execute_body(
+            {
+                "rows": [
+                    {"id": index, "name": _text(rng, 3), "amount": rng.randint(0, 10_000)}
+                    for index in range(1000)
+                ]
+            }
+        ),
+        f"definition of {FUNCTION_NAME}": responses["functions.get_definition"],
+        "functions.search, 10 results": responses["functions.search"],
+        "apps.get, 30 functions": responses["apps.get"],
+        "apps.search, 10 results": responses["apps.search"],
+        "execute response, 20 issues": responses["functions.execute"],
+    }
+    return {
+        name: json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+        for name, payload in payloads.items()
+    }
+
+
+def get_codecs() -> dict[str, _Codec]:
+    """Compress and decompress functions keyed by codec, br and zstd only if installed."""
+    codecs: dict[str, _Codec] = {
+        f"gzip-{level}": (
+            functools.partial(gzip.compress, compresslevel=level, mtime=0),
+            gzip.decompress,
+        )
+        for level in (1, 6, 9)
+    }
+    codecs["deflate-6"] = (functools.partial(zlib.compress, level=6), zlib.decompress)
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        for quality in (4, 11):
+            codecs[f"br-{quality}"] = (
+                functools.partial(brotli.compress, quality=quality),
+                brotli.decompress,
+            )
+    try:
+        import zstandard
+    except ImportError:
+        pass
+    else:
+        for level in (3, 19):
+            compressor = zstandard.ZstdCompressor(level=level)
+            codecs[f"zstd-{level}"] = (
+                compressor.compress,
+                zstandard.ZstdDecompressor().decompress,
+            )
+    return codecs
+
+
+def _time_us(func: Callable[[bytes], bytes], data: bytes, min_time: float) -> float:
+    iterations = 0
+    start = time.perf_counter()
+    while True:
+        func(data)
+        iterations += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / iterations * 1e6
+
+
+def bench(
+    payloads: dict[str, bytes], codecs: dict[str, _Codec], bandwidth_mbps: float, min_time: float
+) -> list[CompressionResult]:
+    results = []
+    for payload_name, data in payloads.items():
+        for codec_name, (compress, decompress) in codecs.items():
+            compressed = compress(data)
+            assert decompress(compressed) == data
+            results.append(
+                CompressionResult(
+                    payload=payload_name,
+                    codec=codec_name,
+                    original_bytes=len(data),
+                    compressed_bytes=len(compressed),
+                    compress_us=_time_us(compress, data, min_time),
+                    decompress_us=_time_us(decompress, compressed, min_time),
+                    saved_us=(len(data) - len(compressed)) * 8 / bandwidth_mbps,
+                )
+            )
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0] if __doc__ else None)
+    parser.add_argument(
+        "--bandwidth-mbps",
+        type=float,
+        default=100,
+        help="bandwidth the transfer time saved is estimated at, in megabits per second",
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="minimum time of each measurement, in seconds"
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    codecs = get_codecs()
+    print(f"codecs: {', '.join(codecs)}, bandwidth {args.bandwidth_mbps:g} Mbit/s\n")
+    print(
+        f"{'payload':<40}{'codec':>10}{'bytes':>9}{'compressed':>12}{'ratio':>7}"
+        f"{'comp us':>10}{'decomp us':>11}{'saved us':>10}{'net us':>10}"
+    )
+    results = bench(get_payloads(), codecs, args.bandwidth_mbps, args.min_time)
+    for result in results:
+        print(
+            f"{result.payload:<40}{result.codec:>10}{result.original_bytes:>9}"
+            f"{result.compressed_bytes:>12}{result.ratio:>7.2f}{result.compress_us:>10.1f}"
+            f"{result.decompress_us:>11.1f}{result.saved_us:>10.1f}{result.net_us:>10.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "bandwidth_mbps": args.bandwidth_mbps,
+                    "results": [
+                        {**asdict(result), "ratio": result.ratio, "net_us": result.net_us}
+                        for result in results
+                    ],
+                },
+                f,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""Micro-benchmarks of the schema generation and compatibility passes of `aci.libs`.
+
+For each representative function (see sample_functions), it reports the time and the peak memory
+of a conversion by `function_schema`, `generate_func_documentation`, `_detect_docstring_style` and
+`ensure_llm_compatible_json_schema`, then the cost of `MetaFunctionBase.to_json_schema` in every
+format, and how batch conversions with `to_json_schema` scale with the number of functions.
+Conversions that raise are reported with their error instead of a time.
+
+Usage:
+    uv run python -m benchmarks.bench_libs
+    uv run python -m benchmarks.bench_libs --output results.json
+    uv run python -m benchmarks.bench_libs --baseline results.json --max-regression 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import functools
+import inspect
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any, cast
+
+from pydantic import TypeAdapter
+
+from aci.libs._compatible_schema import ensure_llm_compatible_json_schema
+from aci.libs._function_schema import (
+    _detect_docstring_style,
+    function_schema,
+    generate_func_documentation,
+)
+from aci.libs._tool import to_json_schema
+from aci.meta_functions import ACIExecuteFunction, ACISearchFunctions
+from aci.types.enums import FunctionDefinitionFormat
+
+from .sample_functions import FUNCTIONS
+
+
+@dataclass
+class ConversionResult:
+    name: str
+    """The conversion and its input, e.g., "function_schema[nested]"."""
+    ops_per_sec: float | None
+    mean_us: float | None
+    peak_kib: float | None
+    """Peak of the memory allocated during a conversion, in KiB."""
+    error: str | None = None
+
+
+@dataclass
+class BatchResult:
+    functions: int
+    total_ms: float
+    per_function_us: float
+
+
+def bench(
+    name: str, convert: Callable[[Any], Any], inputs: Callable[[], Any], iterations: int
+) -> ConversionResult:
+    """Time `convert` on fresh `inputs()`, which are created before timing since some
+    conversions mutate their input."""
+    try:
+        convert(inputs())
+    except Exception as e:
+        return ConversionResult(name, None, None, None, error=type(e).__name__)
+
+    prepared = [inputs() for _ in range(iterations)]
+    start = time.perf_counter()
+    for value in prepared:
+        convert(value)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        value = inputs()
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        convert(value)
+        peak = tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+
+    return ConversionResult(
+        name,
+        ops_per_sec=iterations / elapsed,
+        mean_us=elapsed / iterations * 1e6,
+        peak_kib=peak / 1024,
+    )
+
+
+def _constant(value: Any) -> Callable[[], Any]:
+    return lambda: value
+
+
+def get_conversions(iterations: int) -> list[ConversionResult]:
+    results: list[ConversionResult] = []
+    for function_name, func in FUNCTIONS.items():
+        doc = inspect.getdoc(func)
+        # the arguments schema of the function, as generated by pydantic
+        raw_schema = TypeAdapter(cast(Any, func)).json_schema()
+        results.append(
+            bench(f"function_schema[{function_name}]", function_schema, _constant(func), iterations)
+        )
+        results.append(
+            bench(
+                f"generate_func_documentation[{function_name}]",
+                generate_func_documentation,
+                _constant(func),
+                iterations,
+            )
+        )
+        if doc:
+            results.append(
+                bench(
+                    f"_detect_docstring_style[{function_name}]",
+                    _detect_docstring_style,
+                    _constant(doc),
+                    iterations,
+                )
+            )
+        results.append(
+            bench(
+                f"ensure_llm_compatible_json_schema[{function_name}]",
+                ensure_llm_compatible_json_schema,
+                functools.partial(copy.deepcopy, raw_schema),
+                iterations,
+            )
+        )
+
+    for meta_function in (ACISearchFunctions, ACIExecuteFunction):
+        for format in FunctionDefinitionFormat:
+            results.append(
+                bench(
+                    f"{meta_function.__name__}.to_json_schema[{format.value}]",
+                    meta_function.to_json_schema,
+                    _constant(format),
+                    iterations,
+                )
+            )
+    return results
+
+
+def bench_batches(batch_sizes: Sequence[int]) -> list[BatchResult]:
+    """Convert batches of functions (cycling through the samples that convert) with
+    `to_json_schema`, as done for the tools of an agent."""
+    functions = []
+    for func in FUNCTIONS.values():
+        try:
+            to_json_schema(func, FunctionDefinitionFormat.OPENAI)
+        except Exception:
+            continue
+        functions.append(func)
+
+    results = []
+    for batch_size in batch_sizes:
+        batch = [functions[index % len(functions)] for index in range(batch_size)]
+        start = time.perf_counter()
+        for func in batch:
+            to_json_schema(func, FunctionDefinitionFormat.OPENAI)
+        elapsed = time.perf_counter() - start
+        results.append(BatchResult(batch_size, elapsed * 1000, elapsed / batch_size * 1e6))
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0] if __doc__ else None)
+    parser.add_argument("--iterations", type=int, default=200, help="conversions per benchmark")
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="batch sizes"
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="fail if the throughput of a conversion dropped by more than this fraction",
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'conversion':<60}{'ops/s':>10}{'mean us':>10}{'peak KiB':>10}")
+    results = get_conversions(args.iterations)
+    for result in results:
+        if result.error is not None:
+            print(f"{result.name:<60}{'error: ' + result.error:>30}")
+        else:
+            print(
+                f"{result.name:<60}{result.ops_per_sec:>10.0f}{result.mean_us:>10.1f}"
+                f"{result.peak_kib:>10.1f}"
+            )
+
+    print("\nto_json_schema batches")
+    print(f"{'functions':>9}{'total ms':>10}{'per function us':>17}")
+    batches = bench_batches(args.batch_sizes)
+    for batch in batches:
+        print(f"{batch.functions:>9}{batch.total_ms:>10.1f}{batch.per_function_us:>17.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "conversions": [asdict(result) for result in results],
+                    "batches": [asdict(batch) for batch in batches],
+                },
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {
+                result["name"]: result["ops_per_sec"] for result in json.load(f)["conversions"]
+            }
+        regressions = [
+            f"{result.name}: {result.ops_per_sec:.0f} ops/s, baseline {baseline[result.name]:.0f}"
+            for result in results
+            if result.ops_per_sec is not None
+            and baseline.get(result.name) is not None
+            and result.ops_per_sec < baseline[result.name] * (1 - args.max_regression)
+        ]
+        if regressions:
+            print("\nregressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""An in-process fake ACI backend serving canned payloads of realistic sizes."""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+
+BASE_URL = "https://bench.aci.dev/v1/"
+FUNCTION_NAME = "BENCH_APP__SEARCH_ISSUES"
+APP_NAME = "BENCH_APP"
+LINKED_ACCOUNT_ID = uuid.UUID(int=1)
+
+
+def _function_definition(index: int) -> dict[str, Any]:
+    """A function definition in the OpenAI format, about 2 KB of JSON."""
+    return {
+        "type": "function",
+        "function": {
+            "name": f"{APP_NAME}__FUNCTION_{index}",
+            "description": "Search the issues of a repository by a query. " * 4,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "The search query. " * 3},
+                    "state": {"type": "string", "enum": ["open", "closed", "all"]},
+                    "labels": {"type": "array", "items": {"type": "string"}},
+                    "sort": {"type": "string", "enum": ["created", "updated", "comments"]},
+                    "per_page": {"type": "integer", "minimum": 1, "maximum": 100},
+                    "filters": {
+                        "type": "object",
+                        "properties": {
+                            f"field_{field}": {"type": "string", "description": "A filter."}
+                            for field in range(10)
+                        },
+                        "required": [],
+                        "additionalProperties": False,
+                    },
+                },
+                "required": ["query"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def _function_details(index: int) -> dict[str, Any]:
+    definition = _function_definition(index)["function"]
+    return {
+        "id": str(uuid.UUID(int=index)),
+        "app_name": APP_NAME,
+        "name": definition["name"],
+        "description": definition["description"],
+        "tags": ["issues", "search"],
+        "visibility": "public",
+        "active": True,
+        "protocol": "rest",
+        "protocol_data": {"method": "GET", "path": "/search/issues", "server_url": "https://x"},
+        "parameters": definition["parameters"],
+        "response": {},
+    }
+
+
+def _linked_account(index: int) -> dict[str, Any]:
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat()
+    return {
+        "id": str(uuid.UUID(int=index)),
+        "project_id": str(uuid.UUID(int=0)),
+        "app_name": APP_NAME,
+        "linked_account_owner_id": f"owner-{index}",
+        "security_scheme": "api_key",
+        "enabled": True,
+        "created_at": now,
+        "updated_at": now,
+        "security_credentials": {},
+    }
+
+
+def _app_configuration(index: int) -> dict[str, Any]:
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat()
+    return {
+        "id": str(uuid.UUID(int=index)),
+        "project_id": str(uuid.UUID(int=0)),
+        "app_name": f"APP_{index}",
+        "security_scheme": "oauth2",
+        "enabled": True,
+        "all_functions_enabled": False,
+        "enabled_functions": [f"APP_{index}__FUNCTION_{function}" for function in range(10)],
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def build_payloads() -> dict[str, Any]:
+    functions = [_function_details(index) for index in range(30)]
+    return {
+        "functions.search": [_function_definition(index) for index in range(10)],
+        "functions.get_definition": _function_definition(0),
+        "functions.execute": {
+            "success": True,
+            "data": {
+                "items": [
+                    {"id": index, "title": f"Issue {index}", "body": "Lorem ipsum. " * 20}
+                    for index in range(20)
+                ]
+            },
+        },
+        "apps.search": [
+            {
+                "name": f"APP_{index}",
+                "description": "An app. " * 10,
+                "functions": [
+                    {"name": function["name"], "description": function["description"]}
+                    for function in functions[:5]
+                ],
+            }
+            for index in range(10)
+        ],
+        "apps.get": {
+            "id": str(uuid.UUID(int=0)),
+            "name": APP_NAME,
+            "display_name": "Bench App",
+            "provider": "ACI",
+            "version": "1.0.0",
+            "description": "An app. " * 20,
+            "logo": None,
+            "categories": ["dev-tools"],
+            "visibility": "public",
+            "active": True,
+            "security_schemes": ["api_key"],
+            "functions": functions,
+        },
+        "linked_accounts.list": [_linked_account(index) for index in range(50)],
+        "linked_account": _linked_account(1),
+        "app_configurations.list": [_app_configuration(index) for index in range(20)],
+        "app_configuration": _app_configuration(0),
+    }
+
+
+class FakeBackend(httpx.BaseTransport):
+    """In-process transport answering every endpoint used by the SDK with a canned payload.
+
+    Response bodies are encoded once up front, and the time spent answering is accumulated in
+    `server_time`, so that it can be subtracted from the time of a call to get the client-side
+    overhead.
+    """
+
+    def __init__(self) -> None:
+        self._bodies = {
+            key: json.dumps(payload).encode() for key, payload in build_payloads().items()
+        }
+        self._base_path = httpx.URL(BASE_URL).path
+        self.server_time = 0.0
+        self.requests = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        request.read()
+        key = self._route(request.method, request.url.path.removeprefix(self._base_path))
+        if key is None:
+            response = httpx.Response(404, json={"error": "Not found"})
+        else:
+            response = httpx.Response(
+                200, content=self._bodies[key], headers={"Content-Type": "application/json"}
+            )
+        self.requests += 1
+        self.server_time += time.perf_counter() - start
+        return response
+
+    def reset(self) -> None:
+        self.server_time = 0.0
+        self.requests = 0
+
+    @staticmethod
+    def _route(method: str, path: str) -> str | None:
+        segments = path.strip("/").split("/")
+        resource = segments[0]
+        if resource == "functions":
+            if segments[1:] == ["search"]:
+                return "functions.search"
+            if segments[2:] == ["definition"]:
+                return "functions.get_definition"
+            if segments[2:] == ["execute"]:
+                return "functions.execute"
+        elif resource == "apps":
+            return "apps.search" if segments[1:] == ["search"] else "apps.get"
+        elif resource == "linked-accounts":
+            if len(segments) == 1 and method == "GET":
+                return "linked_accounts.list"
+            return "linked_account"
+        elif resource == "app-configurations":
+            if len(segments) == 1 and method == "GET":
+                return "app_configurations.list"
+            return "app_configuration"
+        return None
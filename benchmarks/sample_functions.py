@@ -0,0 +1,184 @@
+"""Representative functions converted to tool schemas by the `aci.libs` benchmarks."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Literal
+
+from pydantic import BaseModel, Field
+
+_FILLER = (
+    "The result is cached for a few minutes, and requests exceeding the rate limit of the "
+    "upstream API are retried with an exponential backoff before an error is returned. "
+)
+
+
+def simple(query: str, limit: int = 10) -> list[str]:
+    """Search the web.
+
+    Args:
+        query: The search query.
+        limit: The maximum number of results.
+    """
+    return []
+
+
+def no_docstring(query: str, limit: int = 10, verbose: bool = False) -> list[str]:
+    return []
+
+
+class Priority(str, Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+
+class Assignee(BaseModel):
+    login: str = Field(description="The login of the user.")
+    email: str | None = Field(default=None, description="The email of the user.")
+
+
+class Label(BaseModel):
+    name: str = Field(min_length=1, max_length=50)
+    color: str = Field(pattern=r"^[0-9a-f]{6}$", description="Hex color without the '#'.")
+
+
+class Issue(BaseModel):
+    title: str = Field(description="The title of the issue.")
+    body: str | None = Field(default=None, description="The markdown body of the issue.")
+    priority: Priority = Priority.MEDIUM
+    assignees: list[Assignee] = Field(default_factory=list)
+    labels: list[Label] = Field(default_factory=list)
+    due: datetime | None = None
+    metadata: dict[str, str] = Field(default_factory=dict)
+
+
+def pydantic_heavy(
+    repository: str,
+    issue: Issue,
+    notify: list[Assignee] | None = None,
+    mode: Literal["create", "upsert"] = "create",
+    extra: dict[str, Any] | None = None,
+) -> dict:
+    """Create an issue in a repository.
+
+    Args:
+        repository: The repository, e.g., "octocat/hello-world".
+        issue: The issue to create.
+        notify: Users to notify about the new issue.
+        mode: Whether to update an existing issue with the same title.
+        extra: Additional fields passed to the API as is.
+    """
+    return {}
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    country: str = Field(description="ISO 3166-1 alpha-2 country code.")
+
+
+class Company(BaseModel):
+    name: str
+    address: Address
+    billing_address: Address | None = None
+
+
+class Contact(BaseModel):
+    name: str
+    company: Company
+    previous_companies: list[Company] = Field(default_factory=list)
+
+
+class Team(BaseModel):
+    name: str
+    lead: Contact
+    members: list[Contact]
+
+
+def nested(team: Team, dry_run: bool = False) -> None:
+    """Sync a team and its members to the CRM.
+
+    Args:
+        team: The team to sync.
+        dry_run: Whether to only report the changes.
+    """
+
+
+def long_google(query: str, repository: str, state: str, labels: list[str], page: int) -> None:
+    pass
+
+
+def long_numpy(query: str, repository: str, state: str, labels: list[str], page: int) -> None:
+    pass
+
+
+def long_sphinx(query: str, repository: str, state: str, labels: list[str], page: int) -> None:
+    pass
+
+
+# the long docstrings are set after the definitions to build them from the filler
+long_google.__doc__ = f"""Search the issues of a repository.
+
+{_FILLER * 20}
+
+Args:
+    query: The search query. {_FILLER * 3}
+    repository: The repository, e.g., "octocat/hello-world". {_FILLER * 3}
+    state: The state of the issues, "open", "closed" or "all". {_FILLER * 3}
+    labels: Only issues with all of these labels. {_FILLER * 3}
+    page: The page of the results, starting at 1. {_FILLER * 3}
+
+Returns:
+    The matching issues.
+
+Raises:
+    ValueError: If the repository does not exist.
+"""
+
+long_numpy.__doc__ = f"""Search the issues of a repository.
+
+{_FILLER * 20}
+
+Parameters
+----------
+query : str
+    The search query. {_FILLER * 3}
+repository : str
+    The repository, e.g., "octocat/hello-world". {_FILLER * 3}
+state : str
+    The state of the issues, "open", "closed" or "all". {_FILLER * 3}
+labels : list[str]
+    Only issues with all of these labels. {_FILLER * 3}
+page : int
+    The page of the results, starting at 1. {_FILLER * 3}
+
+Returns
+-------
+list
+    The matching issues.
+"""
+
+long_sphinx.__doc__ = f"""Search the issues of a repository.
+
+{_FILLER * 20}
+
+:param query: The search query. {_FILLER * 3}
+:param repository: The repository, e.g., "octocat/hello-world". {_FILLER * 3}
+:param state: The state of the issues, "open", "closed" or "all". {_FILLER * 3}
+:param labels: Only issues with all of these labels. {_FILLER * 3}
+:param page: The page of the results, starting at 1. {_FILLER * 3}
+:return: The matching issues.
+:rtype: list
+"""
+
+FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "simple": simple,
+    "no_docstring": no_docstring,
+    "pydantic_heavy": pydantic_heavy,
+    "nested": nested,
+    "long_google": long_google,
+    "long_numpy": long_numpy,
+    "long_sphinx": long_sphinx,
+}
@@ -0,0 +1,38 @@
+import pytest
+
+from aci import RetryPolicy
+from aci.bench import LoadConfig, run_load
+from aci.simulator import FaultConfig, SimulatorConfig, SimulatorServer
+
+from .utils import MOCK_API_KEY
+
+
+def test_run_load_against_simulator() -> None:
+    config = SimulatorConfig(faults=FaultConfig(error_rate=0.2, error_statuses=(503,)), seed=0)
+    with SimulatorServer(config) as server:
+        report = run_load(
+            LoadConfig(workers=4, calls=200, seed=0),
+            api_key=MOCK_API_KEY,
+            base_url=server.base_url,
+            retry_policy=RetryPolicy(max_attempts=2, min_wait=0, max_wait=0, multiplier=0),
+            retry_budget=None,
+        )
+        stats = server.simulator.stats()
+
+    assert report.calls == 200
+    assert set(report.operations) == {"search", "get_definition", "execute", "handle_function_call"}
+    assert report.requests == sum(stats.requests.values())
+    assert report.retries > 0
+    assert 0 < report.error_rate < 0.2
+    assert 0 < report.connections <= 4
+    assert report.connection_reuse > 0.9
+    search = report.operations["search"]
+    assert 0 < search.latency_percentiles["p50"] <= search.latency_percentiles["max"]
+    assert "connection reuse" in report.format()
+
+
+def test_load_config_validation() -> None:
+    with pytest.raises(ValueError):
+        LoadConfig(mix={"unknown": 1})
+    with pytest.raises(ValueError):
+        LoadConfig(mix={"search": 0})
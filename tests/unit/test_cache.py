@@ -0,0 +1,209 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from aci import ACI, CacheConfig, InMemoryLRUCache, RedisCache, SQLiteCache
+from aci._cache import CacheBackend, ResponseCache
+from aci.simulator import SimulatorTransport
+from aci.types.enums import SecurityScheme
+
+from .utils import MOCK_API_KEY, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+MOCK_FUNCTION_NAME = "APP_00__FUNCTION_00"
+
+
+class FakeRedis:
+    """The subset of the redis-py client used by RedisCache."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, tuple[bytes, float | None]] = {}
+
+    def get(self, key: str) -> bytes | None:
+        value, expires = self.values.get(key, (None, None))
+        return None if expires is not None and expires <= time.monotonic() else value
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, px: int | None = None) -> None:
+        self.values[key] = (value, None if px is None else time.monotonic() + px / 1000)
+
+    def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request: pytest.FixtureRequest, tmp_path: Path) -> CacheBackend:
+    if request.param == "memory":
+        return InMemoryLRUCache()
+    if request.param == "sqlite":
+        return SQLiteCache(tmp_path / "cache.db")
+    return RedisCache(FakeRedis(), prefix="test:")
+
+
+def test_backend(backend: CacheBackend) -> None:
+    backend.set("a", b"1", ttl=60)
+    backend.set("b", b"2", ttl=0.05)
+    backend.set("c", b"3")
+    assert backend.get("a") == b"1"
+    assert backend.get_many(["a", "b", "missing", "c"]) == [b"1", b"2", None, b"3"]
+
+    time.sleep(0.06)
+    assert backend.get("b") is None
+    backend.delete("a")
+    assert backend.get("a") is None
+
+    if backend.supports_compare_and_set:
+        assert backend.compare_and_set("d", None, b"1")
+        assert not backend.compare_and_set("d", b"0", b"2")
+        assert backend.compare_and_set("d", b"1", b"2")
+        assert backend.get("d") == b"2"
+    else:
+        with pytest.raises(NotImplementedError):
+            backend.compare_and_set("d", None, b"1")
+
+
+def test_in_memory_lru_eviction() -> None:
+    backend = InMemoryLRUCache(max_entries=2)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    backend.get("a")
+    backend.set("c", b"3")
+    assert backend.get_many(["a", "b", "c"]) == [b"1", None, b"3"]
+
+
+def test_sqlite_is_shared_across_connections(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    SQLiteCache(path).set("a", b"1", ttl=60)
+    cache = SQLiteCache(path)
+    values: list[bytes | None] = []
+    thread = threading.Thread(target=lambda: values.append(cache.get("a")))
+    thread.start()
+    thread.join()
+    assert values == [b"1"]
+
+
+def test_client_caches_reads(backend: CacheBackend) -> None:
+    transport = SimulatorTransport()
+    cache = CacheConfig(backend=backend, compress_min_bytes=100)
+    with ACI(api_key=MOCK_API_KEY, transport=transport, cache=cache) as client:
+        definitions = [client.functions.get_definition(MOCK_FUNCTION_NAME) for _ in range(3)]
+        apps = [client.apps.get("APP_00") for _ in range(2)]
+        searches = [client.functions.search(app_names=["APP_01"], limit=2) for _ in range(2)]
+        client.functions.search(app_names=["APP_02"], limit=2)
+        for _ in range(2):
+            client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+
+    assert definitions[0] == definitions[2]
+    assert apps[0] == apps[1]
+    assert searches[0] == searches[1]
+    assert transport.simulator.stats().requests == {
+        "GET functions/{function_name}/definition": 1,
+        "GET apps/{app_name}": 1,
+        "GET functions/search": 2,
+        "POST functions/{function_name}/execute": 2,
+    }
+
+
+def test_mutations_invalidate_cached_reads_of_other_clients(tmp_path: Path) -> None:
+    def cache_config(path: Path) -> CacheConfig:
+        return CacheConfig(backend=SQLiteCache(path), cache_linked_accounts=True)
+
+    transport = SimulatorTransport()
+    path = tmp_path / "cache.db"
+    with (
+        ACI(api_key=MOCK_API_KEY, transport=transport, cache=cache_config(path)) as reader,
+        ACI(api_key=MOCK_API_KEY, transport=transport, cache=cache_config(path)) as writer,
+        ACI(api_key="another-key", transport=transport, cache=cache_config(path)) as other,
+    ):
+        assert reader.linked_accounts.list() == []
+        assert reader.linked_accounts.list() == []
+        assert other.linked_accounts.list() == []
+        writer.linked_accounts.link("APP_00", SecurityScheme.NO_AUTH, MOCK_LINKED_ACCOUNT_OWNER_ID)
+        assert len(reader.linked_accounts.list()) == 1
+        reader.functions.search(allowed_only=True)
+        writer.app_configurations.create("APP_00", SecurityScheme.NO_AUTH)
+        reader.functions.search(allowed_only=True)
+
+    requests = transport.simulator.stats().requests
+    assert requests["GET linked-accounts"] == 3
+    assert requests["GET functions/search"] == 2
+
+
+def test_reads_sent_before_an_invalidation_are_not_cached(backend: CacheBackend) -> None:
+    cache = ResponseCache(CacheConfig(backend=backend))
+    endpoint = "GET app-configurations"
+    key = cache.key("namespace", endpoint, "app-configurations")
+    assert key is not None
+
+    # the app configuration is created while the list is read
+    cache.invalidate("namespace", "POST app-configurations")
+    cache.set(endpoint, key, b"[]")
+
+    new_key = cache.key("namespace", endpoint, "app-configurations")
+    assert new_key is not None
+    assert cache.get(new_key) is None
+
+
+def test_missing_generation_does_not_resurrect_stale_entries() -> None:
+    backend = InMemoryLRUCache()
+    cache = ResponseCache(CacheConfig(backend=backend))
+    endpoint = "GET app-configurations"
+    key = cache.key("namespace", endpoint, "app-configurations")
+    assert key is not None
+    cache.set(endpoint, key, b"[]")
+
+    # e.g., evicted by the LRU
+    backend.delete("aci:namespace:app-configurations:generation")
+
+    new_key = cache.key("namespace", endpoint, "app-configurations")
+    assert new_key is not None
+    assert new_key != key
+    assert cache.get(new_key) is None
+
+
+def test_linked_accounts_are_not_cached_by_default() -> None:
+    backend = InMemoryLRUCache()
+    transport = SimulatorTransport()
+    with ACI(api_key=MOCK_API_KEY, transport=transport, cache=CacheConfig(backend)) as client:
+        client.linked_accounts.link("APP_00", SecurityScheme.NO_AUTH, MOCK_LINKED_ACCOUNT_OWNER_ID)
+        for _ in range(2):
+            client.linked_accounts.list()
+
+    assert ResponseCache(CacheConfig()).key("namespace", "GET linked-accounts", "x") is None
+    assert transport.simulator.stats().requests["GET linked-accounts"] == 2
+    # only the generation of the group, replaced by the link, is stored
+    assert [key for key in backend._entries if ":linked-accounts:" in key] == [
+        key for key in backend._entries if key.endswith(":linked-accounts:generation")
+    ]
+    with pytest.raises(ValueError):
+        CacheConfig(ttls={"GET linked-accounts": 30})
+
+
+def test_corrupt_values_are_cache_misses() -> None:
+    backend = InMemoryLRUCache()
+    cache = ResponseCache(CacheConfig(backend=backend))
+    key = cache.key("namespace", "GET apps/{app_name}", "apps/APP_00")
+    assert key is not None
+
+    backend.set(key, b"z-not-zlib")
+
+    assert cache.get(key) is None
+
+
+def test_unavailable_backend_does_not_fail_calls() -> None:
+    class BrokenBackend(CacheBackend):
+        def get(self, key: str) -> bytes | None:
+            raise ConnectionError("unavailable")
+
+        def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+            raise ConnectionError("unavailable")
+
+    cache = CacheConfig(backend=BrokenBackend())
+    with ACI(api_key=MOCK_API_KEY, transport=SimulatorTransport(), cache=cache) as client:
+        assert client.apps.get("APP_00").name == "APP_00"
@@ -0,0 +1,94 @@
+import gzip
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from aci import ACI, CassetteConfig, RetryPolicy
+from aci._cassette import CASSETTE_VERSION
+from aci._exceptions import CassetteMissError
+from aci.simulator import FaultConfig, LatencyDistribution, SimulatorConfig, SimulatorTransport
+
+from .utils import MOCK_API_KEY, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+MOCK_FUNCTION_NAME = "APP_00__FUNCTION_00"
+
+
+def _calls(client: ACI) -> list:
+    return [
+        client.functions.search(limit=3),
+        client.functions.get_definition(MOCK_FUNCTION_NAME),
+        client.functions.execute(MOCK_FUNCTION_NAME, {"query": "x"}, MOCK_LINKED_ACCOUNT_OWNER_ID),
+        client.apps.get("APP_01").name,
+    ]
+
+
+def test_record_and_replay(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.jsonl.gz"
+    simulator = SimulatorTransport(
+        SimulatorConfig(faults=FaultConfig(latency=LatencyDistribution("constant", mean=0.05)))
+    )
+    with ACI(
+        api_key=MOCK_API_KEY,
+        transport=simulator,
+        cassette=CassetteConfig(path, mode="record"),
+    ) as client:
+        recorded = _calls(client)
+
+    content = gzip.decompress(path.read_bytes()).decode()
+    assert MOCK_API_KEY not in content
+    assert len(content.splitlines()) == 5
+
+    with ACI(api_key="another-key", cassette=CassetteConfig(path, speed=None)) as client:
+        start = time.perf_counter()
+        replayed = _calls(client)
+        assert time.perf_counter() - start < 0.1
+        with pytest.raises(CassetteMissError):
+            client.functions.get_definition("APP_00__FUNCTION_01")
+
+    with ACI(api_key=MOCK_API_KEY, cassette=CassetteConfig(path, speed=5)) as client:
+        start = time.perf_counter()
+        _calls(client)
+        assert time.perf_counter() - start >= 4 * 0.05 / 5
+
+    assert replayed == recorded
+
+
+def test_replay_opens_no_connection_pool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "cassette.jsonl"
+    path.write_text(f'{{"version": {CASSETTE_VERSION}}}\n')
+
+    def http_transport() -> httpx.HTTPTransport:
+        raise AssertionError("replaying created an HTTP transport")
+
+    monkeypatch.setattr(httpx, "HTTPTransport", http_transport)
+    with ACI(api_key=MOCK_API_KEY, cassette=CassetteConfig(path)) as client:
+        with pytest.raises(CassetteMissError):
+            client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+
+def test_replay_repeats_identical_requests_in_order(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    simulator = SimulatorTransport(
+        SimulatorConfig(faults=FaultConfig(error_rate=0.5, error_statuses=(503,)), seed=3)
+    )
+    retry_policy = RetryPolicy(max_attempts=10, min_wait=0, max_wait=0, multiplier=0)
+    with ACI(
+        api_key=MOCK_API_KEY,
+        transport=simulator,
+        cassette=CassetteConfig(path, mode="record"),
+        retry_policy=retry_policy,
+        retry_budget=None,
+    ) as client:
+        client.functions.get_definition(MOCK_FUNCTION_NAME)
+    requests = simulator.simulator.stats().requests["GET functions/{function_name}/definition"]
+    assert requests > 1
+
+    replay = CassetteConfig(path, speed=None)
+    with ACI(
+        api_key=MOCK_API_KEY, cassette=replay, retry_policy=retry_policy, retry_budget=None
+    ) as client:
+        client.functions.get_definition(MOCK_FUNCTION_NAME)
+        # every recorded response is replayed, then the last (successful) one is repeated
+        client.functions.get_definition(MOCK_FUNCTION_NAME)
@@ -0,0 +1,222 @@
+import time
+from typing import Generator
+
+import httpx
+import pytest
+import respx
+
+from aci import ACI, CircuitBreakerConfig, CircuitState, deadline
+from aci._circuit_breaker import CircuitBreaker
+from aci._exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    NotFoundError,
+    ServerError,
+)
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+MOCK_FUNCTION_NAME = "TEST_APP__TEST_FUNCTION"
+MOCK_OTHER_FUNCTION_NAME = "TEST_APP__OTHER_FUNCTION"
+
+
+@pytest.fixture
+def breaker_client() -> Generator[ACI, None, None]:
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        circuit_breaker=CircuitBreakerConfig(failure_threshold=1, recovery_timeout=60),
+        idempotency_key_support=True,
+    ) as client:
+        yield client
+
+
+def test_circuit_opens_after_consecutive_failures() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=2))
+
+    breaker.record_failure(MOCK_FUNCTION_NAME)
+    assert breaker.state(MOCK_FUNCTION_NAME) == CircuitState.CLOSED
+    breaker.record_failure(MOCK_FUNCTION_NAME)
+    assert breaker.state(MOCK_FUNCTION_NAME) == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call(MOCK_FUNCTION_NAME)
+    assert exc_info.value.circuit_name == MOCK_FUNCTION_NAME
+    assert exc_info.value.retry_after > 0
+
+    # other functions of the same app are not affected until the app circuit opens
+    breaker.before_call(MOCK_OTHER_FUNCTION_NAME)
+
+
+def test_success_resets_consecutive_failures() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=2))
+
+    breaker.record_failure(MOCK_FUNCTION_NAME)
+    breaker.record_success(MOCK_FUNCTION_NAME)
+    breaker.record_failure(MOCK_FUNCTION_NAME)
+
+    assert breaker.state(MOCK_FUNCTION_NAME) == CircuitState.CLOSED
+
+
+def test_app_circuit_opens_across_functions() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=10, app_failure_threshold=2))
+
+    breaker.record_failure(MOCK_FUNCTION_NAME)
+    breaker.record_failure(MOCK_OTHER_FUNCTION_NAME)
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call("TEST_APP__THIRD_FUNCTION")
+    assert exc_info.value.circuit_name == "TEST_APP"
+    breaker.before_call("OTHER_APP__TEST_FUNCTION")
+
+    stats = breaker.stats()
+    assert stats.apps["TEST_APP"].state == CircuitState.OPEN
+    assert stats.apps["TEST_APP"].total_rejected == 1
+    assert stats.functions[MOCK_FUNCTION_NAME].state == CircuitState.CLOSED
+
+
+def test_half_open_allows_limited_trial_calls() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=1, recovery_timeout=0.01))
+
+    breaker.record_failure(MOCK_FUNCTION_NAME)
+    time.sleep(0.02)
+    assert breaker.state(MOCK_FUNCTION_NAME) == CircuitState.HALF_OPEN
+
+    breaker.before_call(MOCK_FUNCTION_NAME)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call(MOCK_FUNCTION_NAME)
+
+    breaker.record_success(MOCK_FUNCTION_NAME)
+    assert breaker.state(MOCK_FUNCTION_NAME) == CircuitState.CLOSED
+
+
+def test_half_open_failure_reopens_circuit() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=1, recovery_timeout=0.01))
+
+    breaker.record_failure(MOCK_FUNCTION_NAME)
+    time.sleep(0.02)
+    breaker.before_call(MOCK_FUNCTION_NAME)
+    breaker.record_failure(MOCK_FUNCTION_NAME)
+
+    assert breaker.state(MOCK_FUNCTION_NAME) == CircuitState.OPEN
+
+
+def test_neutral_exceptions_release_half_open_slots() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=2, recovery_timeout=0.01))
+
+    breaker.record_failure(MOCK_FUNCTION_NAME)
+    breaker.record_exception(MOCK_FUNCTION_NAME, DeadlineExceededError("deadline exceeded"))
+    breaker.record_failure(MOCK_FUNCTION_NAME)
+    assert breaker.state(MOCK_FUNCTION_NAME) == CircuitState.OPEN, "not reset by a neutral error"
+
+    time.sleep(0.02)
+    breaker.before_call(MOCK_FUNCTION_NAME)
+    breaker.record_exception(MOCK_FUNCTION_NAME, DeadlineExceededError("deadline exceeded"))
+    assert breaker.state(MOCK_FUNCTION_NAME) == CircuitState.HALF_OPEN
+    # the trial slot was released
+    breaker.before_call(MOCK_FUNCTION_NAME)
+
+
+@respx.mock
+def test_execute_fails_fast_when_circuit_is_open(breaker_client: ACI) -> None:
+    route = respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(
+        return_value=httpx.Response(500, json={"message": "Internal server error"})
+    )
+
+    # the first attempt fails and opens the circuit, the retry fails fast
+    with pytest.raises(CircuitOpenError):
+        breaker_client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+    assert route.call_count == 1
+
+    with pytest.raises(CircuitOpenError):
+        breaker_client.handle_function_call(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+    assert route.call_count == 1, "should not call the backend while the circuit is open"
+
+    assert breaker_client.circuit_breaker is not None
+    stats = breaker_client.circuit_breaker.stats()
+    assert stats.functions[MOCK_FUNCTION_NAME].total_failures == 1
+    assert stats.functions[MOCK_FUNCTION_NAME].total_rejected == 2
+
+
+@respx.mock
+def test_execute_client_errors_do_not_open_circuit(breaker_client: ACI) -> None:
+    route = respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(
+        return_value=httpx.Response(404, json={"message": "Function not found"})
+    )
+
+    for _ in range(2):
+        with pytest.raises(NotFoundError):
+            breaker_client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+
+    assert route.call_count == 2
+    assert breaker_client.circuit_breaker is not None
+    assert breaker_client.circuit_breaker.state(MOCK_FUNCTION_NAME) == CircuitState.CLOSED
+
+
+@respx.mock
+def test_execute_without_circuit_breaker() -> None:
+    client = ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL, idempotency_key_support=True)
+    assert client.circuit_breaker is None
+
+    route = respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(
+        side_effect=[
+            httpx.Response(500, json={"message": "Internal server error"}),
+            httpx.Response(200, json={"success": True, "data": "string"}),
+        ]
+    )
+
+    result = client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+    assert result.success
+    assert route.call_count == 2, "should retry"
+
+
+def test_server_error_counts_as_failure() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=1))
+
+    breaker.record_exception(MOCK_FUNCTION_NAME, NotFoundError("not found"))
+    assert breaker.state(MOCK_FUNCTION_NAME) == CircuitState.CLOSED
+    breaker.record_exception(MOCK_FUNCTION_NAME, ServerError("server error"))
+    assert breaker.state(MOCK_FUNCTION_NAME) == CircuitState.OPEN
+
+
+def _half_open_client() -> ACI:
+    client = ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        circuit_breaker=CircuitBreakerConfig(failure_threshold=1, recovery_timeout=0.01),
+    )
+    assert client.circuit_breaker is not None
+    client.circuit_breaker.record_failure(MOCK_FUNCTION_NAME)
+    time.sleep(0.02)
+    return client
+
+
+@respx.mock
+def test_execute_past_its_deadline_does_not_close_half_open_circuit() -> None:
+    client = _half_open_client()
+    route = respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute")
+
+    with pytest.raises(DeadlineExceededError), deadline(0):
+        client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+
+    assert route.call_count == 0
+    assert client.circuit_breaker is not None
+    assert client.circuit_breaker.state(MOCK_FUNCTION_NAME) == CircuitState.HALF_OPEN
+    assert client.circuit_breaker.stats().functions[MOCK_FUNCTION_NAME].total_successes == 0
+
+
+@respx.mock
+def test_interrupted_execute_releases_half_open_slot() -> None:
+    client = _half_open_client()
+
+    def interrupt(request: httpx.Request) -> httpx.Response:
+        raise KeyboardInterrupt
+
+    respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(side_effect=interrupt)
+
+    with pytest.raises(KeyboardInterrupt):
+        client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+
+    assert client.circuit_breaker is not None
+    assert client.circuit_breaker.state(MOCK_FUNCTION_NAME) == CircuitState.HALF_OPEN
+    client.circuit_breaker.before_call(MOCK_FUNCTION_NAME)
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 
 import httpx
 import pytest
@@ -6,6 +7,7 @@ import pytest
 from aci import ACI
 from aci._constants import DEFAULT_SERVER_URL
 from aci._exceptions import APIKeyNotFound
+from aci.simulator import SimulatorServer
 
 from .utils import MOCK_API_KEY, MOCK_BASE_URL
 
@@ -29,3 +31,39 @@ def test_client_initialization_without_api_key() -> None:
 def test_client_initialization_without_base_url() -> None:
     client = ACI(api_key=MOCK_API_KEY, base_url=None)
     assert client.base_url == httpx.URL(DEFAULT_SERVER_URL)
+
+
+def test_client_with_transport() -> None:
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"name": "x"}))
+    client = ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL, transport=transport)
+    assert client.functions.get_definition("TEST_APP__TEST_FUNCTION") == {"name": "x"}
+
+
+def test_client_with_shared_http_client() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"name": "x"})
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as http_client:
+        for api_key in ("key-1", "key-2"):
+            with ACI(api_key=api_key, base_url=MOCK_BASE_URL, http_client=http_client) as client:
+                client.functions.get_definition("TEST_APP__TEST_FUNCTION")
+        assert not http_client.is_closed
+
+    assert [request.headers["x-api-key"] for request in requests] == ["key-1", "key-2"]
+    assert str(requests[0].url).startswith(f"{MOCK_BASE_URL}functions/TEST_APP__TEST_FUNCTION/")
+    assert "x-api-key" not in http_client.headers
+
+    with pytest.raises(ValueError):
+        ACI(api_key=MOCK_API_KEY, http_client=http_client, uds="/tmp/aci.sock")
+
+
+def test_client_over_unix_domain_socket(tmp_path: Path) -> None:
+    uds = str(tmp_path / "aci.sock")
+    with SimulatorServer(uds=uds) as server:
+        with ACI(api_key=MOCK_API_KEY, base_url=server.base_url, uds=uds) as client:
+            definition = client.functions.get_definition("APP_00__FUNCTION_00")
+
+    assert definition["function"]["name"] == "APP_00__FUNCTION_00"
@@ -0,0 +1,125 @@
+from aci import to_json_schema
+from aci.libs._compact_schema import (
+    CompactionLevel,
+    compact_json_schema,
+    compact_tools,
+    estimate_tokens,
+)
+from aci.libs._function_definition import parse_function_definition
+from aci.types.enums import FunctionDefinitionFormat
+
+ADDRESS_SCHEMA = {
+    "type": "object",
+    "title": "Address",
+    "properties": {
+        "street": {"type": "string", "title": "Street", "description": "The street."},
+        "city": {"type": "string", "title": "City", "description": "The city."},
+    },
+    "required": ["street", "city"],
+}
+
+PARAMETERS = {
+    "type": "object",
+    "title": "send_parcel_args",
+    "properties": {
+        "title": {"type": "string", "title": "Title", "description": "A property named title."},
+        "note": {
+            "anyOf": [{"type": "string"}],
+            "title": "Note",
+            "default": None,
+            "description": "An optional note. " * 40,
+            "examples": ["fragile"],
+        },
+        "sender": ADDRESS_SCHEMA,
+        "recipient": ADDRESS_SCHEMA,
+    },
+    "required": ["title", "sender", "recipient"],
+}
+
+TOOL = {
+    "type": "function",
+    "function": {
+        "name": "SHIPPING__SEND_PARCEL",
+        "description": "Send a parcel. " * 100,
+        "parameters": PARAMETERS,
+    },
+}
+
+
+def test_compact_json_schema_strip() -> None:
+    schema = compact_json_schema(PARAMETERS, CompactionLevel.STRIP)
+
+    assert "title" not in schema
+    assert "title" in schema["properties"], "property names must not be stripped"
+    assert "title" not in schema["properties"]["title"]
+    assert schema["properties"]["note"]["type"] == "string", "single anyOf should be collapsed"
+    assert "anyOf" not in schema["properties"]["note"]
+    assert "default" not in schema["properties"]["note"]
+    assert "title" not in schema["properties"]["sender"]["properties"]["street"]
+    assert "title" in PARAMETERS, "the input schema must not be modified"
+
+
+def test_compact_json_schema_dedupe() -> None:
+    schema = compact_json_schema(PARAMETERS, CompactionLevel.DEDUPE)
+
+    assert schema["properties"]["sender"] == schema["properties"]["recipient"]
+    ref = schema["properties"]["sender"]["$ref"]
+    definition = schema["$defs"][ref.removeprefix("#/$defs/")]
+    assert definition["properties"]["city"] == {"type": "string", "description": "The city."}
+
+
+def test_compact_json_schema_truncate_and_minimal() -> None:
+    truncated = compact_json_schema(PARAMETERS, CompactionLevel.TRUNCATE, max_description_length=20)
+    note = truncated["properties"]["note"]
+    assert len(note["description"]) == 20
+    assert note["description"].endswith("...")
+    assert "examples" not in note
+
+    minimal = compact_json_schema(PARAMETERS, CompactionLevel.MINIMAL)
+    assert "description" not in minimal["properties"]["note"]
+
+
+def test_compact_tools_keeps_format() -> None:
+    (compacted,) = compact_tools([TOOL], CompactionLevel.TRUNCATE, max_tool_description_length=50)
+
+    definition = parse_function_definition(compacted)
+    assert compacted["type"] == "function"
+    assert definition.name == "SHIPPING__SEND_PARCEL"
+    assert len(definition.description) == 50
+
+
+def test_compact_tools_escalates_to_fit_budget() -> None:
+    original_tokens = estimate_tokens([TOOL])
+    strip_tokens = estimate_tokens(compact_tools([TOOL], CompactionLevel.STRIP))
+    budget = strip_tokens - 1
+
+    compacted = compact_tools([TOOL], max_tokens=budget)
+
+    assert strip_tokens < original_tokens
+    assert estimate_tokens(compacted) <= budget
+
+
+def test_compact_tools_returns_most_compact_when_budget_is_too_small() -> None:
+    compacted = compact_tools([TOOL], max_tokens=1)
+
+    assert compacted == compact_tools([TOOL], CompactionLevel.MINIMAL)
+
+
+def test_compact_locally_generated_tool() -> None:
+    def greet(name: str, greeting: str | None = None) -> str:
+        """Greet someone.
+
+        Args:
+            name: The name of the person to greet.
+            greeting: The greeting to use.
+        """
+        return f"{greeting or 'Hello'}, {name}"
+
+    tool = to_json_schema(greet, FunctionDefinitionFormat.ANTHROPIC)
+    (compacted,) = compact_tools([tool])
+
+    assert compacted["input_schema"]["properties"]["name"] == {
+        "type": "string",
+        "description": "The name of the person to greet.",
+    }
+    assert estimate_tokens(compacted) < estimate_tokens(tool)
@@ -0,0 +1,86 @@
+import gzip
+import json
+
+import httpx
+import pytest
+
+from aci import ACI, CompressionConfig
+from aci._compression import ACCEPT_ENCODING
+from aci.simulator import SimulatorConfig, SimulatorTransport
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL
+
+FUNCTION_NAME = "TEST_APP__TEST_FUNCTION"
+EXECUTE_RESPONSE = {"success": True, "data": {}}
+
+
+def _client(requests: list[httpx.Request], **kwargs: object) -> ACI:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=EXECUTE_RESPONSE)
+
+    return ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        transport=httpx.MockTransport(handler),
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def test_accept_encoding_advertises_supported_decoders() -> None:
+    requests: list[httpx.Request] = []
+    client = _client(requests)
+    client.functions.get_definition(FUNCTION_NAME)
+
+    assert requests[0].headers["Accept-Encoding"] == ACCEPT_ENCODING
+    assert {"gzip", "deflate"} <= set(ACCEPT_ENCODING.split(", "))
+
+
+def test_request_bodies_are_not_compressed_by_default() -> None:
+    requests: list[httpx.Request] = []
+    client = _client(requests)
+    client.functions.execute(FUNCTION_NAME, {"document": "x" * 100_000}, "owner")
+
+    assert "Content-Encoding" not in requests[0].headers
+    assert json.loads(requests[0].content)["function_input"]["document"] == "x" * 100_000
+
+
+def test_large_request_bodies_are_compressed() -> None:
+    requests: list[httpx.Request] = []
+    client = _client(requests, compression=CompressionConfig(min_bytes=1024))
+    function_input = {"document": "Lorem ipsum dolor sit amet. " * 1000}
+    client.functions.execute(FUNCTION_NAME, function_input, "owner")
+
+    request = requests[0]
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert request.headers["Content-Type"] == "application/json"
+    assert int(request.headers["Content-Length"]) == len(request.content) < 1024
+    body = json.loads(gzip.decompress(request.content))
+    assert body["function_input"] == function_input
+    assert body["linked_account_owner_id"] == "owner"
+
+
+def test_small_request_bodies_are_sent_as_is() -> None:
+    requests: list[httpx.Request] = []
+    client = _client(requests, compression=CompressionConfig(min_bytes=1024))
+    client.functions.execute(FUNCTION_NAME, {"query": "weather"}, "owner")
+
+    assert "Content-Encoding" not in requests[0].headers
+    assert json.loads(requests[0].content)["function_input"] == {"query": "weather"}
+
+
+def test_compressed_request_bodies_are_decoded_by_the_simulator() -> None:
+    client = ACI(
+        api_key=MOCK_API_KEY,
+        transport=SimulatorTransport(SimulatorConfig(apps=1, functions_per_app=1)),
+        compression=CompressionConfig(min_bytes=0),
+    )
+    result = client.functions.execute("APP_00__FUNCTION_00", {"query": "x" * 10_000}, "owner")
+
+    assert result.success
+
+
+@pytest.mark.parametrize("kwargs", [{"min_bytes": -1}, {"level": 0}, {"level": 10}])
+def test_invalid_compression_config(kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        CompressionConfig(**kwargs)
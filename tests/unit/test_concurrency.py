@@ -0,0 +1,202 @@
+import threading
+import time
+
+import httpx
+import pytest
+import respx
+
+from aci import ACI, ConcurrencyLimitConfig
+from aci._concurrency import AdaptiveConcurrencyLimiter, RequestOutcome
+from aci._exceptions import DeadlineExceededError, NotFoundError, ServerError
+from aci._retry import RetryPolicy, deadline
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL
+
+MOCK_FUNCTION_NAME = "TEST_APP__TEST_FUNCTION"
+MOCK_DEFINITION_URL = f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/definition"
+
+
+def test_limit_grows_additively_on_success() -> None:
+    # latencies of microseconds would make any scheduling hiccup a latency spike
+    limiter = AdaptiveConcurrencyLimiter(
+        ConcurrencyLimitConfig(initial_limit=2, max_limit=4, latency_spike_ratio=float("inf"))
+    )
+
+    # about one increase of the limit per limit-worth of successful requests
+    for _ in range(2):
+        limiter.release(limiter.acquire(), RequestOutcome.SUCCESS)
+    assert limiter.limit == 2
+    for _ in range(2):
+        limiter.release(limiter.acquire(), RequestOutcome.SUCCESS)
+    assert limiter.limit == 3
+
+    for _ in range(100):
+        limiter.release(limiter.acquire(), RequestOutcome.SUCCESS)
+    assert limiter.limit == 4
+
+
+def test_limit_is_cut_once_per_overload_event() -> None:
+    limiter = AdaptiveConcurrencyLimiter(ConcurrencyLimitConfig(initial_limit=8, min_limit=2))
+
+    starts = [limiter.acquire() for _ in range(3)]
+    for start in starts:
+        limiter.release(start, RequestOutcome.OVERLOAD)
+
+    # requests started before the cut do not cut the limit again
+    assert limiter.limit == 4
+    assert limiter.stats().decreases == 1
+
+    limiter.release(limiter.acquire(), RequestOutcome.OVERLOAD)
+    limiter.release(limiter.acquire(), RequestOutcome.OVERLOAD)
+    assert limiter.limit == 2
+
+
+def test_sustained_latency_spikes_count_as_overload() -> None:
+    limiter = AdaptiveConcurrencyLimiter(
+        ConcurrencyLimitConfig(initial_limit=8, latency_spike_ratio=2.0, latency_spike_count=3)
+    )
+    limiter.release(limiter.acquire() - 1, RequestOutcome.SUCCESS)
+
+    # a single slow request is tail latency
+    limiter.release(limiter.acquire() - 3, RequestOutcome.SUCCESS)
+    limiter.release(limiter.acquire() - 1, RequestOutcome.SUCCESS)
+    assert limiter.stats().decreases == 0
+
+    for _ in range(3):
+        limiter.release(limiter.acquire() - 3, RequestOutcome.SUCCESS)
+    assert limiter.stats().decreases == 1
+    assert limiter.limit == 4
+
+
+def test_latencies_are_compared_per_endpoint() -> None:
+    limiter = AdaptiveConcurrencyLimiter(
+        ConcurrencyLimitConfig(initial_limit=8, latency_spike_ratio=3.0)
+    )
+    search = "GET functions/search"
+    execute = "POST functions/{function_name}/execute"
+
+    # executions are 10x slower than searches, which is not a sign of overload
+    for _ in range(50):
+        for _ in range(3):
+            limiter.release(limiter.acquire() - 0.01, RequestOutcome.SUCCESS, search)
+        limiter.release(limiter.acquire() - 0.1, RequestOutcome.SUCCESS, execute)
+
+    stats = limiter.stats()
+    assert stats.decreases == 0
+    assert stats.limit > 8
+    assert stats.smoothed_latencies[search] == pytest.approx(0.01, rel=0.1)
+    assert stats.smoothed_latencies[execute] == pytest.approx(0.1, rel=0.1)
+
+    # spikes of an endpoint are still compared with its own latency
+    for _ in range(3):
+        limiter.release(limiter.acquire() - 1, RequestOutcome.SUCCESS, execute)
+    assert limiter.stats().decreases == 1
+
+
+@respx.mock
+def test_client_compares_the_latencies_of_each_function() -> None:
+    slow_function = "SLOW_APP__SLOW_FUNCTION"
+
+    def slow_response(request: httpx.Request) -> httpx.Response:
+        time.sleep(0.05)
+        return httpx.Response(200, json={})
+
+    respx.get(MOCK_DEFINITION_URL).mock(return_value=httpx.Response(200, json={}))
+    respx.get(f"{MOCK_BASE_URL}functions/{slow_function}/definition").mock(
+        side_effect=slow_response
+    )
+    config = ConcurrencyLimitConfig(initial_limit=8, latency_spike_count=1)
+
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL, concurrency_limit=config) as client:
+        for _ in range(5):
+            client.functions.get_definition(MOCK_FUNCTION_NAME)
+            client.functions.get_definition(slow_function)
+
+        assert client.concurrency_limiter is not None
+        stats = client.concurrency_limiter.stats()
+
+    assert stats.decreases == 0
+    assert set(stats.smoothed_latencies) == {
+        f"GET functions/{{function_name}}/definition {MOCK_FUNCTION_NAME}",
+        f"GET functions/{{function_name}}/definition {slow_function}",
+    }
+
+
+def test_ignored_outcome_keeps_limit() -> None:
+    limiter = AdaptiveConcurrencyLimiter(ConcurrencyLimitConfig(initial_limit=1))
+
+    limiter.release(limiter.acquire(), RequestOutcome.IGNORE)
+
+    assert limiter.stats().limit == 1
+    assert limiter.stats().in_flight == 0
+
+
+def test_acquire_waits_for_free_slot() -> None:
+    limiter = AdaptiveConcurrencyLimiter(ConcurrencyLimitConfig(initial_limit=1))
+    start = limiter.acquire()
+
+    with pytest.raises(DeadlineExceededError):
+        limiter.acquire(timeout=0.01)
+
+    threading.Timer(0.05, limiter.release, (start, RequestOutcome.IGNORE)).start()
+    limiter.acquire(timeout=5)
+    assert limiter.stats().in_flight == 1
+
+
+@respx.mock
+def test_client_cuts_limit_on_server_error() -> None:
+    respx.get(MOCK_DEFINITION_URL).mock(return_value=httpx.Response(500, json={}))
+
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        concurrency_limit=ConcurrencyLimitConfig(initial_limit=8),
+        retry_policy=RetryPolicy(max_attempts=1),
+    ) as client:
+        with pytest.raises(ServerError):
+            client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+        assert client.concurrency_limiter is not None
+        stats = client.concurrency_limiter.stats()
+        assert stats.limit == 4
+        assert stats.in_flight == 0
+
+
+@respx.mock
+def test_client_keeps_limit_on_client_error() -> None:
+    respx.get(MOCK_DEFINITION_URL).mock(return_value=httpx.Response(404, json={}))
+
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        concurrency_limit=ConcurrencyLimitConfig(initial_limit=8),
+    ) as client:
+        with pytest.raises(NotFoundError):
+            client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+        assert client.concurrency_limiter is not None
+        assert client.concurrency_limiter.stats().limit == 8
+
+
+@respx.mock
+def test_client_waits_for_slot_within_deadline() -> None:
+    def side_effect(request: httpx.Request) -> httpx.Response:
+        time.sleep(0.3)
+        return httpx.Response(200, json={})
+
+    respx.get(MOCK_DEFINITION_URL).mock(side_effect=side_effect)
+
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        concurrency_limit=ConcurrencyLimitConfig(initial_limit=1),
+    ) as client:
+        thread = threading.Thread(
+            target=client.functions.get_definition, args=(MOCK_FUNCTION_NAME,)
+        )
+        thread.start()
+        time.sleep(0.05)
+
+        with pytest.raises(DeadlineExceededError), deadline(0.05):
+            client.functions.get_definition(MOCK_FUNCTION_NAME)
+        thread.join()
@@ -0,0 +1,77 @@
+from typing import Any
+
+import pytest
+
+from aci import convert_function_definition
+from aci.libs._function_definition import FunctionDefinition, parse_function_definition
+from aci.meta_functions import ACISearchFunctions
+from aci.types.enums import FunctionDefinitionFormat
+
+NAME = "BRAVE_SEARCH__WEB_SEARCH"
+DESCRIPTION = "Search the web."
+PARAMETERS = {
+    "type": "object",
+    "properties": {"query": {"type": "string"}},
+    "required": ["query"],
+    "additionalProperties": False,
+}
+
+DEFINITIONS: dict[FunctionDefinitionFormat, dict[str, Any]] = {
+    FunctionDefinitionFormat.BASIC: {"name": NAME, "description": DESCRIPTION},
+    FunctionDefinitionFormat.OPENAI: {
+        "type": "function",
+        "function": {"name": NAME, "description": DESCRIPTION, "parameters": PARAMETERS},
+    },
+    FunctionDefinitionFormat.OPENAI_RESPONSES: {
+        "type": "function",
+        "name": NAME,
+        "description": DESCRIPTION,
+        "parameters": PARAMETERS,
+    },
+    FunctionDefinitionFormat.ANTHROPIC: {
+        "name": NAME,
+        "description": DESCRIPTION,
+        "input_schema": PARAMETERS,
+    },
+}
+
+FULL_FORMATS = [
+    FunctionDefinitionFormat.OPENAI,
+    FunctionDefinitionFormat.OPENAI_RESPONSES,
+    FunctionDefinitionFormat.ANTHROPIC,
+]
+
+
+@pytest.mark.parametrize("source_format", FULL_FORMATS)
+@pytest.mark.parametrize("target_format", list(FunctionDefinitionFormat))
+def test_convert_function_definition(
+    source_format: FunctionDefinitionFormat, target_format: FunctionDefinitionFormat
+) -> None:
+    converted = convert_function_definition(DEFINITIONS[source_format], target_format)
+    assert converted == DEFINITIONS[target_format]
+
+
+def test_parse_basic_function_definition() -> None:
+    definition = parse_function_definition(DEFINITIONS[FunctionDefinitionFormat.BASIC])
+    assert definition == FunctionDefinition(name=NAME, description=DESCRIPTION, parameters=None)
+
+
+@pytest.mark.parametrize("target_format", FULL_FORMATS)
+def test_convert_basic_function_definition_without_parameters(
+    target_format: FunctionDefinitionFormat,
+) -> None:
+    with pytest.raises(ValueError):
+        convert_function_definition(DEFINITIONS[FunctionDefinitionFormat.BASIC], target_format)
+
+
+def test_parse_unrecognized_function_definition() -> None:
+    with pytest.raises(ValueError):
+        parse_function_definition({"description": DESCRIPTION})
+
+
+@pytest.mark.parametrize("target_format", list(FunctionDefinitionFormat))
+def test_convert_meta_function_definition(target_format: FunctionDefinitionFormat) -> None:
+    openai_schema = ACISearchFunctions.to_json_schema(FunctionDefinitionFormat.OPENAI)
+    assert convert_function_definition(
+        openai_schema, target_format
+    ) == ACISearchFunctions.to_json_schema(target_format)
@@ -1,9 +1,11 @@
+from typing import Generator
+
 import httpx
 import pytest
 import respx
 
 from aci import ACI
-from aci._constants import DEFAULT_MAX_RETRIES
+from aci._constants import DEFAULT_MAX_RETRIES, IDEMPOTENCY_KEY_HEADER
 from aci._exceptions import (
     AuthenticationError,
     NotFoundError,
@@ -15,13 +17,20 @@ from aci._exceptions import (
 )
 from aci.types.enums import FunctionDefinitionFormat
 
-from .utils import MOCK_BASE_URL
+from .utils import MOCK_API_KEY, MOCK_BASE_URL
 
 MOCK_LINKED_ACCOUNT_OWNER_ID = "123"
 MOCK_FUNCTION_NAME = "TEST_FUNCTION"
 MOCK_FUNCTION_ARGUMENTS = {"param1": "value1", "param2": "value2"}
 
 
+@pytest.fixture
+def idempotent_client() -> Generator[ACI, None, None]:
+    """Client for a backend that deduplicates function executions by their idempotency key."""
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL, idempotency_key_support=True) as client:
+        yield client
+
+
 @respx.mock
 @pytest.mark.parametrize(
     "search_params",
@@ -188,7 +197,7 @@ def test_execute_function_server_error(client: ACI) -> None:
             MOCK_FUNCTION_NAME, MOCK_FUNCTION_ARGUMENTS, MOCK_LINKED_ACCOUNT_OWNER_ID
         )
 
-    assert route.call_count == DEFAULT_MAX_RETRIES, "should retry"
+    assert route.call_count == 1, "should not retry, the function might have been executed"
     assert "Internal server error" in str(exc_info.value)
 
 
@@ -198,12 +207,13 @@ def test_execute_function_unknown_error(client: ACI) -> None:
         return_value=httpx.Response(418, json={"message": "I'm a teapot"})
     )
 
-    with pytest.raises(UnknownError):
+    with pytest.raises(UnknownError) as exc_info:
         client.functions.execute(
             MOCK_FUNCTION_NAME, MOCK_FUNCTION_ARGUMENTS, MOCK_LINKED_ACCOUNT_OWNER_ID
         )
 
-    assert route.call_count == DEFAULT_MAX_RETRIES, "should retry"
+    assert exc_info.value.status_code == 418
+    assert route.call_count == 1, "should not retry 4xx errors"
 
 
 @respx.mock
@@ -218,7 +228,7 @@ def test_execute_function_timeout_exception(client: ACI) -> None:
         )
 
     assert "Request timed out" in str(exc_info.value)
-    assert route.call_count == DEFAULT_MAX_RETRIES, "should retry"
+    assert route.call_count == 1, "should not retry, the function might have been executed"
 
 
 @respx.mock
@@ -233,11 +243,11 @@ def test_execute_function_network_error(client: ACI) -> None:
         )
 
     assert "Network error" in str(exc_info.value)
-    assert route.call_count == DEFAULT_MAX_RETRIES, "should retry"
+    assert route.call_count == 1, "should not retry, the function might have been executed"
 
 
 @respx.mock
-def test_execute_function_retry_on_server_error(client: ACI) -> None:
+def test_execute_function_retry_on_server_error(idempotent_client: ACI) -> None:
     mock_success_response = {"success": True, "data": "string"}
 
     # Simulate two server errors followed by a successful response
@@ -249,7 +259,7 @@ def test_execute_function_retry_on_server_error(client: ACI) -> None:
         ]
     )
 
-    response = client.functions.execute(
+    response = idempotent_client.functions.execute(
         MOCK_FUNCTION_NAME, MOCK_FUNCTION_ARGUMENTS, MOCK_LINKED_ACCOUNT_OWNER_ID
     )
     assert route.call_count == 3, "should retry until success"
@@ -257,7 +267,7 @@ def test_execute_function_retry_on_server_error(client: ACI) -> None:
 
 
 @respx.mock
-def test_execute_function_retry_exhausted(client: ACI) -> None:
+def test_execute_function_retry_exhausted(idempotent_client: ACI) -> None:
     route = respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(
         side_effect=[
             httpx.Response(500, json={"message": "Internal server error"}),
@@ -269,9 +279,64 @@ def test_execute_function_retry_exhausted(client: ACI) -> None:
     )
 
     with pytest.raises(ServerError) as exc_info:
-        client.functions.execute(
+        idempotent_client.functions.execute(
             MOCK_FUNCTION_NAME, MOCK_FUNCTION_ARGUMENTS, MOCK_LINKED_ACCOUNT_OWNER_ID
         )
 
     assert route.call_count == DEFAULT_MAX_RETRIES, "should retry"
     assert "Internal server error" in str(exc_info.value)
+
+
+@respx.mock
+def test_execute_function_retry_on_connect_error(client: ACI) -> None:
+    mock_success_response = {"success": True, "data": "string"}
+    route = respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(
+        side_effect=[
+            httpx.ConnectError("Connection refused"),
+            httpx.Response(200, json=mock_success_response),
+        ]
+    )
+
+    response = client.functions.execute(
+        MOCK_FUNCTION_NAME, MOCK_FUNCTION_ARGUMENTS, MOCK_LINKED_ACCOUNT_OWNER_ID
+    )
+
+    assert route.call_count == 2, "should retry, the request was never sent"
+    assert response.model_dump(exclude_none=True) == mock_success_response
+
+
+@respx.mock
+def test_execute_function_sends_same_idempotency_key_on_retries(idempotent_client: ACI) -> None:
+    route = respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(
+        side_effect=[
+            httpx.Response(500, json={"message": "Internal server error"}),
+            httpx.Response(200, json={"success": True, "data": "string"}),
+            httpx.Response(200, json={"success": True, "data": "string"}),
+        ]
+    )
+
+    idempotent_client.functions.execute(
+        MOCK_FUNCTION_NAME, MOCK_FUNCTION_ARGUMENTS, MOCK_LINKED_ACCOUNT_OWNER_ID
+    )
+    idempotent_client.functions.execute(
+        MOCK_FUNCTION_NAME, MOCK_FUNCTION_ARGUMENTS, MOCK_LINKED_ACCOUNT_OWNER_ID
+    )
+
+    keys = [call.request.headers[IDEMPOTENCY_KEY_HEADER] for call in route.calls]
+    assert keys[0] == keys[1], "retries should reuse the idempotency key"
+    assert keys[1] != keys[2], "separate calls should use different idempotency keys"
+
+
+@respx.mock
+def test_get_function_definition_retry_on_timeout(client: ACI) -> None:
+    route = respx.get(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/definition").mock(
+        side_effect=[
+            httpx.ReadTimeout("Request timed out"),
+            httpx.Response(200, json={"name": MOCK_FUNCTION_NAME}),
+        ]
+    )
+
+    client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+    assert route.call_count == 2, "should retry reads"
+    assert IDEMPOTENCY_KEY_HEADER not in route.calls.last.request.headers
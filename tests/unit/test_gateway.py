@@ -0,0 +1,114 @@
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+from aci import ACI, CompressionConfig, RetryPolicy
+from aci._exceptions import RateLimitError
+from aci.gateway import GatewayConfig, GatewayServer
+from aci.gateway._gateway import CACHE_STATUS_HEADER
+from aci.simulator import FaultConfig, LatencyDistribution, SimulatorConfig, SimulatorServer
+from aci.types.enums import SecurityScheme
+
+from .utils import MOCK_API_KEY, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+MOCK_FUNCTION_NAME = "APP_00__FUNCTION_00"
+
+
+@pytest.fixture
+def upstream() -> Iterator[SimulatorServer]:
+    config = SimulatorConfig(faults=FaultConfig(latency=LatencyDistribution("constant", mean=0.05)))
+    with SimulatorServer(config) as server:
+        yield server
+
+
+def test_catalog_reads_are_cached(upstream: SimulatorServer, tmp_path: Path) -> None:
+    uds = str(tmp_path / "gateway.sock")
+    config = GatewayConfig(upstream_url=upstream.base_url)
+    with GatewayServer(config, uds=uds) as gateway:
+        with ACI(api_key=MOCK_API_KEY, base_url=gateway.base_url, uds=uds) as client:
+            for _ in range(3):
+                client.functions.get_definition(MOCK_FUNCTION_NAME)
+                client.apps.get("APP_00")
+            for _ in range(2):
+                client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+        stats = gateway.gateway.stats()
+
+    assert stats.requests == 8
+    assert stats.cache_hits == 4
+    assert stats.upstream_requests == 4
+    assert sum(upstream.simulator.stats().requests.values()) == 4
+
+
+def test_compressed_request_bodies_are_forwarded(upstream: SimulatorServer) -> None:
+    with GatewayServer(GatewayConfig(upstream_url=upstream.base_url)) as gateway:
+        with ACI(
+            api_key=MOCK_API_KEY,
+            base_url=gateway.base_url,
+            compression=CompressionConfig(min_bytes=0),
+        ) as client:
+            result = client.functions.execute(
+                MOCK_FUNCTION_NAME, {"query": "x" * 1000}, MOCK_LINKED_ACCOUNT_OWNER_ID
+            )
+
+    assert result.success
+    assert result.data is not None
+    assert result.data["input"] == {"query": "x" * 1000}
+
+
+def test_identical_concurrent_reads_are_coalesced() -> None:
+    config = SimulatorConfig(faults=FaultConfig(latency=LatencyDistribution("constant", mean=0.5)))
+    with (
+        SimulatorServer(config) as upstream,
+        GatewayServer(GatewayConfig(upstream_url=upstream.base_url)) as gateway,
+    ):
+        barrier = threading.Barrier(8)
+        statuses: list[str] = []
+
+        def search() -> None:
+            with httpx.Client(base_url=gateway.base_url) as http_client:
+                barrier.wait()
+                response = http_client.get("functions/search", headers={"x-api-key": "key"})
+                statuses.append(response.headers[CACHE_STATUS_HEADER])
+
+        threads = [threading.Thread(target=search) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # reads arriving after the upstream response are answered from the cache
+    assert statuses.count("miss") == 1
+    assert statuses.count("coalesced") + statuses.count("hit") == 7
+    assert "coalesced" in statuses
+    assert upstream.simulator.stats().requests == {"GET functions/search": 1}
+
+
+def test_app_configuration_changes_invalidate_the_cache(upstream: SimulatorServer) -> None:
+    with GatewayServer(GatewayConfig(upstream_url=upstream.base_url)) as gateway:
+        with ACI(api_key=MOCK_API_KEY, base_url=gateway.base_url) as client:
+            client.functions.search(allowed_only=True)
+            client.app_configurations.create("APP_00", SecurityScheme.NO_AUTH)
+            client.functions.search(allowed_only=True)
+        stats = gateway.gateway.stats()
+
+    assert stats.cache_hits == 0
+    assert stats.upstream_requests == 3
+
+
+def test_host_wide_rate_limit(upstream: SimulatorServer) -> None:
+    config = GatewayConfig(
+        upstream_url=upstream.base_url, rate_limit=1, rate_limit_burst=1, rate_limit_max_wait=0
+    )
+    with GatewayServer(config) as gateway:
+        with ACI(
+            api_key=MOCK_API_KEY,
+            base_url=gateway.base_url,
+            retry_policy=RetryPolicy(max_attempts=1),
+        ) as client:
+            client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+            with pytest.raises(RateLimitError):
+                client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+        assert gateway.gateway.stats().rate_limited == 1
@@ -0,0 +1,182 @@
+import threading
+import time
+from typing import Any, Callable, Generator
+
+import httpx
+import pytest
+import respx
+
+from aci import ACI, HedgingPolicy
+from aci._hedging import Hedger
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL
+
+MOCK_FUNCTION_NAME = "TEST_APP__TEST_FUNCTION"
+MOCK_DEFINITION_URL = f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/definition"
+
+
+@pytest.fixture
+def hedging_client() -> Generator[ACI, None, None]:
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        hedging=HedgingPolicy(initial_delay=0.05),
+    ) as client:
+        yield client
+
+
+def _slow_first_response() -> Callable[[httpx.Request], httpx.Response]:
+    """Side effect answering the first request slowly and every later request immediately."""
+    lock = threading.Lock()
+    calls: list[int] = []
+
+    def side_effect(request: httpx.Request) -> httpx.Response:
+        with lock:
+            calls.append(1)
+            call = len(calls)
+        if call == 1:
+            time.sleep(0.5)
+            return httpx.Response(200, json={"response": "primary"})
+        return httpx.Response(200, json={"response": "hedge"})
+
+    return side_effect
+
+
+@respx.mock
+def test_slow_request_is_hedged(hedging_client: ACI) -> None:
+    respx.get(MOCK_DEFINITION_URL).mock(side_effect=_slow_first_response())
+
+    response = hedging_client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+    assert response == {"response": "hedge"}
+    assert hedging_client.hedger is not None
+    stats = hedging_client.hedger.stats()
+    assert stats.requests == 1
+    assert stats.hedges == 1
+    assert stats.hedge_wins == 1
+
+
+@respx.mock
+def test_fast_request_is_not_hedged(hedging_client: ACI) -> None:
+    route = respx.get(MOCK_DEFINITION_URL).mock(
+        return_value=httpx.Response(200, json={"response": "primary"})
+    )
+
+    response = hedging_client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+    assert response == {"response": "primary"}
+    assert route.call_count == 1
+    assert hedging_client.hedger is not None
+    assert hedging_client.hedger.stats().hedges == 0
+
+
+@respx.mock
+def test_hedges_are_limited_by_ratio() -> None:
+    route = respx.get(MOCK_DEFINITION_URL).mock(side_effect=_slow_first_response())
+
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        hedging=HedgingPolicy(initial_delay=0.05, max_burst=0),
+    ) as client:
+        response = client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+        assert response == {"response": "primary"}
+        assert route.call_count == 1
+        assert client.hedger is not None
+        assert client.hedger.stats().suppressed == 1
+
+
+@respx.mock
+def test_failed_hedge_falls_back_to_primary(hedging_client: ACI) -> None:
+    calls: list[int] = []
+
+    def side_effect(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.2)
+            return httpx.Response(200, json={"response": "primary"})
+        raise httpx.ConnectError("Connection refused")
+
+    respx.get(MOCK_DEFINITION_URL).mock(side_effect=side_effect)
+
+    assert hedging_client.functions.get_definition(MOCK_FUNCTION_NAME) == {"response": "primary"}
+
+
+def test_executions_are_not_hedged(hedging_client: ACI) -> None:
+    assert hedging_client.hedger is not None
+    assert not hedging_client.hedger.should_hedge("functions.execute")
+
+
+def test_non_idempotent_methods_can_not_be_hedged() -> None:
+    with pytest.raises(ValueError, match=r"functions\.execute"):
+        ACI(
+            api_key=MOCK_API_KEY,
+            base_url=MOCK_BASE_URL,
+            hedging=HedgingPolicy(methods=frozenset({"functions.execute"})),
+        )
+
+
+def test_delay_follows_latency_percentile() -> None:
+    hedger = Hedger(HedgingPolicy(percentile=90, min_samples=20, min_delay=0, initial_delay=1.0))
+
+    assert hedger.get_delay("functions.search") == 1.0
+    for latency in range(1, 37):
+        hedger.record_latency("functions.search", latency / 100)
+
+    assert hedger.get_delay("functions.search") == pytest.approx(0.33)
+    assert hedger.stats().delays == {"functions.search": pytest.approx(0.33)}
+
+
+def test_requests_are_sent_in_the_calling_thread_when_workers_are_busy() -> None:
+    hedger = Hedger(HedgingPolicy(max_workers=1, initial_delay=10))
+    release = threading.Event()
+    threads: list[threading.Thread] = []
+
+    def send_request(extensions: dict[str, Any]) -> httpx.Response:
+        threads.append(threading.current_thread())
+        if len(threads) == 1:
+            release.wait(5)
+        return httpx.Response(200)
+
+    busy = threading.Thread(target=hedger.send, args=("functions.search", send_request))
+    busy.start()
+    while not threads:
+        time.sleep(0.01)
+
+    assert hedger.send("functions.search", send_request).status_code == 200
+    release.set()
+    busy.join()
+    hedger.close()
+
+    assert threads[1] is threading.current_thread()
+    assert hedger.stats().saturated == 1
+
+
+def test_losing_request_in_flight_is_aborted() -> None:
+    hedger = Hedger(HedgingPolicy(initial_delay=0.05))
+    errors: list[Exception] = []
+    calls: list[int] = []
+
+    def send_request(extensions: dict[str, Any]) -> httpx.Response:
+        calls.append(1)
+        if len(calls) == 1:
+            # the response headers of the primary request arrive after the hedge won
+            time.sleep(0.3)
+            try:
+                extensions["trace"]("http11.receive_response_body.started", {})
+            except Exception as e:
+                errors.append(e)
+                raise
+            return httpx.Response(200, json={"response": "primary"})
+        return httpx.Response(200, json={"response": "hedge"})
+
+    response = hedger.send("functions.search", send_request)
+    time.sleep(0.5)
+    hedger.close()
+
+    assert response.json() == {"response": "hedge"}
+    assert len(errors) == 1
+    stats = hedger.stats()
+    assert stats.hedge_wins == 1
+    assert stats.aborted == 1
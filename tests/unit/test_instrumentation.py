@@ -0,0 +1,166 @@
+import threading
+
+import httpx
+import pytest
+import respx
+
+from aci import ACI, InstrumentationHook, MetricsCollector, RequestEvent, RetryEvent, RetryPolicy
+from aci._exceptions import ServerError
+from aci._metrics import HistogramSnapshot
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+MOCK_FUNCTION_NAME = "TEST_APP__TEST_FUNCTION"
+MOCK_DEFINITION_URL = f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/definition"
+NO_WAIT_RETRY_POLICY = RetryPolicy(max_attempts=2, multiplier=0, min_wait=0, max_wait=0)
+
+
+class RecordingHook(InstrumentationHook):
+    def __init__(self) -> None:
+        self.events: list[tuple[str, RequestEvent | RetryEvent]] = []
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        self.events.append(("start", event))
+
+    def on_response(self, event: RequestEvent) -> None:
+        self.events.append(("response", event))
+
+    def on_error(self, event: RequestEvent) -> None:
+        self.events.append(("error", event))
+
+    def on_retry(self, event: RetryEvent) -> None:
+        self.events.append(("retry", event))
+
+
+class FailingHook(InstrumentationHook):
+    def on_response(self, event: RequestEvent) -> None:
+        raise RuntimeError("hook failed")
+
+
+@respx.mock
+def test_hooks_receive_request_events() -> None:
+    hook = RecordingHook()
+    respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(
+        return_value=httpx.Response(200, json={"success": True, "data": {}})
+    )
+
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL, instrumentation_hooks=[hook]) as client:
+        client.functions.execute(MOCK_FUNCTION_NAME, {"a": 1}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+
+    assert [kind for kind, _ in hook.events] == ["start", "response"]
+    event = hook.events[-1][1]
+    assert isinstance(event, RequestEvent)
+    assert event.method == "functions.execute"
+    assert event.http_method == "POST"
+    assert event.endpoint == "functions/{function_name}/execute"
+    assert event.url == f"functions/{MOCK_FUNCTION_NAME}/execute"
+    assert event.function_name == MOCK_FUNCTION_NAME
+    assert event.app_name == "TEST_APP"
+    assert event.attempt == 1
+    assert event.status_code == 200
+    assert event.latency is not None and event.latency >= 0
+    assert event.request_bytes > 0
+    assert event.response_bytes > 0
+
+
+@respx.mock
+def test_hooks_receive_retry_and_error_events() -> None:
+    hook = RecordingHook()
+    respx.get(MOCK_DEFINITION_URL).mock(
+        side_effect=[httpx.Response(500, json={}), httpx.ConnectError("Connection refused")]
+    )
+
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        retry_policy=NO_WAIT_RETRY_POLICY,
+        instrumentation_hooks=[hook],
+    ) as client:
+        with pytest.raises(httpx.ConnectError):
+            client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+    assert [kind for kind, _ in hook.events] == ["start", "response", "retry", "start", "error"]
+    retry_event = hook.events[2][1]
+    assert isinstance(retry_event, RetryEvent)
+    assert retry_event.method == "functions.get_definition"
+    assert retry_event.attempt == 2
+    assert isinstance(retry_event.error, ServerError)
+    error_event = hook.events[-1][1]
+    assert isinstance(error_event, RequestEvent)
+    assert error_event.attempt == 2
+    assert isinstance(error_event.error, httpx.ConnectError)
+
+
+@respx.mock
+def test_failing_hook_does_not_fail_request() -> None:
+    respx.get(MOCK_DEFINITION_URL).mock(return_value=httpx.Response(200, json={"name": "x"}))
+
+    with ACI(
+        api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL, instrumentation_hooks=[FailingHook()]
+    ) as client:
+        assert client.functions.get_definition(MOCK_FUNCTION_NAME) == {"name": "x"}
+
+
+@respx.mock
+def test_metrics_collector() -> None:
+    metrics = MetricsCollector()
+    respx.get(MOCK_DEFINITION_URL).mock(
+        side_effect=[httpx.Response(503, json={}), httpx.Response(200, json={"name": "x"})]
+    )
+
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        retry_policy=NO_WAIT_RETRY_POLICY,
+        instrumentation_hooks=[metrics],
+    ) as client:
+        client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+    snapshot = metrics.snapshot()
+    endpoint = snapshot.endpoints["GET functions/{function_name}/definition"]
+    assert endpoint.requests == 2
+    assert endpoint.errors == 1
+    assert endpoint.status_codes == {503: 1, 200: 1}
+    assert endpoint.latency.count == 2
+    assert snapshot.functions[MOCK_FUNCTION_NAME].count == 2
+    assert snapshot.function_errors == {MOCK_FUNCTION_NAME: 1}
+    assert snapshot.retries == {"functions.get_definition": 1}
+
+    metrics.reset()
+    assert metrics.snapshot().endpoints == {}
+
+
+@respx.mock
+def test_metrics_of_exited_threads_are_kept() -> None:
+    metrics = MetricsCollector()
+    respx.get(MOCK_DEFINITION_URL).mock(return_value=httpx.Response(200, json={"name": "x"}))
+
+    with ACI(
+        api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL, instrumentation_hooks=[metrics]
+    ) as client:
+        threads = [
+            threading.Thread(target=client.functions.get_definition, args=(MOCK_FUNCTION_NAME,))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+    # only the shard of the current thread is left
+    assert len(metrics._shards) == 1
+    assert metrics.snapshot().endpoints["GET functions/{function_name}/definition"].requests == 11
+
+    metrics.reset()
+    assert metrics.snapshot().endpoints == {}
+
+
+def test_histogram_percentile() -> None:
+    histogram = HistogramSnapshot(buckets=(0.1, 0.5, 1.0), counts=(50, 40, 9, 1), count=100, sum=30)
+
+    assert histogram.percentile(50) == 0.1
+    assert histogram.percentile(90) == 0.5
+    assert histogram.percentile(99) == 1.0
+    assert histogram.percentile(100) == float("inf")
+    assert histogram.mean == 0.3
@@ -12,6 +12,7 @@ from aci._exceptions import (
     ValidationError,
 )
 from aci.types.enums import SecurityScheme
+from aci.types.linked_accounts import LinkedAccount
 
 from .utils import MOCK_BASE_URL
 
@@ -98,12 +99,13 @@ def test_get_linked_account_with_credentials_success(
         return_value=httpx.Response(200, json=mock_response)
     )
 
-    linked_account = client.linked_accounts.get(MOCK_LINKED_ACCOUNT_ID)
+    linked_account = client.linked_accounts.get(UUID(MOCK_LINKED_ACCOUNT_ID))
     assert linked_account.id == UUID(MOCK_LINKED_ACCOUNT_ID)
     assert linked_account.app_name == MOCK_APP_NAME
     assert linked_account.linked_account_owner_id == MOCK_OWNER_ID
     assert linked_account.security_scheme == security_scheme
     if security_scheme == SecurityScheme.OAUTH2:
+        assert linked_account.security_credentials is not None
         assert linked_account.security_credentials.model_dump() == mock_credentials
     else:
         assert linked_account.security_credentials is None
@@ -117,7 +119,7 @@ def test_get_linked_account_not_found(client: ACI) -> None:
     )
 
     with pytest.raises(NotFoundError) as exc_info:
-        client.linked_accounts.get(MOCK_LINKED_ACCOUNT_ID)
+        client.linked_accounts.get(UUID(MOCK_LINKED_ACCOUNT_ID))
 
     assert "Linked account not found" in str(exc_info.value)
     assert route.call_count == 1, "should not retry"
@@ -147,6 +149,7 @@ def test_create_with_api_key_success(client: ACI) -> None:
         api_key=MOCK_API_KEY,
     )
 
+    assert isinstance(result, LinkedAccount)
     assert result.id == UUID(MOCK_LINKED_ACCOUNT_ID)
     assert result.app_name == MOCK_APP_NAME
     assert result.security_scheme == SecurityScheme.API_KEY
@@ -176,6 +179,7 @@ def test_create_with_no_auth_success(client: ACI) -> None:
         security_scheme=SecurityScheme.NO_AUTH,
     )
 
+    assert isinstance(result, LinkedAccount)
     assert result.id == UUID(MOCK_LINKED_ACCOUNT_ID)
     assert result.app_name == MOCK_APP_NAME
     assert result.security_scheme == SecurityScheme.NO_AUTH
@@ -237,7 +241,7 @@ def test_delete_linked_account_success(client: ACI) -> None:
         return_value=httpx.Response(204)
     )
 
-    client.linked_accounts.delete(MOCK_LINKED_ACCOUNT_ID)
+    client.linked_accounts.delete(UUID(MOCK_LINKED_ACCOUNT_ID))
     assert route.call_count == 1, "should not retry"
 
 
@@ -248,7 +252,7 @@ def test_delete_linked_account_not_found(client: ACI) -> None:
     )
 
     with pytest.raises(NotFoundError) as exc_info:
-        client.linked_accounts.delete(MOCK_LINKED_ACCOUNT_ID)
+        client.linked_accounts.delete(UUID(MOCK_LINKED_ACCOUNT_ID))
 
     assert "Linked account not found" in str(exc_info.value)
     assert route.call_count == 1, "should not retry"
@@ -271,7 +275,7 @@ def test_enable_linked_account_success(client: ACI) -> None:
         return_value=httpx.Response(200, json=mock_response)
     )
 
-    result = client.linked_accounts.enable(MOCK_LINKED_ACCOUNT_ID)
+    result = client.linked_accounts.enable(UUID(MOCK_LINKED_ACCOUNT_ID))
 
     assert result.id == UUID(MOCK_LINKED_ACCOUNT_ID)
     assert result.enabled is True
@@ -295,7 +299,7 @@ def test_disable_linked_account_success(client: ACI) -> None:
         return_value=httpx.Response(200, json=mock_response)
     )
 
-    result = client.linked_accounts.disable(MOCK_LINKED_ACCOUNT_ID)
+    result = client.linked_accounts.disable(UUID(MOCK_LINKED_ACCOUNT_ID))
 
     assert result.id == UUID(MOCK_LINKED_ACCOUNT_ID)
     assert result.enabled is False
@@ -325,7 +329,7 @@ def test_server_error_retry(client: ACI) -> None:
         ]
     )
 
-    linked_account = client.linked_accounts.get(MOCK_LINKED_ACCOUNT_ID)
+    linked_account = client.linked_accounts.get(UUID(MOCK_LINKED_ACCOUNT_ID))
 
     assert route.call_count == 3, "should retry until success"
     assert linked_account.id == UUID(MOCK_LINKED_ACCOUNT_ID)
@@ -353,7 +357,7 @@ def test_rate_limit_retry(client: ACI) -> None:
         ]
     )
 
-    linked_account = client.linked_accounts.get(MOCK_LINKED_ACCOUNT_ID)
+    linked_account = client.linked_accounts.get(UUID(MOCK_LINKED_ACCOUNT_ID))
 
     assert route.call_count == 2, "should retry after rate limit"
     assert linked_account.id == UUID(MOCK_LINKED_ACCOUNT_ID)
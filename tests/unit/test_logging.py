@@ -0,0 +1,140 @@
+import json
+import logging
+from collections.abc import Generator
+from typing import Any
+
+import httpx
+import pytest
+import respx
+
+from aci import ACI, configure_logging
+from aci.utils._logging import (
+    JSONLinesFormatter,
+    LogSamplingFilter,
+    SensitiveFieldsFilter,
+    get_env,
+    package_logger,
+)
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+MOCK_FUNCTION_NAME = "TEST_APP__TEST_FUNCTION"
+
+
+@pytest.fixture
+def caplog_info(
+    caplog: pytest.LogCaptureFixture,
+) -> Generator[pytest.LogCaptureFixture, None, None]:
+    caplog.set_level(logging.INFO, logger="aci")
+    yield caplog
+    configure_logging(sample_rate=1.0, max_value_length=256, json_lines=False)
+
+
+def _make_record(msg: str, args: dict, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("aci.test", level, __file__, 1, msg, (args,), None)
+
+
+def test_sensitive_fields_are_redacted_without_modifying_arguments() -> None:
+    arguments: dict[str, Any] = {
+        "query": "x",
+        "body": {"password": "hunter2", "items": [{"access_token": "t"}]},
+    }
+    record = _make_record("%(function_arguments)s", {"function_arguments": arguments})
+
+    assert SensitiveFieldsFilter().filter(record)
+
+    message = record.getMessage()
+    assert "hunter2" not in message
+    assert "'access_token': '<redacted>'" in message
+    assert "'query': 'x'" in message
+    assert arguments["body"]["password"] == "hunter2"
+
+
+def test_long_values_are_truncated() -> None:
+    record = _make_record("%(text)s", {"text": "a" * 100})
+
+    SensitiveFieldsFilter(max_value_length=10).filter(record)
+
+    assert record.getMessage() == "aaaaaaaaaa...<90 more chars>"
+
+
+def test_sampling_keeps_warnings() -> None:
+    sampling_filter = LogSamplingFilter(sample_rate=0)
+
+    assert not sampling_filter.filter(_make_record("info", {}))
+    assert sampling_filter.filter(_make_record("warning", {}, level=logging.WARNING))
+
+
+def test_json_lines_formatter() -> None:
+    record = _make_record("Executing %(function_name)s", {"function_name": MOCK_FUNCTION_NAME})
+
+    entry = json.loads(JSONLinesFormatter().format(record))
+
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "aci.test"
+    assert entry["message"] == f"Executing {MOCK_FUNCTION_NAME}"
+    assert entry["function_name"] == MOCK_FUNCTION_NAME
+
+
+@respx.mock
+def test_execute_logs_redacted_arguments(caplog_info: pytest.LogCaptureFixture) -> None:
+    respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(
+        return_value=httpx.Response(200, json={"success": True, "data": {}})
+    )
+    configure_logging(max_value_length=8)
+
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL) as client:
+        client.handle_function_call(
+            MOCK_FUNCTION_NAME,
+            {"api_key": "sk-secret", "text": "a long text"},
+            linked_account_owner_id=MOCK_LINKED_ACCOUNT_OWNER_ID,
+        )
+
+    messages = [record.getMessage() for record in caplog_info.records]
+    assert any(message.startswith("Handling function call") for message in messages)
+    assert any(message.startswith("Executing function") for message in messages)
+    assert all("sk-secret" not in message for message in messages)
+    assert all("a long text" not in message for message in messages)
+    assert any("'text': 'a long t...<3 more chars>'" in message for message in messages)
+
+
+@respx.mock
+def test_sampled_out_records_are_not_logged(caplog_info: pytest.LogCaptureFixture) -> None:
+    respx.get(f"{MOCK_BASE_URL}functions/search").mock(return_value=httpx.Response(200, json=[]))
+    configure_logging(sample_rate=0)
+
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL) as client:
+        client.functions.search(intent="x")
+
+    assert not [record for record in caplog_info.records if record.name.startswith("aci.")]
+
+
+def test_json_lines_handler(caplog_info: pytest.LogCaptureFixture) -> None:
+    configure_logging(json_lines=True)
+    propagate = package_logger.propagate
+    handlers = list(package_logger.handlers)
+    configure_logging(json_lines=False)
+
+    assert not propagate
+    assert any(isinstance(handler.formatter, JSONLinesFormatter) for handler in handlers)
+    assert package_logger.propagate
+    assert not package_logger.handlers
+
+
+def test_invalid_sample_rate() -> None:
+    with pytest.raises(ValueError):
+        configure_logging(sample_rate=2)
+
+
+def test_invalid_environment_variables_fall_back_to_defaults(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setenv("ACI_LOG_SAMPLE_RATE", "1%")
+    monkeypatch.setenv("ACI_LOG_MAX_VALUE_LENGTH", "128")
+
+    assert get_env("ACI_LOG_SAMPLE_RATE", float, 1.0) == 1.0
+    assert get_env("ACI_LOG_MAX_VALUE_LENGTH", int, 256) == 128
+    assert get_env("ACI_LOG_UNSET", int, 256) == 256
+    assert [record.getMessage() for record in caplog.records] == [
+        "Invalid ACI_LOG_SAMPLE_RATE='1%', using 1.0"
+    ]
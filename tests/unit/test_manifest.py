@@ -0,0 +1,78 @@
+import json
+
+from aci import build_tool_manifest, to_json_schema
+from aci.meta_functions import ACIExecuteFunction, ACISearchFunctions
+from aci.types.enums import FunctionDefinitionFormat
+
+GMAIL_SEND = {
+    "type": "function",
+    "function": {
+        "name": "GMAIL__SEND_EMAIL",
+        "description": "Send an email.",
+        "parameters": {"type": "object", "properties": {"to": {"type": "string"}}},
+    },
+}
+# same tool as GMAIL_SEND, but with a different key order
+GMAIL_SEND_REORDERED = {
+    "function": {
+        "parameters": {"properties": {"to": {"type": "string"}}, "type": "object"},
+        "description": "Send an email.",
+        "name": "GMAIL__SEND_EMAIL",
+    },
+    "type": "function",
+}
+BRAVE_SEARCH = {
+    "type": "function",
+    "function": {
+        "name": "BRAVE_SEARCH__WEB_SEARCH",
+        "description": "Search the web.",
+        "parameters": {"type": "object", "properties": {"query": {"type": "string"}}},
+    },
+}
+
+
+def test_equal_tool_sets_yield_identical_bytes() -> None:
+    manifest = build_tool_manifest([GMAIL_SEND, BRAVE_SEARCH])
+    reordered_manifest = build_tool_manifest([BRAVE_SEARCH, GMAIL_SEND_REORDERED])
+
+    assert manifest.json == reordered_manifest.json
+    assert manifest.sha256 == reordered_manifest.sha256
+    assert manifest == reordered_manifest
+
+
+def test_manifest_tools_are_canonical() -> None:
+    manifest = build_tool_manifest([GMAIL_SEND_REORDERED, BRAVE_SEARCH])
+
+    assert manifest.names == ["BRAVE_SEARCH__WEB_SEARCH", "GMAIL__SEND_EMAIL"]
+    # the returned dicts serialize to the canonical bytes even without sort_keys
+    assert json.dumps(manifest.tools, separators=(",", ":")) == manifest.json
+
+
+def test_manifest_drops_duplicates() -> None:
+    manifest = build_tool_manifest([GMAIL_SEND, BRAVE_SEARCH, GMAIL_SEND_REORDERED])
+
+    assert len(manifest) == 2
+
+
+def test_manifest_keeps_order_without_sorting() -> None:
+    manifest = build_tool_manifest([GMAIL_SEND, BRAVE_SEARCH], sort_tools=False)
+
+    assert manifest.names == ["GMAIL__SEND_EMAIL", "BRAVE_SEARCH__WEB_SEARCH"]
+
+
+def test_manifest_mixes_tool_sources() -> None:
+    def get_weather(location: str) -> str:
+        """Get current temperature for a location."""
+        return location
+
+    format = FunctionDefinitionFormat.ANTHROPIC
+    manifest = build_tool_manifest(
+        [
+            ACIExecuteFunction.to_json_schema(format),
+            ACISearchFunctions.to_json_schema(format),
+            to_json_schema(get_weather, format),
+        ]
+    )
+
+    assert manifest.names == ["ACI_EXECUTE_FUNCTION", "ACI_SEARCH_FUNCTIONS", "get_weather"]
+    assert manifest == build_tool_manifest(reversed(manifest.tools))
@@ -0,0 +1,113 @@
+import io
+from collections.abc import Callable
+
+import httpx
+import pytest
+import respx
+
+from aci import ACI, ProfileConfig, _profiling
+from aci._profiling import Phase
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+MOCK_FUNCTION_NAME = "TEST_APP__TEST_FUNCTION"
+MOCK_EXECUTE_URL = f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute"
+
+
+@respx.mock
+def test_profiled_call_is_broken_down_into_phases() -> None:
+    respx.post(MOCK_EXECUTE_URL).mock(
+        return_value=httpx.Response(200, json={"success": True, "data": {"text": "x" * 2048}})
+    )
+
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        profile=ProfileConfig(sample_rate=1, trace_memory=True, large_response_bytes=1024),
+    ) as client:
+        for _ in range(2):
+            client.functions.execute(MOCK_FUNCTION_NAME, {"a": 1}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+
+        assert client.profiler is not None
+        report = client.profiler.report()
+        output = io.StringIO()
+        client.profiler.dump(output)
+
+    profile = report.methods["functions.execute"]
+    assert profile.calls == 2
+    assert profile.response_bytes > 4096
+    assert set(profile.phases) == {
+        Phase.VALIDATION.value,
+        Phase.JSON_ENCODE.value,
+        Phase.NETWORK.value,
+        Phase.DECODE.value,
+        Phase.RESPONSE_VALIDATION.value,
+        "other",
+    }
+    assert sum(profile.phases.values()) == pytest.approx(profile.duration)
+    assert profile.max_memory_peak is not None and profile.max_memory_peak > 0
+    assert [response.method for response in report.large_responses] == ["functions.execute"] * 2
+
+    assert "functions.execute" in output.getvalue()
+    assert "large responses:" in output.getvalue()
+
+
+@respx.mock
+def test_calls_are_sampled() -> None:
+    respx.get(f"{MOCK_BASE_URL}functions/search").mock(return_value=httpx.Response(200, json=[]))
+
+    with ACI(
+        api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL, profile=ProfileConfig(sample_rate=0)
+    ) as client:
+        client.functions.search(intent="x")
+
+        assert client.profiler is not None
+        assert client.profiler.report().methods == {}
+
+
+def test_profile_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ACI_PROFILE", "0.5")
+
+    config = ProfileConfig.from_env()
+
+    assert config == ProfileConfig(sample_rate=0.5)
+
+
+@pytest.mark.parametrize("sample_rate", ["abc", "2", "-0.5"])
+def test_invalid_profile_env_disables_profiling(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture, sample_rate: str
+) -> None:
+    monkeypatch.setenv("ACI_PROFILE", sample_rate)
+    monkeypatch.setattr(_profiling, "_env_profiler", None)
+
+    assert ProfileConfig.from_env() is None
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL) as client:
+        assert client.profiler is None
+    assert f"Invalid ACI_PROFILE={sample_rate!r}" in caplog.text
+
+
+def test_env_profiler_is_shared_by_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ACI_PROFILE", "1")
+    monkeypatch.setattr(_profiling, "_env_profiler", None)
+    registered: list[Callable[[], None]] = []
+    monkeypatch.setattr(_profiling.atexit, "register", registered.append)
+
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL) as client:
+        profiler = client.profiler
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL) as client:
+        assert client.profiler is profiler
+
+    assert profiler is not None
+    assert registered == [profiler.dump]
+
+
+def test_no_profiling_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("ACI_PROFILE", raising=False)
+
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL) as client:
+        assert client.profiler is None
+
+
+def test_invalid_sample_rate() -> None:
+    with pytest.raises(ValueError):
+        ProfileConfig(sample_rate=1.5)
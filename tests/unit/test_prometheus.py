@@ -0,0 +1,107 @@
+import threading
+
+import httpx
+
+from aci import MetricsCollector, PrometheusExporter, RequestEvent, RetryEvent, render_prometheus
+from aci._exceptions import ServerError
+
+MOCK_FUNCTION_NAME = "TEST_APP__TEST_FUNCTION"
+
+
+def _record_requests(metrics: MetricsCollector) -> None:
+    event = RequestEvent(
+        method="functions.execute",
+        http_method="POST",
+        endpoint="functions/{function_name}/execute",
+        url=f"functions/{MOCK_FUNCTION_NAME}/execute",
+        attempt=1,
+        function_name=MOCK_FUNCTION_NAME,
+        status_code=200,
+        latency=0.2,
+        request_bytes=10,
+        response_bytes=20,
+    )
+    metrics.on_response(event)
+    event.status_code = 500
+    event.latency = 3.0
+    metrics.on_response(event)
+    event.status_code = None
+    event.error = httpx.ConnectError("Connection refused")
+    metrics.on_error(event)
+    metrics.on_retry(RetryEvent("functions.execute", 2, ServerError("error")))
+
+
+def test_render_prometheus() -> None:
+    metrics = MetricsCollector(buckets=(0.1, 1.0))
+    _record_requests(metrics)
+
+    text = render_prometheus(metrics.snapshot())
+
+    labels = 'http_method="POST",endpoint="functions/{function_name}/execute"'
+    assert "# TYPE aci_client_requests_total counter" in text
+    assert f'aci_client_requests_total{{{labels},status="200"}} 1' in text
+    assert f'aci_client_requests_total{{{labels},status="500"}} 1' in text
+    assert f'aci_client_requests_total{{{labels},status="error"}} 1' in text
+    assert f"aci_client_request_errors_total{{{labels}}} 2" in text
+    assert "# TYPE aci_client_request_duration_seconds histogram" in text
+    assert f'aci_client_request_duration_seconds_bucket{{{labels},le="0.1"}} 0' in text
+    assert f'aci_client_request_duration_seconds_bucket{{{labels},le="1.0"}} 1' in text
+    assert f'aci_client_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f"aci_client_request_duration_seconds_count{{{labels}}} 3" in text
+    assert f"aci_client_request_bytes_total{{{labels}}} 30" in text
+    assert f"aci_client_response_bytes_total{{{labels}}} 60" in text
+    function_labels = f'function="{MOCK_FUNCTION_NAME}",app="TEST_APP"'
+    assert f"aci_client_function_duration_seconds_count{{{function_labels}}} 3" in text
+    assert f"aci_client_function_errors_total{{{function_labels}}} 2" in text
+    assert 'aci_client_retries_total{method="functions.execute"} 1' in text
+
+
+def test_metrics_are_merged_across_threads() -> None:
+    metrics = MetricsCollector()
+    threads = [threading.Thread(target=_record_requests, args=(metrics,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = metrics.snapshot()
+    assert snapshot.endpoints["POST functions/{function_name}/execute"].requests == 12
+    assert snapshot.retries == {"functions.execute": 4}
+
+
+def test_exporter_serves_metrics() -> None:
+    metrics = MetricsCollector()
+    _record_requests(metrics)
+    exporter = PrometheusExporter(metrics)
+
+    host, port = exporter.serve(port=0)
+    try:
+        response = httpx.get(f"http://{host}:{port}/metrics")
+        not_found = httpx.get(f"http://{host}:{port}/other")
+    finally:
+        exporter.close()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert response.text == exporter.render()
+    assert not_found.status_code == 404
+
+
+def test_exporter_pushes_metrics() -> None:
+    metrics = MetricsCollector()
+    _record_requests(metrics)
+    exporter = PrometheusExporter(metrics, prefix="my_app_aci")
+    pushed: list[str] = []
+    pushed_event = threading.Event()
+
+    def callback(text: str) -> None:
+        pushed.append(text)
+        pushed_event.set()
+
+    exporter.push(callback)
+    assert "my_app_aci_requests_total" in pushed[0]
+
+    exporter.start_push(callback, interval=0.01)
+    pushed_event.clear()
+    assert pushed_event.wait(5)
+    exporter.close()
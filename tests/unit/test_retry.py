@@ -0,0 +1,167 @@
+import httpx
+import pytest
+import respx
+
+from aci import ACI, RetryBudget, RetryPolicy, deadline
+from aci._constants import DEFAULT_MAX_RETRIES
+from aci._exceptions import DeadlineExceededError, ServerError
+from aci._retry import get_remaining_time
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+MOCK_FUNCTION_NAME = "TEST_FUNCTION"
+NO_WAIT_RETRY_POLICY = RetryPolicy(min_wait=0, max_wait=0)
+SERVER_ERROR_RESPONSE = httpx.Response(500, json={"message": "Internal server error"})
+
+
+@respx.mock
+def test_per_method_retry_policy() -> None:
+    client = ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        retry_policy=NO_WAIT_RETRY_POLICY,
+        retry_policies={"functions.execute": RetryPolicy(max_attempts=1)},
+    )
+    execute_route = respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(
+        return_value=SERVER_ERROR_RESPONSE
+    )
+    search_route = respx.get(f"{MOCK_BASE_URL}functions/search").mock(
+        return_value=SERVER_ERROR_RESPONSE
+    )
+
+    with pytest.raises(ServerError):
+        client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+    with pytest.raises(ServerError):
+        client.functions.search()
+
+    assert execute_route.call_count == 1, "should not retry"
+    assert search_route.call_count == DEFAULT_MAX_RETRIES, "should retry"
+
+
+def test_unknown_method_in_retry_policies() -> None:
+    with pytest.raises(ValueError):
+        ACI(
+            api_key=MOCK_API_KEY,
+            base_url=MOCK_BASE_URL,
+            retry_policies={"functions.unknown": RetryPolicy()},
+        )
+
+
+@respx.mock
+def test_deadline_prevents_retries_that_can_not_finish_in_time(client: ACI) -> None:
+    route = respx.get(f"{MOCK_BASE_URL}functions/search").mock(return_value=SERVER_ERROR_RESPONSE)
+
+    # the default policy waits at least 2 seconds before retrying
+    with deadline(1.0):
+        with pytest.raises(ServerError):
+            client.functions.search()
+
+    assert route.call_count == 1, "should not retry past the deadline"
+
+
+@respx.mock
+def test_deadline_caps_request_timeout(client: ACI) -> None:
+    route = respx.get(f"{MOCK_BASE_URL}functions/search").mock(
+        return_value=httpx.Response(200, json=[])
+    )
+
+    with deadline(1.0):
+        client.functions.search()
+
+    timeout = route.calls.last.request.extensions["timeout"]
+    assert 0 < timeout["read"] <= 1.0
+    assert 0 < timeout["connect"] <= 1.0
+
+
+@respx.mock
+def test_expired_deadline(client: ACI) -> None:
+    route = respx.get(f"{MOCK_BASE_URL}functions/search").mock(
+        return_value=httpx.Response(200, json=[])
+    )
+
+    with deadline(0):
+        with pytest.raises(DeadlineExceededError):
+            client.functions.search()
+
+    assert route.call_count == 0
+
+
+def test_nested_deadlines_can_only_shorten() -> None:
+    assert get_remaining_time() is None
+
+    with deadline(1.0):
+        with deadline(10.0):
+            remaining_time = get_remaining_time()
+            assert remaining_time is not None and remaining_time <= 1.0
+        with deadline(0.5):
+            remaining_time = get_remaining_time()
+            assert remaining_time is not None and remaining_time <= 0.5
+
+    assert get_remaining_time() is None
+
+
+@respx.mock
+def test_retry_policy_timeout() -> None:
+    client = ACI(
+        api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL, retry_policy=RetryPolicy(timeout=1.0)
+    )
+    route = respx.get(f"{MOCK_BASE_URL}functions/search").mock(return_value=SERVER_ERROR_RESPONSE)
+
+    with pytest.raises(ServerError):
+        client.functions.search()
+
+    assert route.call_count == 1, "should not retry past the policy timeout"
+
+
+@respx.mock
+def test_exhausted_retry_budget_stops_retries() -> None:
+    client = ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        retry_policy=NO_WAIT_RETRY_POLICY,
+        retry_budget=RetryBudget(ratio=0.5, min_retries_per_second=0),
+    )
+    route = respx.get(f"{MOCK_BASE_URL}functions/search").mock(return_value=SERVER_ERROR_RESPONSE)
+
+    # 1 call allows 0.5 retries
+    with pytest.raises(ServerError):
+        client.functions.search()
+    assert route.call_count == 1, "should not retry without budget"
+
+    # 2 calls allow 1 retry
+    with pytest.raises(ServerError):
+        client.functions.search()
+    assert route.call_count == 3, "should retry once"
+
+
+@respx.mock
+def test_retries_without_retry_budget() -> None:
+    client = ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        retry_policy=NO_WAIT_RETRY_POLICY,
+        retry_budget=None,
+    )
+    route = respx.get(f"{MOCK_BASE_URL}functions/search").mock(return_value=SERVER_ERROR_RESPONSE)
+
+    with pytest.raises(ServerError):
+        client.functions.search()
+
+    assert route.call_count == DEFAULT_MAX_RETRIES, "should retry"
+
+
+def test_retry_budget() -> None:
+    budget = RetryBudget(ratio=0.2, min_retries_per_second=0.1, window_seconds=10)
+
+    # the floor allows 0.1 * 10 = 1 retry without any requests
+    assert budget.try_acquire_retry()
+    assert not budget.try_acquire_retry()
+
+    for _ in range(10):
+        budget.record_request()
+    # 0.2 * 10 + 1 = 3 retries in total
+    assert budget.try_acquire_retry()
+    assert budget.try_acquire_retry()
+    assert not budget.try_acquire_retry()
+
+    assert budget.stats() == {"requests": 10, "retries": 3}
@@ -0,0 +1,214 @@
+import threading
+import time
+
+import httpx
+import pytest
+import respx
+
+from aci import ACI, Priority, SchedulerConfig, priority, scheduling_owner
+from aci._exceptions import DeadlineExceededError
+from aci._scheduler import DEFAULT_OWNER, FairScheduler, get_owner, get_priority
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+MOCK_FUNCTION_NAME = "TEST_APP__TEST_FUNCTION"
+
+
+def _queue_acquire(scheduler: FairScheduler, owner: str, granted: list[str]) -> None:
+    """Acquire a slot for the owner in a thread, returning once the request is queued."""
+    waiting = scheduler.stats().waiting
+
+    def acquire() -> None:
+        scheduler.acquire(owner, timeout=5)
+        granted.append(owner)
+
+    threading.Thread(target=acquire, daemon=True).start()
+    while scheduler.stats().waiting == waiting:
+        time.sleep(0.001)
+
+
+def _release_and_wait(scheduler: FairScheduler, owner: str, granted: list[str]) -> None:
+    """Release a slot of the owner, returning once the next queued request was granted."""
+    count = len(granted)
+    scheduler.release(owner)
+    while len(granted) == count:
+        time.sleep(0.001)
+
+
+def test_per_owner_cap() -> None:
+    scheduler = FairScheduler(SchedulerConfig(max_concurrency=4, max_per_owner=1))
+
+    scheduler.acquire("heavy")
+    with pytest.raises(DeadlineExceededError):
+        scheduler.acquire("heavy", timeout=0.01)
+    scheduler.acquire("light", timeout=0.01)
+
+    stats = scheduler.stats()
+    assert stats.in_flight == 2
+    assert stats.waiting == 0
+
+
+def test_waiting_owners_are_served_fairly() -> None:
+    scheduler = FairScheduler(SchedulerConfig(max_concurrency=1))
+    granted: list[str] = []
+
+    scheduler.acquire("heavy")
+    for _ in range(3):
+        _queue_acquire(scheduler, "heavy", granted)
+    _queue_acquire(scheduler, "light", granted)
+
+    # the request of "light" is served before the backlog of "heavy"
+    _release_and_wait(scheduler, "heavy", granted)
+    _release_and_wait(scheduler, "light", granted)
+    _release_and_wait(scheduler, "heavy", granted)
+    _release_and_wait(scheduler, "heavy", granted)
+    scheduler.release("heavy")
+
+    assert granted == ["light", "heavy", "heavy", "heavy"]
+    assert scheduler.stats().owners == {}
+
+
+def test_weighted_owners() -> None:
+    scheduler = FairScheduler(SchedulerConfig(max_concurrency=1, owner_weights={"premium": 2.0}))
+    granted: list[str] = []
+
+    scheduler.acquire("other")
+    for _ in range(4):
+        _queue_acquire(scheduler, "premium", granted)
+    for _ in range(2):
+        _queue_acquire(scheduler, "standard", granted)
+
+    owner = "other"
+    for _ in range(6):
+        _release_and_wait(scheduler, owner, granted)
+        owner = granted[-1]
+
+    assert granted == ["premium", "standard", "premium", "premium", "standard", "premium"]
+
+
+def test_scheduling_owner_context() -> None:
+    assert get_owner() == DEFAULT_OWNER
+
+    with scheduling_owner("john_doe"):
+        assert get_owner() == "john_doe"
+        with scheduling_owner(None):
+            assert get_owner() == "john_doe"
+
+    assert get_owner() == DEFAULT_OWNER
+
+
+@respx.mock
+def test_execute_is_scheduled_as_request_of_owner() -> None:
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        scheduler=SchedulerConfig(),
+    ) as client:
+        assert client.scheduler is not None
+        scheduler = client.scheduler
+        owners_in_flight: list[str] = []
+
+        def side_effect(request: httpx.Request) -> httpx.Response:
+            owners_in_flight.extend(scheduler.stats().owners)
+            return httpx.Response(200, json={"success": True, "data": {}})
+
+        respx.post(f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute").mock(
+            side_effect=side_effect
+        )
+
+        client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+
+        assert owners_in_flight == [MOCK_LINKED_ACCOUNT_OWNER_ID]
+        assert scheduler.stats().in_flight == 0
+
+
+def _queue_acquire_with_priority(
+    scheduler: FairScheduler, owner: str, priority: Priority, granted: list[str]
+) -> None:
+    """Acquire a slot with a priority in a thread, returning once the request is queued."""
+    waiting = scheduler.stats().waiting
+
+    def acquire() -> None:
+        scheduler.acquire(owner, priority, timeout=5)
+        granted.append(f"{owner}:{priority.name.lower()}")
+
+    threading.Thread(target=acquire, daemon=True).start()
+    while scheduler.stats().waiting == waiting:
+        time.sleep(0.001)
+
+
+def test_reserved_slots_are_only_used_by_interactive_requests() -> None:
+    scheduler = FairScheduler(SchedulerConfig(max_concurrency=2, reserved_interactive=1))
+
+    scheduler.acquire("a", Priority.BACKGROUND)
+    with pytest.raises(DeadlineExceededError):
+        scheduler.acquire("b", Priority.NORMAL, timeout=0.01)
+    scheduler.acquire("b", Priority.INTERACTIVE, timeout=0.01)
+
+    stats = scheduler.stats()
+    assert stats.priorities[Priority.BACKGROUND].in_flight == 1
+    assert stats.priorities[Priority.INTERACTIVE].in_flight == 1
+
+
+def test_waiting_requests_are_scheduled_by_priority() -> None:
+    scheduler = FairScheduler(SchedulerConfig(max_concurrency=1))
+    granted: list[str] = []
+
+    scheduler.acquire("a")
+    _queue_acquire_with_priority(scheduler, "b", Priority.BACKGROUND, granted)
+    _queue_acquire_with_priority(scheduler, "c", Priority.NORMAL, granted)
+    _queue_acquire_with_priority(scheduler, "d", Priority.INTERACTIVE, granted)
+
+    _release_and_wait(scheduler, "a", granted)
+    scheduler.release("d", Priority.INTERACTIVE)
+    while len(granted) < 2:
+        time.sleep(0.001)
+    scheduler.release("c", Priority.NORMAL)
+    while len(granted) < 3:
+        time.sleep(0.001)
+
+    assert granted == ["d:interactive", "c:normal", "b:background"]
+
+
+def test_max_background() -> None:
+    scheduler = FairScheduler(SchedulerConfig(max_concurrency=4, max_background=1))
+
+    scheduler.acquire("a", Priority.BACKGROUND)
+    with pytest.raises(DeadlineExceededError):
+        scheduler.acquire("b", Priority.BACKGROUND, timeout=0.01)
+    scheduler.acquire("b", Priority.NORMAL, timeout=0.01)
+
+
+def test_priority_context() -> None:
+    assert get_priority() == Priority.NORMAL
+
+    with priority(Priority.BACKGROUND):
+        assert get_priority() == Priority.BACKGROUND
+        with priority(Priority.INTERACTIVE):
+            assert get_priority() == Priority.INTERACTIVE
+        assert get_priority() == Priority.BACKGROUND
+
+    assert get_priority() == Priority.NORMAL
+
+
+@respx.mock
+def test_requests_are_scheduled_with_priority_of_context() -> None:
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        scheduler=SchedulerConfig(),
+    ) as client:
+        assert client.scheduler is not None
+        scheduler = client.scheduler
+        in_flight: list[int] = []
+
+        def side_effect(request: httpx.Request) -> httpx.Response:
+            in_flight.append(scheduler.stats().priorities[Priority.BACKGROUND].in_flight)
+            return httpx.Response(200, json=[])
+
+        respx.get(f"{MOCK_BASE_URL}linked-accounts").mock(side_effect=side_effect)
+
+        with priority(Priority.BACKGROUND):
+            client.linked_accounts.list()
+
+        assert in_flight == [1]
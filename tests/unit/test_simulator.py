@@ -0,0 +1,180 @@
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from aci import ACI, RetryPolicy
+from aci._exceptions import NotFoundError, RateLimitError
+from aci.simulator import (
+    FaultConfig,
+    LatencyDistribution,
+    Simulator,
+    SimulatorASGIApp,
+    SimulatorConfig,
+    SimulatorServer,
+    SimulatorTransport,
+)
+from aci.types.enums import FunctionDefinitionFormat, SecurityScheme
+
+from .utils import MOCK_API_KEY, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+MOCK_FUNCTION_NAME = "APP_00__FUNCTION_00"
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def test_client_against_simulator_transport() -> None:
+    with ACI(api_key=MOCK_API_KEY, transport=SimulatorTransport()) as client:
+        functions = client.functions.search(app_names=["APP_01"], limit=3)
+        definition = client.functions.get_definition(
+            MOCK_FUNCTION_NAME, format=FunctionDefinitionFormat.ANTHROPIC
+        )
+        result = client.functions.execute(
+            MOCK_FUNCTION_NAME, {"query": "x"}, MOCK_LINKED_ACCOUNT_OWNER_ID
+        )
+        app = client.apps.get("APP_00")
+        apps = client.apps.search(include_functions=True)
+
+        account = client.linked_accounts.link(
+            "APP_00", SecurityScheme.API_KEY, MOCK_LINKED_ACCOUNT_OWNER_ID, api_key="sk"
+        )
+        assert not isinstance(account, str)
+        client.linked_accounts.disable(account.id)
+        disabled = client.linked_accounts.get(account.id)
+        client.app_configurations.create("APP_00", SecurityScheme.API_KEY)
+        configurations = client.app_configurations.list()
+        client.linked_accounts.delete(account.id)
+        with pytest.raises(NotFoundError):
+            client.linked_accounts.get(account.id)
+
+    assert [function["function"]["name"] for function in functions] == [
+        "APP_01__FUNCTION_00",
+        "APP_01__FUNCTION_01",
+        "APP_01__FUNCTION_02",
+    ]
+    assert definition["name"] == MOCK_FUNCTION_NAME
+    assert result.success
+    assert result.data is not None
+    assert result.data["input"] == {"query": "x"}
+    assert len(app.functions) == 10
+    assert len(apps) == 10
+    assert not disabled.enabled
+    assert [configuration.app_name for configuration in configurations] == ["APP_00"]
+
+
+def test_injected_rate_limits_carry_retry_after() -> None:
+    config = SimulatorConfig(faults=FaultConfig(rate_limit_rate=1, retry_after=2))
+    transport = SimulatorTransport(config)
+    with ACI(api_key=MOCK_API_KEY, transport=transport, retry_policy=NO_RETRY) as client:
+        with pytest.raises(RateLimitError):
+            client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+    with httpx.Client(transport=transport, base_url="https://api.aci.dev/v1/") as http_client:
+        response = http_client.get("apps/APP_00", headers={"x-api-key": MOCK_API_KEY})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert transport.simulator.stats().rate_limited == 2
+
+
+def test_endpoint_faults_and_retries() -> None:
+    config = SimulatorConfig(
+        faults=FaultConfig(large_payload_bytes=4096),
+        endpoint_faults={
+            "POST functions/{function_name}/execute": FaultConfig(
+                error_rate=0.5, error_statuses=(503,)
+            )
+        },
+        seed=1,
+    )
+    transport = SimulatorTransport(config)
+    with ACI(
+        api_key=MOCK_API_KEY,
+        transport=transport,
+        retry_policies={
+            "functions.execute": RetryPolicy(max_attempts=10, min_wait=0, max_wait=0, multiplier=0)
+        },
+        retry_budget=None,
+    ) as client:
+        for _ in range(10):
+            client.functions.execute(MOCK_FUNCTION_NAME, {}, MOCK_LINKED_ACCOUNT_OWNER_ID)
+        client.apps.get("APP_00")
+
+    stats = transport.simulator.stats()
+    assert stats.requests["POST functions/{function_name}/execute"] == 10 + stats.errors
+    assert stats.errors > 0
+    assert stats.requests["GET apps/{app_name}"] == 1
+
+
+def test_idempotent_mutations_are_deduplicated() -> None:
+    transport = SimulatorTransport()
+    with httpx.Client(transport=transport, base_url="https://api.aci.dev/v1/") as http_client:
+        responses = [
+            http_client.post(
+                "app-configurations",
+                json={"app_name": "APP_00", "security_scheme": "no_auth"},
+                headers={"x-api-key": MOCK_API_KEY, "Idempotency-Key": "key"},
+            )
+            for _ in range(2)
+        ]
+    assert [response.status_code for response in responses] == [200, 200]
+    assert responses[0].json() == responses[1].json()
+
+
+def test_oldest_idempotency_keys_are_evicted() -> None:
+    simulator = Simulator(SimulatorConfig(max_idempotency_keys=2))
+    for key in ["a", "b", "a", "c", "b"]:
+        simulator.handle(
+            "POST",
+            "functions/APP_00__FUNCTION_00/execute",
+            "",
+            {"x-api-key": MOCK_API_KEY, "idempotency-key": key},
+            b'{"function_input": {}, "linked_account_owner_id": "owner"}',
+        )
+
+    # "a" was replayed, "b" was evicted by "c" and executed again
+    assert simulator.stats().requests == {"POST functions/{function_name}/execute": 4}
+    assert list(simulator._idempotent_responses) == ["c", "b"]
+
+
+def test_latency_distributions() -> None:
+    rng = random.Random(0)
+    assert LatencyDistribution("constant", mean=0.1).sample(rng) == 0.1
+    samples = [
+        LatencyDistribution("lognormal", mean=0.1, stddev=0.05).sample(rng) for _ in range(5000)
+    ]
+    assert sum(samples) / len(samples) == pytest.approx(0.1, rel=0.05)
+    assert all(
+        sample <= 0.2
+        for sample in (
+            LatencyDistribution("exponential", mean=0.1, max=0.2).sample(rng) for _ in range(100)
+        )
+    )
+    with pytest.raises(ValueError):
+        FaultConfig(error_rate=0.6, rate_limit_rate=0.6)
+
+
+def test_client_against_simulator_server() -> None:
+    config = SimulatorConfig(faults=FaultConfig(slow_body_rate=1, slow_body_chunk_delay=0.001))
+    with SimulatorServer(config) as server:
+        with ACI(api_key=MOCK_API_KEY, base_url=server.base_url) as client:
+            definitions = client.functions.search(limit=5)
+            with pytest.raises(NotFoundError):
+                client.apps.get("UNKNOWN_APP")
+        assert server.simulator.stats().slow_bodies == 1
+
+    assert len(definitions) == 5
+
+
+def test_asgi_app() -> None:
+    async def request() -> httpx.Response:
+        transport = httpx.ASGITransport(app=SimulatorASGIApp())
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://simulator/v1/"
+        ) as client:
+            return await client.get(
+                f"functions/{MOCK_FUNCTION_NAME}/definition", headers={"x-api-key": MOCK_API_KEY}
+            )
+
+    response = asyncio.run(request())
+    assert response.status_code == 200
+    assert response.json()["function"]["name"] == MOCK_FUNCTION_NAME
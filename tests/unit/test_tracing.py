@@ -0,0 +1,156 @@
+import hashlib
+import hmac
+
+import httpx
+import pytest
+import respx
+
+from aci import ACI, RetryPolicy, TracingConfig
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL, MOCK_LINKED_ACCOUNT_OWNER_ID
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+MOCK_FUNCTION_NAME = "TEST_APP__TEST_FUNCTION"
+MOCK_DEFINITION_URL = f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/definition"
+MOCK_EXECUTE_URL = f"{MOCK_BASE_URL}functions/{MOCK_FUNCTION_NAME}/execute"
+MOCK_OWNER_ID_KEY = b"test-owner-id-key"
+MOCK_OWNER_ID_HASH = hmac.new(
+    MOCK_OWNER_ID_KEY, MOCK_LINKED_ACCOUNT_OWNER_ID.encode(), hashlib.sha256
+).hexdigest()[:16]
+
+
+@pytest.fixture
+def exporter() -> InMemorySpanExporter:
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracing(exporter: InMemorySpanExporter) -> TracingConfig:
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return TracingConfig(tracer_provider=tracer_provider, owner_id_key=MOCK_OWNER_ID_KEY)
+
+
+def _spans_by_name(exporter: InMemorySpanExporter) -> dict[str, ReadableSpan]:
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+@respx.mock
+def test_spans_of_function_call(exporter: InMemorySpanExporter, tracing: TracingConfig) -> None:
+    route = respx.post(MOCK_EXECUTE_URL).mock(
+        return_value=httpx.Response(200, json={"success": True, "data": {}})
+    )
+
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL, tracing=tracing) as client:
+        client.handle_function_call(
+            MOCK_FUNCTION_NAME, {"a": 1}, linked_account_owner_id=MOCK_LINKED_ACCOUNT_OWNER_ID
+        )
+
+    spans = _spans_by_name(exporter)
+    assert set(spans) == {
+        "aci.handle_function_call",
+        "aci.functions.execute",
+        "aci.functions.execute.attempt",
+        "POST functions/{function_name}/execute",
+    }
+    root = spans["aci.handle_function_call"]
+    assert root.attributes is not None
+    assert root.attributes["aci.function.name"] == MOCK_FUNCTION_NAME
+    assert root.attributes["aci.app.name"] == "TEST_APP"
+    assert root.attributes["aci.owner_id.hash"] == MOCK_OWNER_ID_HASH
+
+    request_span = spans["POST functions/{function_name}/execute"]
+    assert request_span.attributes is not None
+    assert request_span.attributes["http.response.status_code"] == 200
+    assert request_span.attributes["aci.attempt"] == 1
+    assert request_span.attributes["aci.owner_id.hash"] == MOCK_OWNER_ID_HASH
+    assert MOCK_LINKED_ACCOUNT_OWNER_ID not in str(dict(request_span.attributes))
+
+    # the spans form a single trace, propagated to the server
+    assert {span.context.trace_id for span in spans.values()} == {root.context.trace_id}
+    assert request_span.parent is not None
+    assert request_span.parent.span_id == spans["aci.functions.execute.attempt"].context.span_id
+    _, trace_id, parent_id, _ = route.calls.last.request.headers["traceparent"].split("-")
+    assert trace_id == f"{root.context.trace_id:032x}"
+    assert parent_id == f"{request_span.context.span_id:016x}"
+
+
+@respx.mock
+def test_owner_id_is_not_recorded_without_a_key(
+    exporter: InMemorySpanExporter, tracing: TracingConfig
+) -> None:
+    respx.post(MOCK_EXECUTE_URL).mock(
+        return_value=httpx.Response(200, json={"success": True, "data": {}})
+    )
+
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        tracing=TracingConfig(tracer_provider=tracing.tracer_provider),
+    ) as client:
+        client.handle_function_call(
+            MOCK_FUNCTION_NAME, {"a": 1}, linked_account_owner_id=MOCK_LINKED_ACCOUNT_OWNER_ID
+        )
+
+    spans = exporter.get_finished_spans()
+    assert spans
+    for span in spans:
+        assert span.attributes is not None
+        assert "aci.owner_id.hash" not in span.attributes
+
+
+@respx.mock
+def test_span_per_attempt(exporter: InMemorySpanExporter, tracing: TracingConfig) -> None:
+    respx.get(MOCK_DEFINITION_URL).mock(
+        side_effect=[httpx.Response(503, json={}), httpx.Response(200, json={"name": "x"})]
+    )
+
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        retry_policy=RetryPolicy(max_attempts=2, multiplier=0, min_wait=0, max_wait=0),
+        tracing=tracing,
+    ) as client:
+        client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+    spans = exporter.get_finished_spans()
+    attempts = [span for span in spans if span.name == "aci.functions.get_definition.attempt"]
+    assert [span.attributes and span.attributes["aci.attempt"] for span in attempts] == [1, 2]
+    requests = [span for span in spans if span.name == "GET functions/{function_name}/definition"]
+    status_codes = [
+        span.attributes and span.attributes["http.response.status_code"] for span in requests
+    ]
+    assert status_codes == [503, 200]
+    assert not requests[0].status.is_ok
+
+
+@respx.mock
+def test_no_propagation(exporter: InMemorySpanExporter, tracing: TracingConfig) -> None:
+    route = respx.get(MOCK_DEFINITION_URL).mock(return_value=httpx.Response(200, json={}))
+
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        tracing=TracingConfig(tracer_provider=tracing.tracer_provider, propagate=False),
+    ) as client:
+        client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+    assert "traceparent" not in route.calls.last.request.headers
+    assert len(exporter.get_finished_spans()) == 3
+
+
+@respx.mock
+def test_no_tracing_by_default() -> None:
+    route = respx.get(MOCK_DEFINITION_URL).mock(return_value=httpx.Response(200, json={}))
+
+    with ACI(api_key=MOCK_API_KEY, base_url=MOCK_BASE_URL) as client:
+        client.functions.get_definition(MOCK_FUNCTION_NAME)
+
+    assert "traceparent" not in route.calls.last.request.headers
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections.abc import Iterator
+
+import httpx
+import pytest
+
+from aci import ACI, WarmupConfig
+from aci._warmup import ConnectionWarmer
+from aci.simulator import SimulatorConfig, SimulatorServer
+
+from .utils import MOCK_API_KEY, MOCK_BASE_URL
+
+SIMULATOR_CONFIG = SimulatorConfig(apps=1, functions_per_app=1)
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    with SimulatorServer(SIMULATOR_CONFIG) as server:
+        yield server.base_url
+
+
+def test_warmup_opens_connections_at_construction(server_url: str) -> None:
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=server_url,
+        warmup=WarmupConfig(connections=3, keepalive_interval=None, wait=True),
+    ) as client:
+        assert client.warmer is not None
+        stats = client.warmer.stats()
+        assert stats.warmups == 1
+        assert stats.pings == 3
+        assert stats.connections_opened == 3
+
+        client.functions.get_definition("APP_00__FUNCTION_00")
+        # the connections are still open in the pool, and reused
+        assert client.warmer.warm() == 3
+        assert client.warmer.stats().connections_opened == 3
+
+
+def test_warmup_in_background(server_url: str) -> None:
+    client = ACI(
+        api_key=MOCK_API_KEY,
+        base_url=server_url,
+        warmup=WarmupConfig(connections=2, keepalive_interval=None),
+    )
+    with client:
+        assert client.warmer is not None
+        assert client.warmer.wait_ready(timeout=5)
+        assert client.warmer.stats().connections_opened == 2
+        assert client.functions.get_definition("APP_00__FUNCTION_00")
+
+
+def test_pings_keep_connections_open_past_their_expiry(server_url: str) -> None:
+    config = WarmupConfig(connections=2, keepalive_interval=0.1, keepalive_expiry=0.5, wait=True)
+    with ACI(api_key=MOCK_API_KEY, base_url=server_url, warmup=config) as client:
+        assert client.warmer is not None
+        time.sleep(1.2)
+        stats = client.warmer.stats()
+        assert stats.warmups > 3
+        assert stats.connections_opened == 2
+
+    config = WarmupConfig(connections=2, keepalive_interval=None, keepalive_expiry=0.3, wait=True)
+    with ACI(api_key=MOCK_API_KEY, base_url=server_url, warmup=config) as client:
+        assert client.warmer is not None
+        time.sleep(0.5)
+        # without pings, the pool closed the idle connections
+        client.warmer.warm()
+        assert client.warmer.stats().connections_opened == 4
+
+
+def test_stale_connections_are_replaced() -> None:
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise httpx.RemoteProtocolError("Server disconnected without sending a response.")
+        return httpx.Response(404)
+
+    warmer = ConnectionWarmer(
+        httpx.Client(transport=httpx.MockTransport(handler)),
+        MOCK_BASE_URL,
+        WarmupConfig(connections=1, keepalive_interval=None),
+    )
+    assert warmer.warm() == 1
+    stats = warmer.stats()
+    assert stats.stale_connections == 1
+    assert stats.pings == 1
+    assert stats.failed_pings == 0
+
+
+def test_failed_pings_do_not_raise() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused")
+
+    client = ACI(
+        api_key=MOCK_API_KEY,
+        base_url=MOCK_BASE_URL,
+        transport=httpx.MockTransport(handler),
+        warmup=WarmupConfig(connections=2, keepalive_interval=None, timeout=1, wait=True),
+    )
+    assert client.warmer is not None
+    assert client.warmer.stats().failed_pings == 2
+
+
+def test_close_stops_the_pings(server_url: str) -> None:
+    with ACI(
+        api_key=MOCK_API_KEY,
+        base_url=server_url,
+        warmup=WarmupConfig(connections=1, keepalive_interval=0.05),
+    ) as client:
+        assert client.warmer is not None
+        assert client.warmer.wait_ready(timeout=5)
+    assert not any(thread.name == "aci-warmup" for thread in threading.enumerate())
+
+
+def test_client_close_stops_the_pings(server_url: str) -> None:
+    client = ACI(
+        api_key=MOCK_API_KEY,
+        base_url=server_url,
+        warmup=WarmupConfig(connections=1, keepalive_interval=0.05),
+    )
+    assert client.warmer is not None
+    assert client.warmer.wait_ready(timeout=5)
+
+    client.close()
+
+    assert not any(thread.name == "aci-warmup" for thread in threading.enumerate())
+    assert client.httpx_client.is_closed
+    # closing twice is a no-op
+    client.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"connections": 0},
+        {"keepalive_interval": 0},
+        {"keepalive_interval": 60, "keepalive_expiry": 30},
+    ],
+)
+def test_invalid_warmup_config(kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        WarmupConfig(**kwargs)